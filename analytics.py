@@ -0,0 +1,336 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from backends import CubeBackend, open_backend
+from caching import LRUCache, registry
+from density import adaptive_points, cached_age_density, kde_from_histograms
+from filter_index import filter_key
+from ingest import IncrementalDataset
+from insights import level_insights
+from outcomes import OUTCOME_COLUMNS, OUTCOME_DIMENSIONS, OutcomeCube
+from quantiles import QUANTILE_COLUMNS, QuantileCube, quantile_from_counts
+from schema import STATUSES
+from settings import CHUNK_ROWS, DATA_PATH, OUT_OF_CORE, PAYLOAD_REDUCTION, QUERY_BACKEND, SHARED_DATA_DIR
+from shared_data import SharedDataset
+from streaming import StreamingDataset
+
+# Tab 1 charts can be grouped by either column
+GROUP_COLUMNS = ['Gender', 'Field_of_Study']
+
+# Columns the row-level density needs
+VIEW_COLUMNS = ['Age', 'Gender', 'Field_of_Study']
+
+# dataset version -> QuantileCube, built on first use
+_quantile_cubes = registry.register('quantiles', LRUCache(maxsize=4), lambda key: key)
+
+# dataset version -> OutcomeCube, built on first use
+_outcome_cubes = registry.register('outcomes', LRUCache(maxsize=4), lambda key: key)
+
+# (dataset version, selection without the level) -> OlapCube.by_level results
+_level_batches = registry.register('levels', LRUCache(maxsize=256), lambda key: key[0])
+
+# (dataset version, selection without the level) -> insights.level_insights results
+_insight_batches = registry.register('insights', LRUCache(maxsize=256), lambda key: key[0])
+
+
+def open_dataset(source=DATA_PATH, shared_dir=SHARED_DATA_DIR, out_of_core=OUT_OF_CORE):
+    """The process-wide dataset: the published shared copy if configured,
+    only the streamed aggregates in out-of-core mode, else the full frame.
+    """
+    if shared_dir:
+        return SharedDataset(shared_dir)
+    if out_of_core:
+        return StreamingDataset(source, CHUNK_ROWS)
+    return IncrementalDataset(source)
+
+
+def normalize_filters(genders=None, level=None, age_range=None, statuses=None, age_bounds=None):
+    """Selection dict with the same fallbacks as the dashboard sidebar.
+
+    No genders selected means all genders, a single-age range means the full
+    ``age_bounds``, and no statuses means both.
+    """
+    if not genders or 'All' in genders:
+        genders = None
+    if age_range is not None:
+        age_range = (int(age_range[0]), int(age_range[1]))
+        if age_range[0] == age_range[1]:
+            age_range = None if age_bounds is None else tuple(age_bounds)
+    if not statuses:
+        statuses = list(STATUSES)
+    return dict(genders=genders, level=level, age_range=age_range, statuses=statuses)
+
+
+def to_jsonable(value):
+    """Plain JSON types for a result: frames become records, NaN becomes None."""
+    if isinstance(value, pd.DataFrame):
+        return [to_jsonable(row) for row in value.to_dict('records')]
+    if isinstance(value, pd.Series):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class Analytics:
+    """The dashboard's numbers for one (frame, index, cube) snapshot.
+
+    No Streamlit involved: the app renders these results and ``api_server``
+    serves them as JSON. Every method takes a selection dict as built by
+    ``normalize_filters`` (or the sidebar). With a ``PrecomputedStore`` for
+    the same dataset version, enumerated selections are answered from it and
+    anything else is computed by the query backend (the cube by default)
+    and the filter bitmaps.
+    """
+
+    def __init__(self, snapshot, version, store=None, backend=None):
+        self.frame, self.index, self.cube = snapshot
+        self.version = version
+        self.store = store
+        self.backend = CubeBackend(self.cube) if backend is None else backend
+
+    @classmethod
+    def from_dataset(cls, dataset, open_store=None, backend=QUERY_BACKEND):
+        """Current snapshot, with ``open_store(version)`` as its store if given
+        and the ``backend`` named in settings."""
+        snapshot = dataset.refresh()
+        # New data drops every derived result of the previous version
+        registry.track_version(dataset.version)
+        store = None if open_store is None else open_store(dataset.version)
+        return cls(snapshot, dataset.version, store, open_backend(backend, snapshot, dataset.version))
+
+    def precomputed(self, filters):
+        if self.store is None:
+            return None
+        return self.store.get(filters)
+
+    def signature(self, filters):
+        return (self.version, filter_key(**filters))
+
+    def filter_options(self):
+        ages = self.cube.labels['Age']
+        genders = self.cube.marginal('Gender')
+        return {
+            'genders': sorted(genders.index[genders > 0]),
+            'levels': list(self.cube.labels['Current_Job_Level']),
+            'age_bounds': [int(min(ages)), int(max(ages))],
+            'statuses': list(self.cube.labels['Entrepreneurship']),
+        }
+
+    def view(self, filters, columns=VIEW_COLUMNS):
+        """Rows of the selection, gathered through the filter bitmaps."""
+        return self.index.select(self.frame[list(columns)], **filters)
+
+    def by_level(self, filters):
+        """Results for every job level under the rest of the selection.
+
+        Computed in one pass over the cube and cached, so switching the
+        level with the other filters unchanged is a lookup.
+        """
+        rest = {name: value for name, value in filters.items() if name != 'level'}
+        return _level_batches.get_or_compute(
+            (self.version, filter_key(**rest)), lambda: self.cube.by_level(**rest))
+
+    def _level_result(self, filters):
+        # The batch is the cube's; other backends answer every query themselves
+        if filters.get('level') is None or not isinstance(self.backend, CubeBackend):
+            return None
+        return self.by_level(filters).get(filters['level'])
+
+    def kpis(self, filters):
+        """Total, median age, % female, % entrepreneurs and the top-3 fields."""
+        record = self.precomputed(filters) or self._level_result(filters)
+        if record is not None:
+            return record['kpis']
+        return self.backend.kpis(filters)
+
+    def category_counts(self, filters, column):
+        """Non-zero row counts per value of ``column``, largest first."""
+        record = self.precomputed(filters) or self._level_result(filters)
+        if record is not None and column in record['counts']:
+            return record['counts'][column]
+        return self.backend.value_counts(filters, column)
+
+    def demographics_summary(self, filters):
+        kpis = self.kpis(filters)
+        return {
+            'total': kpis['total'],
+            'median_age': kpis['median_age'],
+            'pct_female': kpis['pct_female'],
+            'top_fields': kpis['top_fields'],
+            'gender_counts': self.category_counts(filters, 'Gender'),
+            'field_counts': self.category_counts(filters, 'Field_of_Study'),
+        }
+
+    def job_offers_summary(self, filters):
+        kpis = self.kpis(filters)
+        return {
+            'total': kpis['total'],
+            'median_age': kpis['median_age'],
+            'pct_entrepreneurs': kpis['pct_entrepreneurs'],
+        }
+
+    def entrepreneurship_by_age(self, filters):
+        """Age, Entrepreneurship, Count and Percentage (share within the age)."""
+        record = self.precomputed(filters) or self._level_result(filters)
+        if record is not None:
+            return record['entrepreneurship_by_age']
+        return self.backend.entrepreneurship_by_age(filters)
+
+    def job_offers_by_age(self, filters):
+        """Age, Entrepreneurship and mean Job_Offers."""
+        record = self.precomputed(filters) or self._level_result(filters)
+        if record is not None:
+            return record['job_offers_by_age']
+        return self.backend.job_offers_by_age(filters)
+
+    def level_comparison(self, filters):
+        """KPI card values of every job level side by side, one row per level."""
+        rows = []
+        for level, result in self.by_level(filters).items():
+            kpis = result['kpis']
+            rows.append({
+                'Level': level,
+                'Total': kpis['total'],
+                'Median Age': kpis['median_age'],
+                '% Female': kpis['pct_female'],
+                '% Entrepreneurs': kpis['pct_entrepreneurs'],
+                'Top Fields': ', '.join(kpis['top_fields']),
+            })
+        return pd.DataFrame(rows)
+
+    def insights(self, filters):
+        """Generated note lines for the selection, ``{kind: (line, ...)}``
+        (``None`` without rows); every level's when no level is selected.
+
+        Like ``by_level``, one pass over the cube per selection without the
+        level, cached per dataset version.
+        """
+        rest = {name: value for name, value in filters.items() if name != 'level'}
+        batch = _insight_batches.get_or_compute(
+            (self.version, filter_key(**rest)), lambda: level_insights(self.cube, **rest))
+        if filters.get('level') is None:
+            return batch
+        return batch.get(filters['level'])
+
+    def quantile_cube(self):
+        if self.frame is None:
+            # Out of core: built during the same pass as the StreamedCube
+            return self.cube.quantiles
+        return _quantile_cubes.get_or_compute(self.version, lambda: QuantileCube(self.frame))
+
+    def percentiles(self, filters, column='Age', qs=(0.25, 0.5, 0.75)):
+        """Percentiles of ``column`` for the selection, without filtering rows.
+
+        Age comes from the cube's age histogram; GPAs and Starting_Salary
+        from per-segment histograms. ``relative_error`` is 0 where the
+        result is exact.
+        """
+        if column != 'Age' and column not in QUANTILE_COLUMNS:
+            raise ValueError(f"no percentiles for column {column!r}")
+        if column == 'Age':
+            ages = self.cube.marginal('Age', **filters)
+            values, error = quantile_from_counts(ages.index.to_numpy(), ages.to_numpy(), qs), 0.0
+        else:
+            cube = self.quantile_cube()
+            values, error = cube.quantiles(column, qs, **filters), cube.relative_error(column)
+        return {
+            'column': column,
+            'percentiles': {float(q): float(v) for q, v in zip(qs, values)},
+            'relative_error': error,
+        }
+
+    def outcome_cube(self):
+        if self.frame is None:
+            return self.cube.outcomes
+        return _outcome_cubes.get_or_compute(self.version, lambda: OutcomeCube(self.frame))
+
+    def outcomes(self, filters, column='Starting_Salary', by='Field_of_Study', fields=None, levels=None):
+        """Career Outcomes view: ``column`` per ``by`` group (summary and
+        box-plot statistics), its histogram and the correlation matrix of
+        all outcome columns.
+
+        The selection is the filters' genders, ``fields`` and ``levels``
+        (the filters' level if not given). Ages and statuses do not apply:
+        the outcome cube is keyed by Field_of_Study x Level x Gender.
+        """
+        if column not in OUTCOME_COLUMNS:
+            raise ValueError(f"no outcome column {column!r}")
+        if by not in OUTCOME_DIMENSIONS:
+            raise ValueError(f"cannot break down by {by!r}")
+        if levels is None and filters.get('level') is not None:
+            levels = [filters['level']]
+        cube = self.outcome_cube()
+        for dim, values in (('Field_of_Study', fields), ('Current_Job_Level', levels)):
+            unknown = [v for v in values or () if v not in cube.labels[dim]]
+            if unknown:
+                raise ValueError(f"unknown {dim} {', '.join(map(repr, unknown))}")
+        selection = dict(fields=fields, levels=levels, genders=filters.get('genders'))
+        return {
+            'column': column,
+            'summary': cube.summary(column, by, **selection),
+            'histogram': cube.binned(column, **selection),
+            'correlation': cube.correlation(**selection).reset_index(),
+            'relative_error': cube.relative_error(column),
+        }
+
+    def density_curves(self, filters, group_col):
+        """Tab 1 density: ``(x, [(category, y or None), ...])``.
+
+        Categories are in order of first appearance among the selected rows,
+        which fixes their colours in the chart. With payload reduction on,
+        the grid size follows the kernel bandwidth instead of 100 points.
+        """
+        points = None if PAYLOAD_REDUCTION else 100
+        record = self.precomputed(filters)
+        if record is not None:
+            return record['density'][group_col]
+        age_range = filters.get('age_range') or self.filter_options()['age_bounds']
+        if age_range[0] > age_range[1]:
+            return np.zeros(0), []
+        if self.frame is None:
+            # Out of core: same curves from the age histograms, same order
+            density = self.age_density(filters, group_col, points)
+            order = self.cube.first_appearance(group_col, **filters)
+            return density['x'], [(cat, density['curves'].get(cat)) for cat in order]
+        return cached_age_density(
+            self.signature(filters), self.view(filters), group_col, age_range, points)
+
+    def age_density(self, filters, group_col='Gender', points=100):
+        """Age KDE per category of ``group_col``, from the cube's age histograms.
+
+        Categories come in label order; those with fewer than two rows or a
+        single age are left out. ``points=None`` sizes the grid to the
+        narrowest kernel. An inverted age range gives no points and no
+        curves.
+        """
+        cube = self.cube
+        age_range = filters.get('age_range') or self.filter_options()['age_bounds']
+        if age_range[0] > age_range[1]:
+            return {'x': np.zeros(0), 'curves': {}}
+        index = cube._index(**filters)
+        sub = cube.slice(cube.counts, **filters)
+        group_axis, age_axis = cube.axis(group_col), cube.axis('Age')
+        counts = np.moveaxis(sub, (group_axis, age_axis), (0, 1))
+        # Summed over the other axes by number, not reshape(..., -1), which
+        # fails when a selection axis is empty
+        counts = counts.sum(axis=tuple(range(2, counts.ndim)))
+
+        ages = np.asarray(cube.labels['Age'])[index[age_axis]]
+        groups = np.asarray(cube.labels[group_col], dtype=object)[index[group_axis]]
+        if points is None:
+            points = adaptive_points(ages, counts, age_range) if len(ages) else 100
+        x = np.linspace(age_range[0], age_range[1], points)
+        curves = kde_from_histograms(ages, counts, x) if len(ages) else [None] * len(groups)
+        return {
+            'x': x,
+            'curves': {group: y for group, y in zip(groups, curves) if y is not None},
+        }
@@ -0,0 +1,140 @@
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from analytics import Analytics, normalize_filters, open_dataset, to_jsonable
+from caching import LRUCache, registry
+from precompute import open_store
+from settings import API_CACHE_ENTRIES
+
+
+def _floats(text):
+    return tuple(float(v) for v in text.split(','))
+
+
+def _strings(text):
+    return tuple(v for v in text.split(',') if v)
+
+
+# path -> (Analytics method, extra query parameters it accepts)
+ROUTES = {
+    '/demographics': ('demographics_summary', {}),
+    '/job-offers': ('job_offers_summary', {}),
+    '/job-offers/by-age': ('job_offers_by_age', {}),
+    '/entrepreneurship/by-age': ('entrepreneurship_by_age', {}),
+    '/age-density': ('age_density', {'group': ('group_col', str), 'points': ('points', int)}),
+    '/levels': ('level_comparison', {}),
+    '/insights': ('insights', {}),
+    '/outcomes': ('outcomes', {'column': ('column', str), 'by': ('by', str),
+                               'fields': ('fields', _strings), 'levels': ('levels', _strings)}),
+    '/percentiles': ('percentiles', {'column': ('column', str), 'q': ('qs', _floats)}),
+}
+
+
+def _split(params, name):
+    values = [v for raw in params.get(name, []) for v in raw.split(',') if v]
+    return values or None
+
+
+def parse_filters(query, age_bounds):
+    """Selection dict from a query string such as
+    ``genders=Male,Female&level=Mid&age_min=20&age_max=24&statuses=Yes``.
+    """
+    params = parse_qs(query)
+    age_range = None
+    if 'age_min' in params or 'age_max' in params:
+        age_range = (
+            int(params.get('age_min', [age_bounds[0]])[0]),
+            int(params.get('age_max', [age_bounds[1]])[0]),
+        )
+    level = params.get('level', [None])[0]
+    filters = normalize_filters(
+        genders=_split(params, 'genders'),
+        level=level,
+        age_range=age_range,
+        statuses=_split(params, 'statuses'),
+        age_bounds=age_bounds,
+    )
+    return filters, params
+
+
+class AnalyticsService:
+    """Answers API requests from the current dataset snapshot.
+
+    Responses are cached as encoded JSON per (dataset version, route,
+    filters), so repeated queries cost a dictionary lookup.
+    """
+
+    def __init__(self, dataset, cache_entries=API_CACHE_ENTRIES):
+        self.dataset = dataset
+        self.cache = registry.register('api', LRUCache(maxsize=cache_entries), lambda key: key[0][0])
+        self._lock = threading.Lock()
+
+    def analytics(self):
+        with self._lock:
+            return Analytics.from_dataset(self.dataset, open_store)
+
+    def handle(self, path, query):
+        """(status, body bytes) for one GET request."""
+        analytics = self.analytics()
+        if path == '/health':
+            return 200, json.dumps({'status': 'ok', 'version': analytics.version}).encode()
+        if path == '/filters':
+            return 200, json.dumps(to_jsonable(analytics.filter_options())).encode()
+        if path == '/cache':
+            return 200, json.dumps(registry.stats()).encode()
+        if path not in ROUTES:
+            return 404, json.dumps({'error': f'Unknown path {path}'}).encode()
+
+        method, extras = ROUTES[path]
+        try:
+            filters, params = parse_filters(query, analytics.filter_options()['age_bounds'])
+            kwargs = {arg: cast(params[name][0]) for name, (arg, cast) in extras.items() if name in params}
+            key = (analytics.signature(filters), path, tuple(sorted(kwargs.items())))
+            return 200, self.cache.get_or_compute(key, lambda: json.dumps({
+                'version': analytics.version,
+                'filters': to_jsonable(filters),
+                'result': to_jsonable(getattr(analytics, method)(filters, **kwargs)),
+            }).encode())
+        except ValueError as exc:
+            return 400, json.dumps({'error': str(exc)}).encode()
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            status, body = service.handle(url.path.rstrip('/') or '/', url.query)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the dashboard KPIs and series as JSON")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+
+    service = AnalyticsService(open_dataset())
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"serving on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
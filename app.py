@@ -1,12 +1,23 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from scipy.stats import gaussian_kde
-import numpy as np
+
+from analytics import Analytics, open_dataset
+from outcomes import OUTCOME_COLUMNS
+from assets import read_text
+from precompute import open_store
+from settings import INSIGHT_NOTES, LAZY_TABS, SHOW_CACHE_STATS
+from templates import kpi_card, note_fragments
+from figures import CHART_OPTIONS, bar_figure, density_figure, donut_figure, line_figure, soft_colors
+from caching import registry
+from figure_cache import render_cache
+from instrumentation import profiler
 
 st.set_page_config(page_title="Entrepreneurship Insights", layout="wide")
 
+# Stage timings of this rerun (no-op unless DASHBOARD_PROFILE=1)
+profiler.start_rerun()
+
 from utils import apply_global_styles
 apply_global_styles()
 
@@ -140,16 +151,22 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown('<style>{}</style>'.format(f.read()), unsafe_allow_html=True)
+    # Read once per process and again only when the file changes
+    st.markdown('<style>{}</style>'.format(read_text(file_name)), unsafe_allow_html=True)
 
 local_css("style/style.css")
 
-@st.cache_data
+@st.cache_resource
 def load_data():
-    return pd.read_excel("education_career_success.xlsx")
+    # The shared published copy when configured, otherwise the export itself.
+    # Either way rows appended later are picked up without a full reload.
+    return open_dataset()
 
-df = load_data()
+with profiler.stage('load_data'):
+    dataset = load_data()
+    # Results precomputed for this dataset version are looked up instead of computed
+    analytics = Analytics.from_dataset(dataset, open_store)
+options = analytics.filter_options()
 
 # Create anchor points for navigation
 def scroll_to_section(section_id):
@@ -197,82 +214,25 @@ st.markdown("""
 # Sidebar Filters
 st.sidebar.title("🎛️ Filters")
 
-gender_density_notes = {
-    "Entry": """
-        - Most individuals fall between ages 22–25, consistent with recent graduates starting careers.<br>
-        - The peak density shows a sharp entry age, suggesting a clear transition from education to employment.<br>
-    """,
-    "Mid": """
-        - Concentrated around ages 23–26, indicating this is a common stage for early career growth.<br>
-        - The curve shifts right compared to Entry, reflecting natural career progression.<br>
-    """,
-    "Senior": """
-        - Age distribution is flatter and slightly older (24–27), showing a range of career pacing.<br>
-        - The peak is less sharp, indicating diverse timing in reaching senior roles.<br>
-    """,
-    "Executive": """
-        - Surprisingly younger skew, with a peak at 22–25, suggesting some reach this level early, likely via entrepreneurship.<br>
-        - A broader spread indicates both early achievers and experienced individuals.<br>
-    """
-}
-
-gender_pie_notes = {
-    "Entry": """
-        - Gender distribution is nearly equal, suggesting balanced access to entry-level opportunities.<br>
-        - Female and male participation rates are the highest at this level, indicating wide entry into the workforce.<br>
-    """,
-    "Mid": """
-        - Male proportion slightly increases, showing a potential gender gap in career progression.<br>
-        - Female representation remains relatively high, but slightly lower than entry-level.<br>
-    """,
-    "Senior": """
-        - Gender representation becomes more balanced again, possibly reflecting equal long-term commitment.<br>
-        - The total number is smaller, suggesting fewer people reach this stage.<br>
-    """,
-    "Executive": """
-        - Males dominate this level, revealing a strong gender imbalance at the top.<br>
-        - Female and other gender groups are significantly underrepresented.<br>
-    """
-}
-
-field_of_study_notes = {
-    "Entry": """
-        - Entry-level individuals are mostly between ages 24–26, with peaks in Computer Science and Engineering.<br>
-        - Study field distribution is fairly balanced, with Mathematics leading, reflecting the general demand for STEM-related roles.<br>
-    """,
-    "Mid": """
-        - Average age ranges from 25–27, with Computer Science and Law showing the highest density.<br>
-        - Study fields are quite diverse, with Law and Business being the most prominent, reflecting varied career trajectories at this stage.<br>
-    """,
-    "Senior": """
-        - Senior-level participants have a wider age range, mostly around 24–26, particularly in Medicine and Business.<br>
-        - Engineering is the most common study field, while Computer Science is less frequent—possibly due to the higher seniority typically required in technical roles.<br>
-    """,
-    "Executive": """
-        - Age distribution is broader, peaking around 25–27; Law and Arts tend to have older participants.<br>
-        - Arts and Mathematics dominate the study fields, while Business and Engineering are less represented, indicating more specialized paths at this level.<br>
-    """
-}
-
 # Gender Filter - Multiselect
-gender_options = sorted(df['Gender'].dropna().unique())
+gender_options = options['genders']
 selected_genders = st.sidebar.multiselect("Select Gender(s)", gender_options, default=gender_options)
 
 # Handle Gender Filter
 if not selected_genders:
     st.sidebar.warning("⚠️ No gender selected. Using full data. Please choose at least one option.")
-    gender_filtered = df
+    gender_filter = None
 elif 'All' in selected_genders:
-    gender_filtered = df
+    gender_filter = None
 else:
-    gender_filtered = df[df['Gender'].isin(selected_genders)]
+    gender_filter = selected_genders
 
 # Job Level Filter
-job_levels = sorted(df['Current_Job_Level'].dropna().unique())
+job_levels = options['levels']
 selected_level = st.sidebar.selectbox("Select Job Level", job_levels)
 
 # Age Filter
-min_age, max_age = int(df['Age'].min()), int(df['Age'].max())
+min_age, max_age = options['age_bounds']
 age_range = st.sidebar.slider("Select Age Range", min_value=min_age, max_value=max_age, value=(min_age, max_age))
 
 # Check if only one age selected
@@ -295,348 +255,326 @@ if not (show_yes or show_no):
     st.sidebar.warning("⚠️ No status selected. Using full data. Please choose at least one option.")
     selected_statuses = ['Yes', 'No']
 
-# Soft color palette matching the light background
-color_map = {'Yes': '#667eea', 'No': '#764ba2'}
-soft_colors = ['#667eea', '#764ba2', '#f093fb', '#f5576c', '#63b3ed', '#68d391', '#fbb6ce', '#f6e05e']
+selection = dict(
+    genders=gender_filter,
+    level=selected_level,
+    age_range=age_range,
+    statuses=selected_statuses
+)
 
-# Main Tabs
-tabs = st.tabs(["📈 Demographics", "📊 Job Offers", "💻 CODE"])
+filter_signature = analytics.signature(selection)
+
+# KPI cards for both tabs come from the same analytics layer the API serves
+with profiler.stage('kpis'):
+    kpis = analytics.kpis(selection)
+
+def _show_view(view):
+    # Runs before the next rerun draws the view selector, so it may set its key
+    st.session_state['active_view'] = view
 
 # === TAB 1 (Demographics) ===
-with tabs[0]:
+def render_demographics():
     st.markdown("""
         <h1 style='font-family: "Inter", sans-serif; color: #667eea; font-size: 40px; text-align: center; margin-bottom: 2rem;'>
             📊 Demographics Analysis
         </h1>
     """, unsafe_allow_html=True)
     
-    chart_option = st.selectbox("Select Variable for Visualization", ['Gender Distribution', 'Field of Study'])
-
-    df_demo = gender_filtered[
-        (gender_filtered['Current_Job_Level'] == selected_level) &
-        (gender_filtered['Age'].between(age_range[0], age_range[1])) &
-        (gender_filtered['Entrepreneurship'].isin(selected_statuses))
-    ]
+    chart_option = st.selectbox("Select Variable for Visualization", list(CHART_OPTIONS), key='chart_option')
 
-    if df_demo.empty:
+    if kpis['total'] == 0:
         st.warning("⚠️ Not enough data to display charts. Please adjust the filters.")
     else:
         if chart_option == 'Gender Distribution':
             with st.container():
-                st.markdown("""<div style="border: 2px solid #667eea; border-radius: 15px; padding: 25px; margin: 20px 0; background: linear-gradient(135deg, #f8fafc, #edf2f7); box-shadow: 0 8px 25px rgba(102, 126, 234, 0.1);">
-                    <div style="display: flex; justify-content: space-around; text-align: center; line-height: 1.4;">
-                        <div>
-                            <div style="font-size: 14px; color: #667eea; font-weight: 600;">Total Records</div>
-                            <div style="font-size: 32px; color: #2d3748; font-weight: 700;">{}</div>
-                        </div>
-                        <div>
-                            <div style="font-size: 14px; color: #667eea; font-weight: 600;">Median Age</div>
-                            <div style="font-size: 32px; color: #2d3748; font-weight: 700;">{:.1f}</div>
-                        </div>
-                        <div>
-                            <div style="font-size: 14px; color: #667eea; font-weight: 600;">% Female</div>
-                            <div style="font-size: 32px; color: #2d3748; font-weight: 700;">{:.1f}%</div>
-                        </div>
-                    </div></div>
-                """.format(len(df_demo), df_demo['Age'].median(),
-                           (df_demo['Gender'] == 'Female').mean() * 100),
-                unsafe_allow_html=True)
+                st.markdown(kpi_card('demographics', kpis['total'], kpis['median_age'], kpis['pct_female']), unsafe_allow_html=True)
         else:
-            top_fields = df_demo['Field_of_Study'].value_counts().head(3).index.tolist()
+            top_fields = kpis['top_fields']
             display_fields = ", ".join(top_fields) if top_fields else "N/A"
             with st.container():
-                st.markdown("""<div style="border: 2px solid #667eea; border-radius: 15px; padding: 25px; margin: 20px 0; background: linear-gradient(135deg, #f8fafc, #edf2f7); box-shadow: 0 8px 25px rgba(102, 126, 234, 0.1);">
-                    <div style="display: flex; justify-content: space-around; text-align: center; line-height: 1.4;">
-                        <div>
-                            <div style="font-size: 14px; color: #667eea; font-weight: 600;">Total Records</div>
-                            <div style="font-size: 32px; color: #2d3748; font-weight: 700;">{}</div>
-                        </div>
-                        <div>
-                            <div style="font-size: 14px; color: #667eea; font-weight: 600;">Top 3 Fields</div>
-                            <div style="font-size: 22px; color: #2d3748; font-weight: 600;">{}</div>
-                        </div>
-                    </div></div>
-                """.format(len(df_demo), display_fields),
-                unsafe_allow_html=True)
+                st.markdown(kpi_card('fields', kpis['total'], display_fields), unsafe_allow_html=True)
 
         col1, col2 = st.columns(2)
 
         with col1:
-            fig_density = go.Figure()
-            group_col = 'Gender' if chart_option == 'Gender Distribution' else 'Field_of_Study'
-            title = f"Age Distribution by {group_col.replace('_', ' ')}"
-            categories = df_demo[group_col].dropna().unique()
-
-            for i, cat in enumerate(categories):
-                age_data = df_demo[df_demo[group_col] == cat]['Age']
-                if len(age_data) > 1:
-                    kde = gaussian_kde(age_data)
-                    x_vals = np.linspace(age_range[0], age_range[1], 100)
-                    y_vals = kde(x_vals)
-                    fig_density.add_trace(go.Scatter(
-                        x=x_vals,
-                        y=y_vals,
-                        mode='lines',
-                        name=str(cat),
-                        fill='tozeroy',
-                        line=dict(color=soft_colors[i % len(soft_colors)], width=3),
-                        fillcolor=f"rgba{(*[int(soft_colors[i % len(soft_colors)][j:j+2], 16) for j in (1, 3, 5)], 0.3)}"
-                    ))
-
-            fig_density.update_layout(
-                paper_bgcolor='rgba(248, 250, 252, 0.8)',
-                plot_bgcolor='rgba(255, 255, 255, 0.9)',
-                title=dict(text=title, font=dict(size=18, color='#2d3748', family='Inter')),
-                xaxis_title="Age",
-                yaxis_title="Density",
-                height=500,
-                margin=dict(t=50, l=50, r=50, b=80),
-                legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
-                font=dict(family='Inter', color='#4a5568')
-            )
-            st.plotly_chart(fig_density, use_container_width=True)
+            group_col = CHART_OPTIONS[chart_option]
+            # Finished figures are reused for repeated filter states
+            with profiler.stage('figure:density'):
+                fig_density = render_cache.get_or_build(('density', filter_signature, chart_option), lambda: density_figure(analytics, selection, group_col))
+            with profiler.stage('plotly_chart:density'):
+                st.plotly_chart(fig_density, use_container_width=True)
 
         with col2:
-            group_col = 'Gender' if chart_option == 'Gender Distribution' else 'Field_of_Study'
-            pie_data = df_demo[group_col].value_counts().reset_index()
-            pie_data.columns = [group_col, 'Count']
-
-            labels = pie_data[group_col]
-            values = pie_data['Count']
-
-            fig_donut = go.Figure(data=[
-                go.Pie(
-                    labels=labels,
-                    values=values,
-                    hole=0.5,
-                    textinfo='percent+label',
-                    insidetextorientation='radial',
-                    marker=dict(
-                        line=dict(color='#ffffff', width=3),
-                        colors=soft_colors[:len(labels)]
-                    ),
-                    hovertemplate="<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>",
-                    textfont=dict(size=14, family='Inter')
-                )
-            ])
-
-            fig_donut.update_layout(
-                title={
-                    'text': f"{group_col.replace('_', ' ')} Distribution",
-                    'x': 0.5,
-                    'xanchor': 'center',
-                    'font': dict(size=18, color='#2d3748', family='Inter')
-                },
-                legend=dict(
-                    orientation='h',
-                    yanchor='bottom',
-                    y=-0.3,
-                    xanchor='center',  
-                    x=0.5,
-                    font=dict(size=12, family='Inter')
-                ),
-                height=500,
-                margin=dict(t=50, l=20, r=20, b=80),
-                paper_bgcolor='rgba(248, 250, 252, 0.8)',
-                plot_bgcolor='rgba(255, 255, 255, 0.9)',
-                font=dict(color='#4a5568', family='Inter')
-            )
-
-            st.plotly_chart(fig_donut, use_container_width=True)
-
-        # Notes Section with improved styling
-        note_style = """
-        <div style="
-            background: linear-gradient(135deg, #f8fafc, #edf2f7);
-            border-left: 6px solid #667eea;
-            padding: 25px;
-            margin-top: 30px;
-            border-radius: 15px;
-            box-shadow: 0 8px 25px rgba(102, 126, 234, 0.1);
-            font-family: 'Inter', sans-serif;
-        ">
-            <div style="font-size: 20px; font-weight: 700; margin-bottom: 12px; color: #667eea;">
-                📌 {title}
-            </div>
-            <div style="font-size: 15px; color: #4a5568; line-height: 1.6;">
-                {text}
-            </div>
-        </div>
-        """
+            with profiler.stage('figure:donut'):
+                fig_donut = render_cache.get_or_build(('donut', filter_signature, chart_option), lambda: donut_figure(analytics, selection, group_col))
+            with profiler.stage('plotly_chart:donut'):
+                st.plotly_chart(fig_donut, use_container_width=True)
+
 
+        # Rendered once per (level, chart option, generated lines)
+        insights = analytics.insights(selection) if INSIGHT_NOTES else None
+        notes = note_fragments('demographics', selected_level, chart_option, insights)
         if chart_option == 'Gender Distribution':
             note_col1, note_col2 = st.columns(2)
             with note_col1:
-                st.markdown(
-                    note_style.format(
-                        title=f"Density Chart Insights ({selected_level})",
-                        text=gender_density_notes.get(selected_level, "No density notes available.")
-                    ),
-                    unsafe_allow_html=True
-                )
+                st.markdown(notes[0], unsafe_allow_html=True)
             with note_col2:
-                st.markdown(
-                    note_style.format(
-                        title=f"Donut Chart Insights ({selected_level})",
-                        text=gender_pie_notes.get(selected_level, "No donut chart notes available.")
-                    ),
-                    unsafe_allow_html=True
-                )
+                st.markdown(notes[1], unsafe_allow_html=True)
         elif chart_option == 'Field of Study':
-            st.markdown(
-                note_style.format(
-                    title=f"Field of Study Insights – {selected_level}",
-                    text=field_of_study_notes.get(selected_level, "No notes for this level.")
-                ),
-                unsafe_allow_html=True
-            )
+            st.markdown(notes[0], unsafe_allow_html=True)
 
     # Next page button
-    st.markdown("""
-        <button class="next-page-btn" onclick="document.querySelector('[data-testid=\"stTabs\"] button:nth-child(2)').click()">
-            Next: Job Offers Analysis →
-        </button>
-    """, unsafe_allow_html=True)
+    if LAZY_TABS:
+        # No st.tabs to click in lazy mode: switch the view selector instead
+        st.button("Next: Job Offers Analysis →", key='next_view', on_click=_show_view, args=("📊 Job Offers",))
+    else:
+        st.markdown("""
+            <button class="next-page-btn" onclick="document.querySelector('[data-testid=\"stTabs\"] button:nth-child(2)').click()">
+                Next: Job Offers Analysis →
+            </button>
+        """, unsafe_allow_html=True)
 
 # === TAB 2 (Job Offers) ===
-job_level_notes = {
-    "Entry": """
-        - Majority of individuals across all ages do not pursue entrepreneurship.<br>
-        - A slight increase in entrepreneurial interest is seen between ages 21–23.<br>
-    """,
-    "Mid": """
-        - Entrepreneurship participation remains relatively steady, with slight increases around age 21–23.<br>
-        - Majority still fall under the non-entrepreneurship group across all ages.<br>
-    """,
-    "Senior": """
-        - A fairly balanced distribution between entrepreneurs and non-entrepreneurs, with some age groups showing higher entrepreneurship (e.g., age 29).<br>
-        - Proportion of entrepreneurs is more prominent than in mid and entry levels.<br>
-    """,
-    "Executive": """
-        - Entrepreneurship (Yes) fluctuates across ages, with no clear increasing or decreasing pattern.<br>
-        - Ages 20–22 show a relatively higher proportion of entrepreneurship compared to other ages.<br>
-    """
-}
-
-job_offers_notes = {
-    "Entry": """
-        - Individuals with entrepreneurial intentions generally receive more job offers, especially at ages 18, 26, and 28.<br>
-        - Entrepreneurial individuals maintain a more stable or slightly upward trend in offers.<br>
-    """,
-    "Mid": """
-        - Highest job offer spike for entrepreneurs occurs around age 27.<br>
-        - Despite fluctuations, the difference in job offers between groups is generally narrow (within ~0.5).<br>
-    """,
-    "Senior": """
-        - Sharp spike for entrepreneurs at age 29 indicates potential late-career success.<br>
-        - Entrepreneurs face more volatility in job offers, suggesting high risk–high reward dynamics at senior levels.<br>
-    """,
-    "Executive": """
-        - Peak job offers for entrepreneurs occur around age 27, suggesting growing opportunities with age.<br>
-        - Fluctuations in entrepreneurial job offers imply less stability compared to non-entrepreneurs.<br>
-    """
-}
-
-with tabs[1]:
+def render_job_offers():
     st.markdown("""
         <h1 style='font-family: "Inter", sans-serif; color: #764ba2; font-size: 40px; text-align: center; margin-bottom: 2rem;'>
             📊 Job Offers Analysis
         </h1>
     """, unsafe_allow_html=True)
 
-    df_filtered = gender_filtered[
-        (gender_filtered['Current_Job_Level'] == selected_level) &
-        (gender_filtered['Age'].between(age_range[0], age_range[1])) &
-        (gender_filtered['Entrepreneurship'].isin(selected_statuses))
-    ]
-
-    if df_filtered.empty:
+    if kpis['total'] == 0:
         st.warning("⚠️ Not enough data to display charts. Please adjust the filters.")
     else:
         with st.container():
-            st.markdown("""<div style="border: 2px solid #764ba2; border-radius: 15px; padding: 25px; margin: 20px 0; background: linear-gradient(135deg, #f8fafc, #edf2f7); box-shadow: 0 8px 25px rgba(118, 75, 162, 0.1);">
-                <div style="display: flex; justify-content: space-around; text-align: center; line-height: 1.4;">
-                    <div>
-                        <div style="font-size: 14px; color: #764ba2; font-weight: 600;">Total Records</div>
-                        <div style="font-size: 32px; color: #2d3748; font-weight: 700;">{}</div>
-                    </div>
-                    <div>
-                        <div style="font-size: 14px; color: #764ba2; font-weight: 600;">Median Age</div>
-                        <div style="font-size: 32px; color: #2d3748; font-weight: 700;">{:.1f}</div>
-                    </div>
-                    <div>
-                        <div style="font-size: 14px; color: #764ba2; font-weight: 600;">Entrepreneurs (%)</div>
-                        <div style="font-size: 32px; color: #2d3748; font-weight: 700;">{:.1f}%</div>
-                    </div>
-                </div></div>
-            """.format(len(df_filtered), df_filtered['Age'].median(),
-                       (df_filtered['Entrepreneurship'] == "Yes").mean() * 100),
-            unsafe_allow_html=True)
-
-        df_grouped = (
-            df.groupby(['Current_Job_Level', 'Age', 'Entrepreneurship'])
-            .size()
-            .reset_index(name='Count')
-        )
-        df_grouped['Percentage'] = df_grouped.groupby(['Current_Job_Level', 'Age'])['Count'].transform(lambda x: x / x.sum())
-
-        df_bar = df_grouped[
-            (df_grouped['Current_Job_Level'] == selected_level) &
-            (df_grouped['Age'].between(age_range[0], age_range[1])) &
-            (df_grouped['Entrepreneurship'].isin(selected_statuses))
-        ]
-
-        even_ages = sorted(df_bar['Age'].unique())
-        even_ages = [age for age in even_ages if age % 2 == 0]
-
-        fig_bar = px.bar(
-            df_bar,
-            x='Age',
-            y='Percentage',
-            color='Entrepreneurship',
-            barmode='stack',
-            color_discrete_map=color_map,
-            category_orders={'Entrepreneurship': ['No', 'Yes']},
-            labels={'Age': 'Age', 'Percentage': 'Percentage'},
-            height=450,
-            title=f"Entrepreneurship Distribution by Age – {selected_level} Level"
-        )
+            st.markdown(kpi_card('job_offers', kpis['total'], kpis['median_age'], kpis['pct_entrepreneurs']), unsafe_allow_html=True)
 
-        fig_bar.update_traces(
-            hovertemplate="Entrepreneurship=%{customdata[0]}<br>Age=%{x}<br>Percentage=%{y:.0%}<extra></extra>",
-            customdata=df_bar[['Entrepreneurship']].values,
-            hoverinfo="skip"
-        )
+        with profiler.stage('figure:bar'):
+            fig_bar = render_cache.get_or_build(('bar', filter_signature), lambda: bar_figure(analytics, selection))
+        with profiler.stage('figure:line'):
+            fig_line = render_cache.get_or_build(('line', filter_signature), lambda: line_figure(analytics, selection))
+
+        insights = analytics.insights(selection) if INSIGHT_NOTES else None
+        notes = note_fragments('job_offers', selected_level, insights=insights)
+        col1, col2 = st.columns(2)
+        with col1:
+            with profiler.stage('plotly_chart:bar'):
+                st.plotly_chart(fig_bar, use_container_width=True)
+            st.markdown(notes[0], unsafe_allow_html=True)
+        with col2:
+            with profiler.stage('plotly_chart:line'):
+                st.plotly_chart(fig_line, use_container_width=True)
+            st.markdown(notes[1], unsafe_allow_html=True)
+
+# === Level comparison ===
+def render_level_comparison():
+    st.markdown("""
+        <h1 style='font-family: "Inter", sans-serif; color: #667eea; font-size: 40px; text-align: center; margin-bottom: 2rem;'>
+            🧮 Job Level Comparison
+        </h1>
+    """, unsafe_allow_html=True)
 
-        fig_bar.update_layout(
+    # The same batch the level selectbox reads from, so this costs no extra pass
+    with profiler.stage('level_comparison'):
+        comparison = analytics.level_comparison(selection)
+
+    st.dataframe(
+        comparison.set_index('Level').style.format(
+            {'Median Age': '{:.1f}', '% Female': '{:.1f}%', '% Entrepreneurs': '{:.1f}%'}, na_rep='N/A'),
+        use_container_width=True
+    )
+
+    def build_levels():
+        fig_levels = go.Figure()
+        for i, column in enumerate(['% Female', '% Entrepreneurs']):
+            fig_levels.add_trace(go.Bar(
+                x=comparison['Level'],
+                y=comparison[column],
+                name=column,
+                marker_color=soft_colors[i],
+                hovertemplate="%{y:.1f}%"
+            ))
+        fig_levels.update_layout(
             paper_bgcolor='rgba(248, 250, 252, 0.8)',
             plot_bgcolor='rgba(255, 255, 255, 0.9)',
+            title=dict(text="Female and Entrepreneur Share by Job Level", font=dict(size=18, color='#2d3748', family='Inter')),
+            xaxis_title="Job Level",
+            yaxis_title="Percentage",
+            barmode='group',
+            height=450,
             margin=dict(t=50, l=50, r=50, b=50),
-            legend_title_text='Entrepreneurship',
-            xaxis_tickangle=0,
-            bargap=0.1,
-            xaxis=dict(tickvals=even_ages),
-            yaxis=dict(title="Percentage", range=[0, 1], tickformat=".0%"),
             legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5),
-            font=dict(family='Inter', color='#4a5568'),
-            title=dict(font=dict(size=18, color='#2d3748', family='Inter'))
+            font=dict(family='Inter', color='#4a5568')
         )
+        return fig_levels
+
+    with profiler.stage('figure:levels'):
+        fig_levels = render_cache.get_or_build(('levels', analytics.signature(dict(selection, level=None))), build_levels)
+    with profiler.stage('plotly_chart:levels'):
+        st.plotly_chart(fig_levels, use_container_width=True)
 
-        df_avg_offers = (
-            df_filtered
-            .groupby(['Age', 'Entrepreneurship'])['Job_Offers']
-            .mean()
-            .reset_index()
+# === Career outcomes ===
+OUTCOME_BREAKDOWNS = {'Field of Study': 'Field_of_Study', 'Job Level': 'Current_Job_Level', 'Gender': 'Gender'}
+
+def render_career_outcomes():
+    st.markdown("""
+        <h1 style='font-family: "Inter", sans-serif; color: #667eea; font-size: 40px; text-align: center; margin-bottom: 2rem;'>
+            💼 Career Outcomes
+        </h1>
+    """, unsafe_allow_html=True)
+
+    labels = analytics.outcome_cube().labels
+    col1, col2 = st.columns(2)
+    with col1:
+        outcome = st.selectbox("Outcome", list(OUTCOME_COLUMNS), format_func=lambda c: c.replace('_', ' '), key='outcome_column')
+        fields = st.multiselect("Fields of Study", list(labels['Field_of_Study']), key='outcome_fields')
+    with col2:
+        breakdown = st.radio("Break down by", list(OUTCOME_BREAKDOWNS), horizontal=True, key='outcome_breakdown')
+        levels = st.multiselect("Job Levels", list(labels['Current_Job_Level']), key='outcome_levels')
+    st.caption("Empty lists mean all fields and levels. The sidebar's gender filter applies; ages and entrepreneurship status do not.")
+
+    # Served from the per-version outcome cube: no row scan on any interaction
+    by = OUTCOME_BREAKDOWNS[breakdown]
+    with profiler.stage('outcomes'):
+        report = analytics.outcomes(dict(selection, level=None), outcome, by, fields=fields or None, levels=levels or None)
+    summary = report['summary']
+    if summary.empty:
+        st.warning("⚠️ Not enough data to display charts. Please adjust the filters.")
+        return
+
+    title = outcome.replace('_', ' ')
+    st.dataframe(
+        summary.set_index(by).style.format(
+            {column: '{:,.2f}' for column in summary.columns if column not in (by, 'Count', 'Outliers')}, na_rep='N/A'),
+        use_container_width=True
+    )
+    if report['relative_error']:
+        st.caption(f"{title} percentiles are within {report['relative_error']:.1%} of the exact values.")
+
+    # Genders only: the outcome figures do not depend on ages or statuses
+    outcome_signature = analytics.signature(dict(genders=gender_filter))
+    drilldown = (outcome, by, tuple(fields), tuple(levels))
+
+    def build_box():
+        fig_box = go.Figure(go.Box(
+            x=summary[by].astype(str),
+            q1=summary['Q1'],
+            median=summary['Median'],
+            q3=summary['Q3'],
+            lowerfence=summary['Lower Fence'],
+            upperfence=summary['Upper Fence'],
+            mean=summary['Mean'],
+            sd=summary['Std'],
+            marker_color=soft_colors[0],
+            boxmean='sd',
+            name=title
+        ))
+        fig_box.update_layout(
+            paper_bgcolor='rgba(248, 250, 252, 0.8)',
+            plot_bgcolor='rgba(255, 255, 255, 0.9)',
+            title=dict(text=f"{title} by {breakdown}", font=dict(size=18, color='#2d3748', family='Inter')),
+            xaxis_title=breakdown,
+            yaxis_title=title,
+            height=450,
+            margin=dict(t=50, l=50, r=50, b=50),
+            showlegend=False,
+            font=dict(family='Inter', color='#4a5568')
+        )
+        return fig_box
+
+    def build_histogram():
+        histogram = report['histogram']
+        fig_hist = go.Figure(go.Bar(
+            x=(histogram['Low'] + histogram['High']) / 2,
+            y=histogram['Count'],
+            width=histogram['High'] - histogram['Low'],
+            marker_color=soft_colors[1],
+            hovertemplate="%{x:,.0f}: %{y}<extra></extra>"
+        ))
+        fig_hist.update_layout(
+            paper_bgcolor='rgba(248, 250, 252, 0.8)',
+            plot_bgcolor='rgba(255, 255, 255, 0.9)',
+            title=dict(text=f"{title} Distribution", font=dict(size=18, color='#2d3748', family='Inter')),
+            xaxis_title=title,
+            yaxis_title="Count",
+            bargap=0.05,
+            height=450,
+            margin=dict(t=50, l=50, r=50, b=50),
+            font=dict(family='Inter', color='#4a5568')
         )
+        return fig_hist
+
+    def build_correlation():
+        correlation = report['correlation'].set_index('Column')
+        names = [c.replace('_', ' ') for c in correlation.columns]
+        fig_corr = go.Figure(go.Heatmap(
+            z=correlation.to_numpy(),
+            x=names,
+            y=names,
+            zmin=-1,
+            zmax=1,
+            colorscale=[[0, '#764ba2'], [0.5, '#f8fafc'], [1, '#667eea']],
+            hovertemplate="%{y} / %{x}: %{z:.3f}<extra></extra>"
+        ))
+        fig_corr.update_layout(
+            paper_bgcolor='rgba(248, 250, 252, 0.8)',
+            title=dict(text="Correlation of Career Outcomes", font=dict(size=18, color='#2d3748', family='Inter')),
+            height=550,
+            margin=dict(t=50, l=50, r=50, b=50),
+            font=dict(family='Inter', color='#4a5568')
+        )
+        return fig_corr
+
+    col1, col2 = st.columns(2)
+    with col1:
+        with profiler.stage('figure:outcome_box'):
+            fig_box = render_cache.get_or_build(('outcome_box', outcome_signature, drilldown), build_box)
+        with profiler.stage('plotly_chart:outcome_box'):
+            st.plotly_chart(fig_box, use_container_width=True)
+    with col2:
+        with profiler.stage('figure:outcome_histogram'):
+            fig_hist = render_cache.get_or_build(('outcome_histogram', outcome_signature, drilldown[0], drilldown[2:]), build_histogram)
+        with profiler.stage('plotly_chart:outcome_histogram'):
+            st.plotly_chart(fig_hist, use_container_width=True)
+
+    with profiler.stage('figure:outcome_correlation'):
+        fig_corr = render_cache.get_or_build(('outcome_correlation', outcome_signature, drilldown[2:]), build_correlation)
+    with profiler.stage('plotly_chart:outcome_correlation'):
+        st.plotly_chart(fig_corr, use_container_width=True)
 
-        fig_line = go.Figure()
-        for status in selected_statuses:
-            data_status = df_avg_offers[df_avg_offers["Entrepreneurship"] == status]
-            fig_line.add_trace(go.Scatter(
-                x=data_status["Age"],
-                y=data_status["Job_Offers"],
-                mode="lines+markers",
-                name=status,
-                line=dict(color=color_map[status], width=4),
-                marker=dict(size=8, line=dict(width=2, color='white')),
-                hovertemplate="%{y:.2f}"
+# Main Tabs
+TABS = {
+    "📈 Demographics": render_demographics,
+    "📊 Job Offers": render_job_offers,
+    "🧮 Level Comparison": render_level_comparison,
+    "💼 Career Outcomes": render_career_outcomes,
+    "💻 CODE": None,
+}
+
+if LAZY_TABS:
+    # Only the selected view runs; the others are built when first opened
+    # and then come from the render cache. Streamlit drops the state of
+    # widgets that were not drawn, so hidden views' choices are carried over.
+    for key in ('chart_option', 'outcome_column', 'outcome_breakdown', 'outcome_fields', 'outcome_levels'):
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+    active_view = st.radio("View", list(TABS), horizontal=True, key='active_view', label_visibility='collapsed')
+    if TABS[active_view] is not None:
+        TABS[active_view]()
+else:
+    for tab, render in zip(st.tabs(list(TABS)), TABS.values()):
+        if render is not None:
+            with tab:
+                render()
+
+if SHOW_CACHE_STATS:
+    # Every derived-result cache, its memory and invalidations by data version
+    with st.sidebar.expander("Caches"):
+        st.json(registry.stats())
+
+rerun = profiler.finish_rerun(level=selected_level, chart=st.session_state.get('chart_option'), filters=filter_signature[1])
+if rerun is not None:
+    with st.sidebar.expander("Profiling"):
+        st.caption(f"This rerun: {rerun['total_ms']:.1f} ms, RSS {rerun['rss_delta'] / 1e6:+.1f} MB")
+        st.dataframe(pd.DataFrame(rerun['stages']).set_index('name'), use_container_width=True)
+        st.caption(f"Last {len(profiler.reruns)} reruns (ms)")
+        st.dataframe(profiler.summary().round(2), use_container_width=True)
@@ -0,0 +1,24 @@
+import os
+import threading
+
+# path -> (mtime_ns, text)
+_texts = {}
+_lock = threading.Lock()
+
+
+def read_text(path):
+    """Contents of a static file, read again only after its mtime changes.
+
+    Every rerun of the app script asks for the stylesheet; this keeps one
+    copy per process instead of a disk read per rerun.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        cached = _texts.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    with _lock:
+        _texts[path] = (mtime, text)
+    return text
@@ -0,0 +1,350 @@
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from cube import _kpis, _largest_first, median_from_counts
+from settings import BACKEND_DIR
+
+# Columns a backend needs: the sidebar filters, the donut/KPI groupings and
+# the Tab 2 measure
+BACKEND_COLUMNS = ['Gender', 'Current_Job_Level', 'Age', 'Entrepreneurship', 'Field_of_Study', 'Job_Offers']
+
+AGE_STATUS = ['Age', 'Entrepreneurship']
+
+
+class QueryBackend(ABC):
+    """The dashboard's queries over one dataset version, behind one interface.
+
+    Subclasses implement four primitives on a selection (a dict as built by
+    ``normalize_filters``): ``histogram`` (row counts per value),
+    ``first_rows`` (order of first appearance), ``mean_by`` (grouped means)
+    and ``share_by`` (grouped counts with the share of the last key within
+    the others). The KPI cards, donut counts, median and Tab 2 series are
+    derived from them here, in the same shape the cube returns.
+    """
+
+    name = None
+
+    @abstractmethod
+    def histogram(self, filters, column):
+        """Row counts per value of ``column``, in value order, zeros allowed."""
+
+    @abstractmethod
+    def first_rows(self, filters, column):
+        """Per value of ``column``, a number that orders the values by their
+        first selected row (the row position, or a rank)."""
+
+    @abstractmethod
+    def mean_by(self, filters, keys, column):
+        """``keys`` and the mean of ``column`` for every non-empty group."""
+
+    @abstractmethod
+    def share_by(self, filters, keys):
+        """``keys``, Count and Percentage: each group's share of its
+        ``keys[:-1]`` group, for every non-empty group."""
+
+    def count(self, filters):
+        return int(self.histogram(filters, 'Gender').sum())
+
+    def value_counts(self, filters, column):
+        """Non-zero counts sorted descending, ties by first appearance, like
+        ``Series.value_counts``."""
+        return _largest_first(self.histogram(filters, column), self.first_rows(filters, column))
+
+    def median(self, filters, column='Age'):
+        counts = self.histogram(filters, column)
+        return median_from_counts(counts.index.to_numpy(), counts.to_numpy())
+
+    def kpis(self, filters):
+        return _kpis(*(self.histogram(filters, column)
+                       for column in ('Age', 'Gender', 'Entrepreneurship', 'Field_of_Study')),
+                     first_fields=self.first_rows(filters, 'Field_of_Study'))
+
+    def entrepreneurship_by_age(self, filters):
+        # Shares are over all statuses, then restricted to the selected ones
+        frame = self.share_by(dict(filters, statuses=None), AGE_STATUS)
+        if filters.get('statuses') is not None:
+            frame = frame[frame['Entrepreneurship'].isin(filters['statuses'])]
+        return frame.reset_index(drop=True)
+
+    def job_offers_by_age(self, filters):
+        return self.mean_by(filters, AGE_STATUS, 'Job_Offers')
+
+
+class CubeBackend(QueryBackend):
+    """The OlapCube: every query is a slice of pre-aggregated counts.
+
+    The default. The derived queries go straight to the cube's own methods,
+    which are what the dashboard has always used.
+    """
+
+    name = 'cube'
+
+    def __init__(self, cube):
+        self.cube = cube
+
+    def histogram(self, filters, column):
+        return self.cube.marginal(column, **filters)
+
+    def first_rows(self, filters, column):
+        return self.cube.first_rows(column, **filters)
+
+    def _grouped(self, array, filters, keys):
+        cube = self.cube
+        # Groups in label order, whatever the order of the selected values
+        index = [np.sort(positions) for positions in cube._index(**filters)]
+        axes = [cube.axis(key) for key in keys]
+        sub = np.moveaxis(array[np.ix_(*index)], axes, range(len(axes)))
+        sub = sub.reshape(sub.shape[:len(axes)] + (-1,)).sum(axis=-1)
+        labels = [np.asarray(cube.labels[key], dtype=object)[index[axis]] for key, axis in zip(keys, axes)]
+        return sub, pd.MultiIndex.from_product(labels, names=keys)
+
+    def mean_by(self, filters, keys, column):
+        if column != 'Job_Offers':
+            raise ValueError(f"the cube holds sums of Job_Offers only, not {column!r}")
+        counts, index = self._grouped(self.cube.counts, filters, keys)
+        sums, _ = self._grouped(self.cube.job_offers, filters, keys)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frame = pd.DataFrame({column: (sums / counts).ravel()}, index=index)
+        return frame[counts.ravel() > 0].reset_index()
+
+    def share_by(self, filters, keys):
+        counts, index = self._grouped(self.cube.counts, filters, keys)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shares = counts / counts.sum(axis=-1, keepdims=True)
+        frame = pd.DataFrame({'Count': counts.ravel(), 'Percentage': shares.ravel()}, index=index)
+        return frame[frame['Count'] > 0].reset_index()
+
+    def value_counts(self, filters, column):
+        return self.cube.value_counts(column, **filters)
+
+    def kpis(self, filters):
+        return self.cube.kpis(**filters)
+
+    def entrepreneurship_by_age(self, filters):
+        return self.cube.entrepreneurship_by_age(**filters)
+
+    def job_offers_by_age(self, filters):
+        return self.cube.job_offers_by_age(**filters)
+
+
+class PandasBackend(QueryBackend):
+    """Boolean masks and groupbys over the in-memory frame."""
+
+    name = 'pandas'
+
+    def __init__(self, frame):
+        self.frame = frame[BACKEND_COLUMNS]
+
+    def _selected(self, filters):
+        frame = self.frame
+        mask = np.ones(len(frame), dtype=bool)
+        if filters.get('genders') is not None:
+            mask &= frame['Gender'].isin(filters['genders']).to_numpy()
+        if filters.get('level') is not None:
+            mask &= (frame['Current_Job_Level'] == filters['level']).to_numpy()
+        if filters.get('age_range') is not None:
+            low, high = filters['age_range']
+            mask &= frame['Age'].between(low, high).to_numpy()
+        if filters.get('statuses') is not None:
+            mask &= frame['Entrepreneurship'].isin(filters['statuses']).to_numpy()
+        return frame[mask]
+
+    def histogram(self, filters, column):
+        values = self._selected(filters)[column]
+        return values.groupby(values, observed=True).size()
+
+    def first_rows(self, filters, column):
+        # pd.unique keeps the order of first appearance
+        values = pd.unique(self._selected(filters)[column])
+        return pd.Series(np.arange(len(values)), index=pd.Index(values, name=column))
+
+    def mean_by(self, filters, keys, column):
+        return self._selected(filters).groupby(keys, observed=True)[column].mean().reset_index()
+
+    def share_by(self, filters, keys):
+        counts = self._selected(filters).groupby(keys, observed=True).size()
+        totals = counts.groupby(level=list(range(len(keys) - 1))).transform('sum')
+        return pd.DataFrame({'Count': counts, 'Percentage': counts / totals}).reset_index()
+
+
+def _where(filters):
+    """SQL WHERE clause and parameters for a selection."""
+    clauses, params = [], []
+
+    def isin(column, values):
+        if not values:
+            clauses.append('0 = 1')
+            return
+        clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+
+    if filters.get('genders') is not None:
+        isin('Gender', filters['genders'])
+    if filters.get('level') is not None:
+        clauses.append('Current_Job_Level = ?')
+        params.append(filters['level'])
+    if filters.get('age_range') is not None:
+        clauses.append('Age BETWEEN ? AND ?')
+        params.extend(int(age) for age in filters['age_range'])
+    if filters.get('statuses') is not None:
+        isin('Entrepreneurship', filters['statuses'])
+    return ('WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+class SqlBackend(QueryBackend):
+    """Each query is one GROUP BY over a ``dataset`` table; subclasses run it.
+
+    ``row_number`` is the column (or pseudo-column) holding each row's
+    position in the frame.
+    """
+
+    row_number = None
+
+    @abstractmethod
+    def _query(self, sql, params):
+        """Result of ``sql`` with ``params`` as a DataFrame."""
+
+    def histogram(self, filters, column):
+        where, params = _where(filters)
+        frame = self._query(f'SELECT {column}, COUNT(*) AS n FROM dataset {where} '
+                            f'GROUP BY {column} ORDER BY {column}', params)
+        return pd.Series(frame['n'].to_numpy(), index=pd.Index(frame[column].tolist(), name=column))
+
+    def first_rows(self, filters, column):
+        where, params = _where(filters)
+        frame = self._query(f'SELECT {column}, MIN({self.row_number}) AS first FROM dataset {where} '
+                            f'GROUP BY {column}', params)
+        return pd.Series(frame['first'].to_numpy(), index=pd.Index(frame[column].tolist(), name=column))
+
+    def mean_by(self, filters, keys, column):
+        where, params = _where(filters)
+        groups = ', '.join(keys)
+        return self._query(f'SELECT {groups}, AVG({column}) AS {column} FROM dataset {where} '
+                           f'GROUP BY {groups} ORDER BY {groups}', params)
+
+    def share_by(self, filters, keys):
+        where, params = _where(filters)
+        groups = ', '.join(keys)
+        outer = ', '.join(keys[:-1])
+        return self._query(
+            f'SELECT {groups}, COUNT(*) AS Count, '
+            f'CAST(COUNT(*) AS DOUBLE) / SUM(COUNT(*)) OVER (PARTITION BY {outer}) AS Percentage '
+            f'FROM dataset {where} GROUP BY {groups} ORDER BY {groups}', params)
+
+
+class SqliteBackend(SqlBackend):
+    """An indexed SQLite file per dataset version, written on first use.
+
+    The connection is read-only and shared by the sessions of the process,
+    like the precomputed store's. Rows are inserted in frame order, so the
+    rowid is the row position.
+    """
+
+    name = 'sqlite'
+    row_number = 'rowid'
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, frame, path):
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # Unique per build, so replicas building the same version do not
+        # write into each other's file before the rename
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        os.close(fd)
+        rows = frame[BACKEND_COLUMNS].copy()
+        for column in rows:
+            if isinstance(rows[column].dtype, pd.CategoricalDtype):
+                rows[column] = rows[column].astype(str)
+        try:
+            with sqlite3.connect(tmp) as conn:
+                rows.to_sql('dataset', conn, index=False, chunksize=100_000)
+                conn.execute('CREATE INDEX dataset_filters ON dataset '
+                             '(Current_Job_Level, Gender, Entrepreneurship, Age)')
+            conn.close()
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return cls(path)
+
+    def _query(self, sql, params):
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+
+class DuckDBBackend(SqlBackend):
+    """DuckDB over the in-memory frame: columnar, vectorized and multithreaded.
+
+    The backend columns and a row number are registered as a view. Needs
+    the optional ``duckdb`` package.
+    """
+
+    name = 'duckdb'
+    row_number = 'Row'
+
+    def __init__(self, frame):
+        try:
+            import duckdb
+        except ImportError as exc:
+            raise ImportError("DASHBOARD_QUERY_BACKEND=duckdb needs the duckdb package") from exc
+        self._conn = duckdb.connect()
+        self._conn.register('dataset', frame[BACKEND_COLUMNS].assign(Row=np.arange(len(frame))))
+
+    def _query(self, sql, params):
+        # A cursor per query: one DuckDB connection must not run two at once
+        return self._conn.cursor().execute(sql, params).df()
+
+
+def _remove_stale(directory, keep):
+    """Delete the SQLite files of other dataset versions.
+
+    Every append is a new version with its own file; connections still open
+    on an old one keep reading it until they are closed.
+    """
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.endswith('.sqlite') and path != keep:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+# backend name -> (dataset version, backend); older versions are dropped
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def open_backend(name, snapshot, version, directory=BACKEND_DIR):
+    """The ``name`` backend for a dataset snapshot, built once per version."""
+    frame, _, cube = snapshot
+    if name == 'cube':
+        return CubeBackend(cube)
+    if name not in ('pandas', 'sqlite', 'duckdb'):
+        raise ValueError(f"unknown query backend {name!r}")
+    if frame is None:
+        raise ValueError(f"the {name} backend needs the rows in memory; use the cube in out-of-core mode")
+    with _backends_lock:
+        current = _backends.get(name)
+        if current is None or current[0] != version:
+            if name == 'pandas':
+                backend = PandasBackend(frame)
+            elif name == 'duckdb':
+                backend = DuckDBBackend(frame)
+            else:
+                path = os.path.join(directory, f'{version}.sqlite')
+                backend = SqliteBackend(path) if os.path.exists(path) else SqliteBackend.build(frame, path)
+                _remove_stale(directory, keep=path)
+            _backends[name] = current = (version, backend)
+        return current[1]
@@ -0,0 +1,99 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from backends import CubeBackend, DuckDBBackend, PandasBackend, SqliteBackend
+from benchmarks.synthetic import dataset_path, parse_size
+from cube import OlapCube
+from data_cache import load_dataset
+
+SELECTIONS = [
+    dict(genders=None, level='Entry', age_range=(18, 29), statuses=['Yes', 'No']),
+    dict(genders=['Female', 'Male'], level='Mid', age_range=(20, 26), statuses=['Yes', 'No']),
+    dict(genders=['Male'], level='Senior', age_range=(20, 24), statuses=['Yes']),
+]
+
+QUERIES = {
+    'kpis': lambda backend, filters: backend.kpis(filters),
+    'value_counts': lambda backend, filters: backend.value_counts(filters, 'Field_of_Study'),
+    'entrepreneurship_by_age': lambda backend, filters: backend.entrepreneurship_by_age(filters),
+    'job_offers_by_age': lambda backend, filters: backend.job_offers_by_age(filters),
+}
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _same(expected, actual):
+    if isinstance(expected, pd.DataFrame):
+        return (list(expected.columns) == list(actual.columns) and len(expected) == len(actual) and all(
+            np.allclose(expected[c].to_numpy(dtype=float), actual[c].to_numpy(dtype=float))
+            if expected[c].dtype.kind in 'iuf' else
+            list(map(str, expected[c])) == list(map(str, actual[c]))
+            for c in expected.columns))
+    if isinstance(expected, pd.Series):
+        return list(map(str, expected.index)) == list(map(str, actual.index)) and list(expected) == list(actual)
+    return all(expected[k] == actual[k] or (expected[k] != expected[k] and actual[k] != actual[k])
+               for k in expected)
+
+
+def build_backends(frame, directory):
+    """(name, build seconds, backend) for every backend available here."""
+    builds = [
+        ('cube', lambda: CubeBackend(OlapCube(frame))),
+        ('pandas', lambda: PandasBackend(frame)),
+        ('sqlite', lambda: SqliteBackend.build(frame, os.path.join(directory, f'{len(frame)}.sqlite'))),
+        ('duckdb', lambda: DuckDBBackend(frame)),
+    ]
+    backends = []
+    for name, build in builds:
+        try:
+            seconds, backend = _timed(build)
+        except ImportError as exc:
+            print(f"  skipping {name}: {exc}")
+            continue
+        backends.append((name, seconds, backend))
+    return backends
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Same dashboard queries on every query backend")
+    parser.add_argument('--sizes', default='10k,1m')
+    parser.add_argument('--data-dir', default=os.path.join('.cache', 'synthetic'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in (parse_size(s) for s in args.sizes.split(',')):
+            frame = load_dataset(dataset_path(rows, args.data_dir), os.path.join(args.data_dir, 'cache'))
+            print(f"\n{rows:,} rows (best of {args.repeat}, mean over {len(SELECTIONS)} selections)")
+            backends = build_backends(frame, directory)
+            print(f"{'backend':>8} {'build':>10} " + ' '.join(f'{q:>24}' for q in QUERIES) + f" {'same':>5}")
+            reference = None
+            for name, build_seconds, backend in backends:
+                times, results = [], []
+                for query in QUERIES.values():
+                    per_selection = []
+                    for filters in SELECTIONS:
+                        best = float('inf')
+                        for _ in range(args.repeat):
+                            seconds, result = _timed(lambda: query(backend, filters))
+                            best = min(best, seconds)
+                        per_selection.append(best)
+                        results.append(result)
+                    times.append(np.mean(per_selection))
+                reference = reference or results
+                same = all(_same(expected, actual) for expected, actual in zip(reference, results))
+                print(f"{name:>8} {build_seconds * 1000:>7.1f} ms "
+                      + ' '.join(f'{t * 1000:>21.2f} ms' for t in times) + f" {str(same):>5}")
+
+
+if __name__ == '__main__':
+    main()
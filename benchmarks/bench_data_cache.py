@@ -0,0 +1,22 @@
+import argparse
+
+from data_cache import CACHE_DIR, benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold vs warm load of the columnar dataset cache")
+    parser.add_argument('source', nargs='?', default='education_career_success.csv')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = benchmark(args.source, args.cache_dir, args.repeat)
+    print(f"source: {args.source}")
+    print(f"  raw parse : {results['parse'] * 1000:8.2f} ms")
+    print(f"  cold load : {results['cold'] * 1000:8.2f} ms  (parse + convert)")
+    print(f"  warm load : {results['warm'] * 1000:8.2f} ms  (memory-mapped cache)")
+    print(f"  speedup   : {results['speedup']:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from cube import OlapCube
+from data_cache import read_source
+from filter_index import FilterIndex
+from ingest import IncrementalDataset
+
+
+def _write_rows(path, header, rows, count, mode):
+    with open(path, mode, encoding='utf-8') as f:
+        if header:
+            f.write(header + '\n')
+        for i in range(count):
+            f.write(rows[i % len(rows)] + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental append vs full reload")
+    parser.add_argument('source', nargs='?', default='education_career_success.csv')
+    parser.add_argument('--rows', type=int, default=200_000, help="rows in the base file")
+    parser.add_argument('--fractions', default='0.01,0.1,1.0')
+    args = parser.parse_args()
+
+    with open(args.source, encoding='utf-8-sig') as f:
+        header, *rows = f.read().splitlines()
+
+    workdir = tempfile.mkdtemp(prefix='bench_ingest_')
+    try:
+        base = os.path.join(workdir, 'base.csv')
+        _write_rows(base, header, rows, args.rows, 'w')
+
+        print(f"base: {args.rows:,} rows")
+        print(f"{'appended':>10} {'incremental':>14} {'full reload':>14} {'speedup':>8}")
+        for fraction in (float(x) for x in args.fractions.split(',')):
+            work = os.path.join(workdir, 'work.csv')
+            shutil.copy(base, work)
+            dataset = IncrementalDataset(work, os.path.join(workdir, 'cache'))
+
+            appended = int(args.rows * fraction)
+            _write_rows(work, None, rows, appended, 'a')
+
+            start = time.perf_counter()
+            dataset.refresh()
+            incremental = time.perf_counter() - start
+
+            start = time.perf_counter()
+            frame = read_source(work)
+            FilterIndex(frame)
+            OlapCube(frame)
+            full = time.perf_counter() - start
+
+            print(f"{appended:>10,} {incremental * 1000:>11.1f} ms {full * 1000:>11.1f} ms {full / incremental:>7.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from analytics import Analytics
+from benchmarks.synthetic import dataset_path, parse_size
+from cube import CUBE_DIMENSIONS, OlapCube, _labels_and_codes
+from data_cache import load_dataset
+from filter_index import FilterIndex
+from parallel import MIN_ROWS_PER_WORKER, accumulate, accumulate_rows, worker_count
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def check_series(frame, cube):
+    """Tab 2 series from ``cube`` against a serial pandas groupby."""
+    analytics = Analytics((frame, FilterIndex(frame), cube), 'check')
+    lines = analytics.job_offers_by_age({})
+    expected = (frame.groupby(['Age', 'Entrepreneurship'], observed=True)['Job_Offers']
+                .mean().reset_index())
+    np.testing.assert_array_equal(lines['Job_Offers'].to_numpy(), expected['Job_Offers'].to_numpy())
+
+    bars = analytics.entrepreneurship_by_age({})
+    counts = frame.groupby(['Age', 'Entrepreneurship'], observed=True).size()
+    shares = (counts / counts.groupby(level=0).transform('sum')).to_numpy()
+    np.testing.assert_array_equal(bars['Percentage'].to_numpy(), shares)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling of the partitioned cube aggregation over cores")
+    parser.add_argument('--rows', type=parse_size, default=parse_size('1m'))
+    parser.add_argument('--data-dir', default=os.path.join('.cache', 'synthetic'))
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = dataset_path(args.rows, args.data_dir)
+    frame = load_dataset(path, os.path.join(args.data_dir, 'cache'))
+    labels, codes = zip(*(_labels_and_codes(frame[dim]) for dim in CUBE_DIMENSIONS))
+    shape = tuple(len(l) for l in labels)
+    weights = frame['Job_Offers'].to_numpy()
+    level_axis = CUBE_DIMENSIONS.index('Current_Job_Level')
+
+    serial_time, (serial_counts, serial_sums) = _best_of(lambda: accumulate_rows(codes, shape, weights), args.repeat)
+    # accumulate caps the pool at one worker per MIN_ROWS_PER_WORKER rows;
+    # time each worker count it actually uses once
+    used = sorted({worker_count(args.rows, workers) for workers in range(1, args.max_workers + 1)})
+    print(f"{args.rows:,} rows, {os.cpu_count()} cores; serial {serial_time * 1000:.1f} ms")
+    if used[-1] < args.max_workers:
+        print(f"at most {used[-1]} worker(s) used: one per {MIN_ROWS_PER_WORKER:,} rows")
+    print(f"{'executor':>8} {'partition':>9} {'workers':>7} {'time':>11} {'speedup':>8} {'exact':>6}")
+    for executor in ('thread', 'process'):
+        for partition_axis, partition in ((None, 'rows'), (level_axis, 'level')):
+            for workers in used:
+                elapsed, (counts, sums) = _best_of(
+                    lambda: accumulate(codes, shape, weights, workers, executor, partition_axis), args.repeat)
+                exact = np.array_equal(counts, serial_counts) and np.array_equal(sums, serial_sums)
+                print(f"{executor:>8} {partition:>9} {workers:>7} {elapsed * 1000:>8.1f} ms "
+                      f"{serial_time / elapsed:>7.2f}x {str(exact):>6}")
+
+    check_series(frame, OlapCube(frame))
+    print("\nTab 2 series match the serial pandas groupby")
+
+
+if __name__ == '__main__':
+    main()
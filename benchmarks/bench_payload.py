@@ -0,0 +1,63 @@
+import argparse
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+
+from analytics import GROUP_COLUMNS, Analytics
+from benchmarks.synthetic import dataset_path, parse_size
+from cube import OlapCube
+from data_cache import load_dataset
+from density import age_density
+from filter_index import FilterIndex
+from payload import decode_array, figure_bytes, reduce_figure
+
+SELECTIONS = {
+    'all rows': dict(genders=None, level='Entry', age_range=(18, 29), statuses=['Yes', 'No']),
+    'narrow': dict(genders=['Male'], level='Mid', age_range=(20, 24), statuses=['Yes']),
+}
+
+
+def density_figure(x, curves):
+    fig = go.Figure()
+    for cat, y in curves:
+        if y is not None:
+            fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=str(cat), fill='tozeroy'))
+    return fig.to_dict()
+
+
+def max_error(x_fine, fine, figure_dict):
+    """Largest gap between the reduced curves and the 100-point ones, as a
+    fraction of each curve's peak."""
+    worst = 0.0
+    for (_, y), trace in zip([c for c in fine if c[1] is not None], figure_dict['data']):
+        approx = np.interp(x_fine, np.asarray(decode_array(trace['x']), dtype=float),
+                           np.asarray(decode_array(trace['y']), dtype=float))
+        worst = max(worst, float(np.abs(approx - y).max() / y.max()))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per density figure before and after payload reduction")
+    parser.add_argument('--sizes', default='10k,1m')
+    parser.add_argument('--data-dir', default=os.path.join('.cache', 'synthetic'))
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'selection':>9} {'group':>15} {'points':>7} {'before':>9} {'after':>9} {'ratio':>6} {'max err':>8}")
+    for rows in (parse_size(s) for s in args.sizes.split(',')):
+        frame = load_dataset(dataset_path(rows, args.data_dir), os.path.join(args.data_dir, 'cache'))
+        analytics = Analytics((frame, FilterIndex(frame), OlapCube(frame)), 'bench')
+        for name, filters in SELECTIONS.items():
+            view = analytics.view(filters)
+            for col in GROUP_COLUMNS:
+                x_fine, fine = age_density(view, col, filters['age_range'], 100)
+                before = density_figure(x_fine, fine)
+                x, curves = age_density(view, col, filters['age_range'], None)
+                after = reduce_figure(density_figure(x, curves))
+                size_before, size_after = figure_bytes(before), figure_bytes(after)
+                print(f"{rows:>10,} {name:>9} {col:>15} {len(x):>7} {size_before:>9,} {size_after:>9,} "
+                      f"{size_before / size_after:>5.1f}x {max_error(x_fine, fine, after):>7.2%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from ingest import IncrementalDataset
+from shared_data import SharedDataset, publish
+
+SELECTION = dict(genders=['Female', 'Male'], level='Entry', age_range=(20, 27), statuses=['Yes', 'No'])
+
+
+def _rss_kb():
+    """(private anonymous, file-backed) resident memory of this process in kB."""
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            fields[key] = value.strip()
+    return int(fields['RssAnon'].split()[0]), int(fields['RssFile'].split()[0]) + int(fields.get('RssShmem', '0 kB').split()[0])
+
+
+def _worker(mode, source, target, queue):
+    if mode == 'shared':
+        dataset = SharedDataset(target)
+    else:
+        dataset = IncrementalDataset(source, os.path.join(os.path.dirname(source), f'cache-{os.getpid()}'))
+    frame, index, cube = dataset.refresh()
+    rows = index.rows(**SELECTION)
+    cube.kpis(**SELECTION)
+    # Touch every column so mapped pages count as resident
+    for name in frame.columns:
+        frame[name].iloc[::4096].tolist()
+    queue.put((len(rows), *_rss_kb()))
+
+
+def _run(mode, processes, source, target):
+    # Spawned, not forked, so no worker inherits the publisher's pages
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    workers = [context.Process(target=_worker, args=(mode, source, target, queue)) for _ in range(processes)]
+    for w in workers:
+        w.start()
+    results = [queue.get() for _ in workers]
+    for w in workers:
+        w.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-process memory: private load vs shared attach")
+    parser.add_argument('source', nargs='?', default='education_career_success.csv')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--processes', type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_shared_')
+    try:
+        with open(args.source, encoding='utf-8-sig') as f:
+            header, *rows = f.read().splitlines()
+        source = os.path.join(workdir, 'data.csv')
+        with open(source, 'w') as f:
+            f.write(header + '\n')
+            for i in range(args.rows):
+                f.write(rows[i % len(rows)] + '\n')
+
+        target = os.path.join(workdir, 'shared')
+        publish(IncrementalDataset(source, os.path.join(workdir, 'cache')), target)
+
+        # In 'shared' mode the file-mapped pages are one copy for all processes
+        print(f"{args.rows:,} rows, {args.processes} processes (RSS per process, MB)")
+        for mode in ('private', 'shared'):
+            results = _run(mode, args.processes, source, target)
+            anon = sum(r[1] for r in results) / len(results) / 1024
+            mapped = sum(r[2] for r in results) / len(results) / 1024
+            print(f"  {mode:8}: private {anon:8.1f}   file-mapped {mapped:8.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# What app.py imports before it draws anything
+APP_IMPORTS = ['streamlit', 'pandas', 'plotly.graph_objects', 'analytics', 'precompute',
+               'figure_cache', 'instrumentation', 'assets']
+# Previously imported up front as well
+EAGER_IMPORTS = APP_IMPORTS + ['plotly.express', 'scipy.stats']
+
+_IMPORT_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(json.dumps(time.perf_counter() - start))
+"""
+
+# First full run of the script in a fresh process, as the first session of a
+# newly started replica sees it
+_PAINT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+total = time.perf_counter() - start
+if at.exception:
+    raise SystemExit(str(at.exception))
+print(json.dumps(total))
+"""
+
+
+def _run(script, args, env=None):
+    out = subprocess.run([sys.executable, '-c', script, *args], capture_output=True, text=True,
+                         env={**os.environ, **(env or {})}, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start cost: imports and first run of app.py")
+    parser.add_argument('--app', default='app.py')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--lazy-tabs', action='store_true', help="measure the first run with DASHBOARD_LAZY_TABS=1")
+    args = parser.parse_args()
+
+    print(f"median of {args.repeat} fresh interpreters")
+    for label, modules in (('deferred imports', APP_IMPORTS), ('eager imports', EAGER_IMPORTS)):
+        times = [_run(_IMPORT_SCRIPT, modules) for _ in range(args.repeat)]
+        print(f"  {label:<18} {statistics.median(times) * 1000:8.1f} ms")
+
+    env = {'DASHBOARD_LAZY_TABS': '1'} if args.lazy_tabs else None
+    try:
+        times = [_run(_PAINT_SCRIPT, [args.app], env) for _ in range(args.repeat)]
+    except subprocess.CalledProcessError as exc:
+        print(f"  first run failed:\n{exc.stderr.strip()}")
+        return
+    print(f"  {'first full run':<18} {statistics.median(times) * 1000:8.1f} ms  (imports + data + charts)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+import argparse
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from urllib.parse import urlencode
+
+import numpy as np
+
+from analytics import Analytics, normalize_filters, open_dataset
+from figure_cache import FigureCache
+from figures import CHART_OPTIONS, bar_figure, density_figure, donut_figure, line_figure
+from instrumentation import rss_bytes
+from payload import figure_bytes
+from precompute import open_store
+
+CHARTS = list(CHART_OPTIONS)
+VIEWS = ['demographics', 'job_offers']
+
+# Relative frequency of each sidebar interaction in a session
+ACTIONS = {'genders': 2, 'level': 3, 'age': 3, 'status': 2, 'chart': 2, 'view': 1}
+
+
+class SimulatedSession:
+    """Widget state of one browser session and the interactions that change it.
+
+    Starts from the sidebar defaults; ``interact()`` applies one random
+    interaction (as a user would) and returns its name. Each interaction is
+    followed by a rerun, as in Streamlit.
+    """
+
+    def __init__(self, options, rng):
+        self.options = options
+        self.rng = rng
+        self.genders = list(options['genders'])
+        self.level = options['levels'][0]
+        self.age_range = tuple(options['age_bounds'])
+        self.statuses = {'Yes': True, 'No': True}
+        self.chart = CHARTS[0]
+        self.view = VIEWS[0]
+
+    def interact(self):
+        rng = self.rng
+        action = rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        if action == 'genders':
+            self.genders = rng.sample(self.options['genders'], rng.randint(0, len(self.options['genders'])))
+        elif action == 'level':
+            self.level = rng.choice(self.options['levels'])
+        elif action == 'age':
+            low, high = self.options['age_bounds']
+            self.age_range = tuple(sorted(rng.randint(low, high) for _ in range(2)))
+        elif action == 'status':
+            name = rng.choice(list(self.statuses))
+            self.statuses[name] = not self.statuses[name]
+        elif action == 'chart':
+            self.chart = CHARTS[1 - CHARTS.index(self.chart)]
+        else:
+            self.view = VIEWS[1 - VIEWS.index(self.view)]
+        return action
+
+    def selection(self):
+        return normalize_filters(
+            genders=self.genders,
+            level=self.level,
+            age_range=self.age_range,
+            statuses=[name for name, shown in self.statuses.items() if shown],
+            age_bounds=self.options['age_bounds'],
+        )
+
+
+class InProcessTarget:
+    """Stand-in for app.py: the same figure builders and render cache, no Streamlit.
+
+    Sessions run as threads of one process, which is how Streamlit runs
+    them. A rerun computes the KPIs, builds (or reuses) the figures of the
+    views it draws and JSON-encodes them, as ``st.plotly_chart`` does on
+    every rerun. With ``lazy`` only the selected view is drawn.
+    """
+
+    def __init__(self, lazy=False):
+        self.dataset = open_dataset()
+        self.lazy = lazy
+        self._lock = threading.Lock()
+        self.render_cache = FigureCache(maxsize=512)
+        self.options = self._analytics().filter_options()
+
+    def _analytics(self):
+        with self._lock:
+            return Analytics.from_dataset(self.dataset, open_store)
+
+    def reset(self):
+        self.render_cache = FigureCache(maxsize=512)
+
+    def pid(self):
+        return 'self'
+
+    def rerun(self, session):
+        analytics = self._analytics()
+        selection = session.selection()
+        signature = analytics.signature(selection)
+        analytics.kpis(selection)
+        group_col = CHART_OPTIONS[session.chart]
+        figures = []
+        if not self.lazy or session.view == 'demographics':
+            figures += [
+                self.render_cache.get_or_build(('density', signature, session.chart),
+                                               lambda: density_figure(analytics, selection, group_col)),
+                self.render_cache.get_or_build(('donut', signature, session.chart),
+                                               lambda: donut_figure(analytics, selection, group_col)),
+            ]
+        if not self.lazy or session.view == 'job_offers':
+            figures += [
+                self.render_cache.get_or_build(('bar', signature), lambda: bar_figure(analytics, selection)),
+                self.render_cache.get_or_build(('line', signature), lambda: line_figure(analytics, selection)),
+            ]
+        return sum(figure_bytes(figure.to_dict()) for figure in figures)
+
+
+class HttpTarget:
+    """The API server's routes behind one rerun, over HTTP.
+
+    Without ``url`` a local ``api_server.py`` is started for the run, so
+    its memory can be read from /proc.
+    """
+
+    def __init__(self, url=None, port=8599, lazy=False):
+        self.lazy = lazy
+        self.process = None
+        if url is None:
+            self.process = subprocess.Popen([sys.executable, 'api_server.py', '--port', str(port)],
+                                            stdout=subprocess.PIPE, text=True)
+            self.process.stdout.readline()
+            url = f'http://127.0.0.1:{port}'
+        self.url = url.rstrip('/')
+        self.options = json.loads(self._get('/filters', {}))
+
+    def _get(self, path, params):
+        with urllib.request.urlopen(f'{self.url}{path}?{urlencode(params)}') as response:
+            return response.read()
+
+    def reset(self):
+        pass
+
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def close(self):
+        if self.process:
+            self.process.terminate()
+            self.process.wait()
+
+    def rerun(self, session):
+        selection = session.selection()
+        params = {'level': selection['level'], 'statuses': ','.join(selection['statuses'])}
+        if selection['genders']:
+            params['genders'] = ','.join(selection['genders'])
+        if selection['age_range']:
+            params['age_min'], params['age_max'] = selection['age_range']
+        paths = []
+        if not self.lazy or session.view == 'demographics':
+            group = CHART_OPTIONS[session.chart]
+            paths += [('/demographics', {}), ('/age-density', {'group': group})]
+        if not self.lazy or session.view == 'job_offers':
+            paths += [('/job-offers', {}), ('/entrepreneurship/by-age', {}), ('/job-offers/by-age', {})]
+        return sum(len(self._get(path, {**params, **extra})) for path, extra in paths)
+
+
+def run_level(target, sessions, reruns, think, seed):
+    """Latencies (s), bytes sent, wall time and peak RSS growth for one concurrency level."""
+    target.reset()
+    latencies, sent = [], []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(sessions)
+
+    def user(index):
+        rng = random.Random(seed * 100_003 + index)
+        session = SimulatedSession(target.options, rng)
+        start_barrier.wait()
+        for i in range(reruns):
+            if i:
+                session.interact()
+                if think:
+                    time.sleep(rng.expovariate(1 / think))
+            begin = time.perf_counter()
+            nbytes = target.rerun(session)
+            elapsed = time.perf_counter() - begin
+            with lock:
+                latencies.append(elapsed)
+                sent.append(nbytes)
+
+    pid = target.pid()
+    baseline = peak = rss_bytes(pid) if pid else 0
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.wait(0.02):
+            peak = max(peak, rss_bytes(pid))
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    if pid:
+        sampler.start()
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(sessions)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - begin
+    done.set()
+    return np.asarray(latencies), np.asarray(sent), wall, peak - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rerun latency, throughput and memory under concurrent sessions")
+    parser.add_argument('--concurrency', default='1,2,4,8,16,32', help="comma-separated session counts")
+    parser.add_argument('--reruns', type=int, default=30, help="interactions (reruns) per session")
+    parser.add_argument('--think', type=float, default=0.0, help="mean pause between interactions, seconds")
+    parser.add_argument('--target', choices=['inprocess', 'http'], default='inprocess')
+    parser.add_argument('--url', help="running api_server.py to load; default starts a local one")
+    parser.add_argument('--lazy-tabs', action='store_true', help="draw only the selected view, as DASHBOARD_LAZY_TABS=1")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.target == 'http':
+        target = HttpTarget(args.url, lazy=args.lazy_tabs)
+    else:
+        target = InProcessTarget(lazy=args.lazy_tabs)
+    try:
+        # One-off costs (deferred imports, opening the store) are not a session's,
+        # so one warm-up rerun pays them before anything is timed
+        target.rerun(SimulatedSession(target.options, random.Random(args.seed)))
+        print(f"{args.target}, {args.reruns} reruns per session, think {args.think:.2f} s")
+        print(f"{'sessions':>8} {'reruns':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'reruns/s':>9} "
+              f"{'KB/rerun':>9} {'MB/session':>10}")
+        for sessions in (int(n) for n in args.concurrency.split(',')):
+            latencies, sent, wall, rss_growth = run_level(target, sessions, args.reruns, args.think, args.seed)
+            p50, p95, p99 = np.percentile(latencies, (50, 95, 99)) * 1000
+            memory = f"{rss_growth / sessions / 1e6:>10.2f}" if target.pid() else f"{'n/a':>10}"
+            print(f"{sessions:>8} {len(latencies):>7} {p50:>6.1f} ms {p95:>6.1f} ms {p99:>6.1f} ms "
+                  f"{len(latencies) / wall:>9.1f} {sent.mean() / 1024:>9.1f} {memory}")
+    finally:
+        if isinstance(target, HttpTarget):
+            target.close()
+
+
+if __name__ == '__main__':
+    main()
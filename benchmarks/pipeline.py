@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+from analytics import GROUP_COLUMNS, Analytics
+from benchmarks.synthetic import dataset_path, parse_size
+from cube import OlapCube
+from data_cache import clear_cache, load_dataset
+from density import age_density
+from filter_index import FilterIndex
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+SELECTION = dict(genders=['Female', 'Male'], level='Mid', age_range=(20, 26), statuses=['Yes', 'No'])
+
+
+def _stages(path, cache_dir):
+    """(name, setup, run) for every stage of a dashboard rerun, in order.
+
+    ``setup`` prepares state outside the timed region; ``run`` takes its
+    result. State needed by later stages is kept in ``state``. The query
+    stages call the backend directly: through ``Analytics`` they would
+    time a lookup in the per-level batch cache after the first repeat.
+    """
+    state = {}
+
+    def load_cold():
+        state['frame'] = load_dataset(path, cache_dir)
+
+    def build_index():
+        frame = state['frame']
+        state['analytics'] = Analytics((frame, FilterIndex(frame), OlapCube(frame)), 'bench')
+
+    def filter_rows():
+        state['view'] = state['analytics'].view(SELECTION)
+
+    def kde():
+        for col in GROUP_COLUMNS:
+            age_density(state['view'], col, SELECTION['age_range'])
+
+    return [
+        ('load_cold', lambda: clear_cache(path, cache_dir), load_cold),
+        ('load_warm', None, lambda: load_dataset(path, cache_dir)),
+        ('build_index', None, build_index),
+        ('filter', None, filter_rows),
+        ('kpis', None, lambda: state['analytics'].backend.kpis(SELECTION)),
+        ('kde', None, kde),
+        ('entrepreneurship_pct', None, lambda: state['analytics'].backend.entrepreneurship_by_age(SELECTION)),
+        ('job_offers_mean', None, lambda: state['analytics'].backend.job_offers_by_age(SELECTION)),
+    ]
+
+
+def run(rows, data_dir, cache_dir, repeat=3):
+    """{stage: {'seconds', 'rows_per_s', 'peak_mb'}} for one dataset size.
+
+    Time is the best of ``repeat`` runs; peak memory comes from one extra
+    run under tracemalloc, so tracing does not slow the timed runs.
+    """
+    path = dataset_path(rows, data_dir)
+    results = {}
+    for name, setup, stage in _stages(path, cache_dir):
+        best = float('inf')
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            stage()
+            best = min(best, time.perf_counter() - start)
+
+        if setup:
+            setup()
+        tracemalloc.start()
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {'seconds': best, 'rows_per_s': rows / best, 'peak_mb': peak / 1e6}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Lines comparing stage times to the baseline; returns (lines, regressions)."""
+    lines, regressions = [], 0
+    for size, stages in results.items():
+        for name, now in stages.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                continue
+            ratio = now['seconds'] / before['seconds']
+            flag = ''
+            if ratio > threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            lines.append(f"{int(size):>11,} {name:<22} {before['seconds'] * 1000:>10.2f} ms "
+                         f"{now['seconds'] * 1000:>10.2f} ms {ratio:>6.2f}x{flag}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every stage of the dashboard pipeline on synthetic data")
+    parser.add_argument('--sizes', default='10k,1m', help="comma-separated row counts, e.g. 10k,1m,10m")
+    parser.add_argument('--data-dir', default=os.path.join('.cache', 'synthetic'))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    cache_dir = os.path.join(args.data_dir, 'cache')
+    results = {}
+    print(f"{'rows':>11} {'stage':<22} {'time':>13} {'rows/s':>14} {'peak MB':>9}")
+    for rows in (parse_size(s) for s in args.sizes.split(',')):
+        results[str(rows)] = run(rows, args.data_dir, cache_dir, args.repeat)
+        for name, r in results[str(rows)].items():
+            print(f"{rows:>11,} {name:<22} {r['seconds'] * 1000:>10.2f} ms {r['rows_per_s']:>14,.0f} {r['peak_mb']:>9.1f}")
+    print(f"\nprocess peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': platform.platform(), 'python': platform.python_version(),
+                       'results': results}, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nvs. baseline ({baseline['machine']}):")
+        print(f"{'rows':>11} {'stage':<22} {'baseline':>13} {'now':>13} {'ratio':>7}")
+        lines, regressions = compare(results, baseline['results'], args.threshold)
+        print('\n'.join(lines))
+        if regressions:
+            print(f"\n{regressions} stage(s) slower than {args.threshold:.2f}x the baseline")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+
+import numpy as np
+
+from data_cache import read_source
+
+REFERENCE = 'education_career_success.csv'
+
+
+def parse_size(text):
+    """'10k' -> 10_000, '1m' -> 1_000_000, '2500' -> 2500."""
+    text = text.strip().lower()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def generate(rows, path, reference=REFERENCE, seed=0, chunk_rows=500_000):
+    """Write a CSV of ``rows`` rows with the reference export's schema.
+
+    Rows are drawn with replacement from the reference, so every column and
+    every joint distribution (age vs. job offers, level vs. status...) match
+    it; only Student_ID is regenerated to stay unique. Written in chunks, so
+    memory does not grow with ``rows``.
+    """
+    source = read_source(reference)
+    rng = np.random.default_rng(seed)
+    width = max(5, len(str(rows)))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        for start in range(0, rows, chunk_rows):
+            count = min(chunk_rows, rows - start)
+            chunk = source.iloc[rng.integers(0, len(source), count)].reset_index(drop=True)
+            chunk['Student_ID'] = [f'S{i:0{width}d}' for i in range(start + 1, start + count + 1)]
+            chunk.to_csv(f, index=False, header=start == 0, float_format='%.2f')
+    os.replace(tmp_path, path)
+    return path
+
+
+def dataset_path(rows, data_dir, seed=0):
+    """Path of the synthetic export for ``rows``, generated on first use."""
+    path = os.path.join(data_dir, f'synthetic_{rows}_{seed}.csv')
+    if not os.path.exists(path):
+        generate(rows, path, seed=seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic export matching the reference CSV")
+    parser.add_argument('rows', type=parse_size, help="e.g. 10k, 1m, 10m")
+    parser.add_argument('output')
+    parser.add_argument('--reference', default=REFERENCE)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generate(args.rows, args.output, args.reference, args.seed)
+    print(f"wrote {args.rows:,} rows to {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def approx_size(value):
+    """Rough in-memory size of a cached value, in bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(approx_size(v) for v in value)
+    if hasattr(value, '__dict__'):
+        return approx_size(vars(value))
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Small thread-safe LRU shared by every Streamlit session of the process.
+
+    Bounded by entry count and, when ``max_bytes`` is given, by the total of
+    the sizes passed to ``put``.
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, nbytes=0):
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._sizes[key]
+            self._data[key] = value
+            self._sizes[key] = nbytes
+            self.nbytes += nbytes
+            self._data.move_to_end(key)
+            while len(self._data) > 1 and (
+                len(self._data) > self.maxsize
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+            ):
+                old, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, stale):
+        """Drop every entry whose key ``stale(key)`` is true; returns how many."""
+        with self._lock:
+            keys = [key for key in self._data if stale(key)]
+            for key in keys:
+                del self._data[key]
+                self.nbytes -= self._sizes.pop(key)
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def memory_bytes(self):
+        """Size of the cached values: the sizes given to ``put``, estimated
+        with ``approx_size`` where none was given."""
+        with self._lock:
+            entries = [(value, self._sizes[key]) for key, value in self._data.items()]
+        return sum(nbytes or approx_size(value) for value, nbytes in entries)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'bytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CacheRegistry:
+    """The process's caches of derived results, invalidated by dataset version.
+
+    Every cache is registered with a function giving the dataset version a
+    key belongs to. Keys carry the version, so an entry is never served for
+    other data; ``track_version`` also drops the entries of every other
+    version as soon as a new one is seen, instead of leaving them to the
+    LRU.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.version_changes = 0
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, cache, version_of):
+        with self._lock:
+            self._caches[name] = (cache, version_of)
+        return cache
+
+    def track_version(self, version):
+        """Note the dataset version in use; returns the entries dropped."""
+        with self._lock:
+            if version == self.version:
+                return 0
+            first = self.version is None
+            self.version = version
+            if not first:
+                self.version_changes += 1
+            caches = list(self._caches.values())
+        if first:
+            return 0
+        return sum(cache.invalidate(lambda key: version_of(key) != version)
+                   for cache, version_of in caches)
+
+    def stats(self):
+        """Per-cache counters and memory, plus the version and its changes."""
+        with self._lock:
+            caches = dict(self._caches)
+        stats = {name: dict(cache.stats(), memory_bytes=cache.memory_bytes())
+                 for name, (cache, _) in caches.items()}
+        return {
+            'dataset_version': self.version,
+            'version_changes': self.version_changes,
+            'memory_bytes': sum(s['memory_bytes'] for s in stats.values()),
+            'caches': stats,
+        }
+
+
+registry = CacheRegistry()
@@ -0,0 +1,321 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from parallel import accumulate
+from settings import AGGREGATION_PARTITION
+
+CUBE_DIMENSIONS = ['Gender', 'Current_Job_Level', 'Age', 'Entrepreneurship', 'Field_of_Study']
+
+
+def _labels_and_codes(col):
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return list(col.cat.categories), col.cat.codes.to_numpy()
+    codes, labels = pd.factorize(col, sort=True)
+    return list(labels), codes
+
+
+def median_from_counts(values, counts):
+    """Median of a histogram, averaging the two middle values like pandas."""
+    total = counts.sum()
+    if total == 0:
+        return float('nan')
+    values = np.asarray(values, dtype=float)
+    cumulative = np.cumsum(counts)
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+    upper = values[np.searchsorted(cumulative, total // 2, side='right')]
+    return (lower + upper) / 2
+
+
+# First row of a cell that has no rows
+NO_ROW = np.iinfo(np.int64).max
+
+
+def _largest_first(counts, first=None):
+    """Non-zero counts sorted descending, like ``Series.value_counts``.
+
+    ``value_counts`` on the rows breaks ties by first appearance; ``first``
+    (first row per value) does the same here. Without it ties stay in
+    label order.
+    """
+    counts = counts[counts > 0]
+    if first is None:
+        order = np.argsort(-counts.to_numpy(), kind='stable')
+    else:
+        order = np.lexsort((first.reindex(counts.index).to_numpy(), -counts.to_numpy()))
+    return counts.iloc[order].rename('count')
+
+
+def _first_rows(codes, counts, offset=0):
+    """Per cell, the position of its first row (``NO_ROW`` if none).
+
+    ``counts`` (the row counts of the same rows) tells which cells occur,
+    so the scan runs over doubling blocks of rows and stops once each of
+    them has been seen, usually after a few thousand rows.
+    """
+    shape = counts.shape
+    first = np.full(counts.size, NO_ROW, dtype=np.int64)
+    occupied = np.flatnonzero(counts)
+    start, step = 0, 4096
+    while start < len(codes[0]):
+        stop = start + step
+        flat = np.ravel_multi_index([c[start:stop] for c in codes], shape)
+        np.minimum.at(first, flat, np.arange(offset + start, offset + start + len(flat)))
+        if (first[occupied] != NO_ROW).all():
+            break
+        start, step = stop, step * 2
+    return first.reshape(shape)
+
+
+def _kpis(ages, genders, statuses, fields, first_fields=None):
+    """KPI card values from the Age, Gender, Entrepreneurship and field
+    marginals; ``first_fields`` breaks ties between top fields."""
+    total = int(ages.sum())
+    return {
+        'total': total,
+        'median_age': median_from_counts(ages.index.to_numpy(), ages.to_numpy()),
+        'pct_female': genders.get('Female', 0) / total * 100 if total else float('nan'),
+        'pct_entrepreneurs': statuses.get('Yes', 0) / total * 100 if total else float('nan'),
+        'top_fields': _largest_first(fields, first_fields).head(3).index.tolist(),
+    }
+
+
+def _accumulate(codes, shape, job_offers):
+    # Spread over AGGREGATION_WORKERS cores for large frames; exact either way
+    partition_axis = CUBE_DIMENSIONS.index('Current_Job_Level') if AGGREGATION_PARTITION == 'level' else None
+    return accumulate(codes, shape, job_offers, partition_axis=partition_axis)
+
+
+class OlapCube:
+    """Dense row counts (and Job_Offers sums) over every sidebar dimension.
+
+    Axes follow CUBE_DIMENSIONS. Any combination of the sidebar filters is a
+    fancy-index slice of the arrays, so the KPI cards, donut counts and Tab 2
+    series are sums over a few hundred cells instead of scans over the rows.
+    ``first_row`` holds, per cell, the position of its first row, which is
+    what "order of first appearance" among the selected rows depends on
+    (``value_counts`` ties, legend order of the density chart).
+    """
+
+    def __init__(self, df):
+        self.labels = {}
+        codes = []
+        for dim in CUBE_DIMENSIONS:
+            labels, dim_codes = _labels_and_codes(df[dim])
+            self.labels[dim] = labels
+            codes.append(dim_codes)
+
+        shape = tuple(len(self.labels[dim]) for dim in CUBE_DIMENSIONS)
+        self.counts, self.job_offers = _accumulate(codes, shape, df['Job_Offers'].to_numpy())
+        self.first_row = _first_rows(codes, self.counts)
+
+    def extended(self, df):
+        """New cube with the rows of ``df`` added to the current counts.
+
+        Values never seen before grow the matching axis (ages stay sorted);
+        the existing cells are copied across and only ``df`` is scanned.
+        """
+        new = OlapCube.__new__(OlapCube)
+        new.labels = {}
+        old_positions = []
+        codes = []
+        for dim in CUBE_DIMENSIONS:
+            old = self.labels[dim]
+            values = df[dim].to_numpy(dtype=object)
+            seen = set(old)
+            added = [v for v in pd.unique(values) if v not in seen]
+            labels = sorted(old + added) if dim == 'Age' else old + added
+            lookup = pd.Index(labels)
+            new.labels[dim] = labels
+            old_positions.append(lookup.get_indexer(old))
+            codes.append(lookup.get_indexer(values))
+
+        shape = tuple(len(new.labels[dim]) for dim in CUBE_DIMENSIONS)
+        new.counts, new.job_offers = _accumulate(codes, shape, df['Job_Offers'].to_numpy())
+        # The rows of ``df`` come after every row already counted
+        new.first_row = _first_rows(codes, new.counts, offset=int(self.counts.sum()))
+        cells = np.ix_(*old_positions)
+        new.counts[cells] += self.counts
+        new.job_offers[cells] += self.job_offers
+        new.first_row[cells] = np.minimum(new.first_row[cells], self.first_row)
+        return new
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'counts.npy'), self.counts)
+        np.save(os.path.join(path, 'job_offers.npy'), self.job_offers)
+        np.save(os.path.join(path, 'first_row.npy'), self.first_row)
+        labels = {dim: [v.item() if isinstance(v, np.generic) else v for v in values]
+                  for dim, values in self.labels.items()}
+        with open(os.path.join(path, 'labels.json'), 'w') as f:
+            json.dump(labels, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        mmap_mode = 'r' if mmap else None
+        cube = cls.__new__(cls)
+        with open(os.path.join(path, 'labels.json')) as f:
+            cube.labels = json.load(f)
+        cube.counts = np.load(os.path.join(path, 'counts.npy'), mmap_mode=mmap_mode)
+        cube.job_offers = np.load(os.path.join(path, 'job_offers.npy'), mmap_mode=mmap_mode)
+        cube.first_row = np.load(os.path.join(path, 'first_row.npy'), mmap_mode=mmap_mode)
+        return cube
+
+    def axis(self, dim):
+        return CUBE_DIMENSIONS.index(dim)
+
+    def _positions(self, dim, values):
+        if values is None:
+            return np.arange(len(self.labels[dim]))
+        lookup = {label: i for i, label in enumerate(self.labels[dim])}
+        return np.array([lookup[v] for v in values if v in lookup], dtype=np.intp)
+
+    def _index(self, genders=None, level=None, age_range=None, statuses=None):
+        ages = np.asarray(self.labels['Age'])
+        if age_range is None:
+            age_positions = np.arange(len(ages))
+        else:
+            age_positions = np.flatnonzero((ages >= age_range[0]) & (ages <= age_range[1]))
+        return [
+            self._positions('Gender', genders),
+            self._positions('Current_Job_Level', None if level is None else [level]),
+            age_positions,
+            self._positions('Entrepreneurship', statuses),
+            self._positions('Field_of_Study', None),
+        ]
+
+    def slice(self, cube, **selection):
+        """Sub-cube for a selection; every axis is kept (None = whole axis)."""
+        return cube[np.ix_(*self._index(**selection))]
+
+    def marginal(self, dim, cube=None, **selection):
+        """Counts along one dimension as a Series labelled by its values."""
+        cube = self.counts if cube is None else cube
+        index = self._index(**selection)
+        sub = cube[np.ix_(*index)]
+        axis = self.axis(dim)
+        totals = sub.sum(axis=tuple(i for i in range(sub.ndim) if i != axis))
+        labels = np.asarray(self.labels[dim], dtype=object)[index[axis]]
+        return pd.Series(totals, index=pd.Index(list(labels), name=dim))
+
+    def first_rows(self, dim, **selection):
+        """First selected row per value of ``dim`` (``NO_ROW`` if none)."""
+        index = self._index(**selection)
+        sub = self.first_row[np.ix_(*index)]
+        axis = self.axis(dim)
+        # ``initial`` keeps an empty selection axis from failing the reduction
+        first = sub.min(axis=tuple(i for i in range(sub.ndim) if i != axis), initial=NO_ROW)
+        labels = np.asarray(self.labels[dim], dtype=object)[index[axis]]
+        return pd.Series(first, index=pd.Index(list(labels), name=dim))
+
+    def first_appearance(self, dim, **selection):
+        """Values of ``dim`` present in the selection, in order of first row."""
+        first = self.first_rows(dim, **selection)
+        first = first[first < NO_ROW]
+        return list(first.index[np.argsort(first.to_numpy(), kind='stable')])
+
+    def value_counts(self, dim, **selection):
+        """Non-zero counts sorted descending, ties by first appearance, like
+        ``Series.value_counts`` on the selected rows."""
+        return _largest_first(self.marginal(dim, **selection), self.first_rows(dim, **selection))
+
+    def kpis(self, **selection):
+        return _kpis(*(self.marginal(dim, **selection)
+                       for dim in ('Age', 'Gender', 'Entrepreneurship', 'Field_of_Study')),
+                     first_fields=self.first_rows('Field_of_Study', **selection))
+
+    def _age_status(self, cube, genders, level, age_range):
+        sub = self.slice(cube, genders=genders, level=level, age_range=age_range)
+        # -> (age, status)
+        return sub.sum(axis=(self.axis('Gender'), self.axis('Current_Job_Level'), self.axis('Field_of_Study')))
+
+    def _age_status_frame(self, values, age_range, statuses, name):
+        ages = np.asarray(self.labels['Age'])[self._index(age_range=age_range)[self.axis('Age')]]
+        status_labels = self.labels['Entrepreneurship']
+        frame = pd.DataFrame({
+            'Age': np.repeat(ages, len(status_labels)),
+            'Entrepreneurship': np.tile(status_labels, len(ages)),
+            name: values.ravel(),
+        })
+        if statuses is not None:
+            frame = frame[frame['Entrepreneurship'].isin(statuses)]
+        return frame
+
+    def _shares_frame(self, counts, age_range, statuses):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shares = counts / counts.sum(axis=1, keepdims=True)
+        frame = self._age_status_frame(counts, age_range, statuses, 'Count')
+        frame['Percentage'] = shares.ravel()[frame.index]
+        return frame[frame['Count'] > 0].reset_index(drop=True)
+
+    def _means_frame(self, counts, sums, age_range, statuses):
+        frame = self._age_status_frame(counts, age_range, statuses, 'Count')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frame['Job_Offers'] = (sums / counts).ravel()[frame.index]
+        frame = frame[frame['Count'] > 0]
+        return frame.drop(columns='Count').reset_index(drop=True)
+
+    def entrepreneurship_by_age(self, genders=None, level=None, age_range=None, statuses=None):
+        """Share of each Entrepreneurship status within every age.
+
+        Shares are taken over all statuses of the gender/level selection and
+        only then restricted to ``statuses``.
+        """
+        counts = self._age_status(self.counts, genders, level, age_range)
+        return self._shares_frame(counts, age_range, statuses)
+
+    def job_offers_by_age(self, genders=None, level=None, age_range=None, statuses=None):
+        """Mean Job_Offers per (Age, Entrepreneurship) for the selection."""
+        sub = dict(genders=genders, level=level, age_range=age_range)
+        counts = self._age_status(self.counts, **sub)
+        sums = self._age_status(self.job_offers, **sub)
+        return self._means_frame(counts, sums, age_range, statuses)
+
+    def by_level(self, genders=None, age_range=None, statuses=None):
+        """Every job level's KPIs, donut counts and Tab 2 series in one pass.
+
+        One slice of the cube keeps the level axis; each level's results are
+        then sums over that slice, equal to calling ``kpis``,
+        ``value_counts``, ``entrepreneurship_by_age`` and
+        ``job_offers_by_age`` with ``level`` set. Returns
+        ``{level: {'kpis', 'counts', 'entrepreneurship_by_age', 'job_offers_by_age'}}``.
+        """
+        index = self._index(genders=genders, age_range=age_range)
+        counts = self.counts[np.ix_(*index)]
+        sums = self.job_offers[np.ix_(*index)]
+        status_positions = self._positions('Entrepreneurship', statuses)
+        kept = counts[:, :, :, status_positions, :]
+        first_kept = self.first_row[np.ix_(*index)][:, :, :, status_positions, :]
+
+        # Axes: Gender, Level, Age, Entrepreneurship, Field_of_Study
+        marginals = {
+            'Age': kept.sum(axis=(0, 3, 4)),
+            'Gender': kept.sum(axis=(2, 3, 4)).T,
+            'Entrepreneurship': kept.sum(axis=(0, 2, 4)),
+            'Field_of_Study': kept.sum(axis=(0, 2, 3)),
+        }
+        firsts = {
+            'Gender': first_kept.min(axis=(2, 3, 4), initial=NO_ROW).T,
+            'Field_of_Study': first_kept.min(axis=(0, 2, 3), initial=NO_ROW),
+        }
+        positions = dict(zip(CUBE_DIMENSIONS, index), Entrepreneurship=status_positions)
+        labels = {dim: list(np.asarray(self.labels[dim], dtype=object)[positions[dim]]) for dim in marginals}
+        age_status_counts = counts.sum(axis=(0, 4))
+        age_status_sums = sums.sum(axis=(0, 4))
+
+        results = {}
+        for i, level in enumerate(self.labels['Current_Job_Level']):
+            series = {dim: pd.Series(values[i], index=pd.Index(labels[dim], name=dim))
+                      for dim, values in marginals.items()}
+            first = {dim: pd.Series(values[i], index=pd.Index(labels[dim], name=dim))
+                     for dim, values in firsts.items()}
+            results[level] = {
+                'kpis': _kpis(series['Age'], series['Gender'], series['Entrepreneurship'], series['Field_of_Study'],
+                              first['Field_of_Study']),
+                'counts': {dim: _largest_first(series[dim], first[dim]) for dim in ('Gender', 'Field_of_Study')},
+                'entrepreneurship_by_age': self._shares_frame(age_status_counts[i], age_range, statuses),
+                'job_offers_by_age': self._means_frame(age_status_counts[i], age_status_sums[i], age_range, statuses),
+            }
+        return results
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from schema import SCHEMA_VERSION, apply_schema, memory_report
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = ".cache"
+
+# String columns stored as dictionary-encoded codes + category list
+CATEGORICAL_COLUMNS = ['Gender', 'Field_of_Study', 'Current_Job_Level', 'Entrepreneurship']
+
+
+def read_raw(path):
+    """Parse the raw CSV / XLSX export with pandas' inferred dtypes."""
+    if path.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_excel(path)
+    return pd.read_csv(path, encoding='utf-8-sig')
+
+
+def read_source(path):
+    """Parse the export and enforce the compact schema, dropping invalid rows."""
+    raw = read_raw(path)
+    df, rejected = apply_schema(raw)
+    if len(rejected):
+        logger.warning("%s: rejected %d of %d rows failing validation (%s)",
+                       path, len(rejected), len(raw),
+                       '; '.join(rejected['Rejected_Columns'].value_counts().index[:5]))
+    total = memory_report(raw, df).loc['Total']
+    logger.info("%s: %d rows, %.1f MB -> %.1f MB (%.1fx smaller)",
+                path, len(df), total['before'] / 1e6, total['after'] / 1e6, total['ratio'])
+    return df
+
+
+def file_digest(path, chunk_size=1 << 20):
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def cache_path_for(source, cache_dir=CACHE_DIR):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(cache_dir, stem)
+
+
+def read_meta(cache_path):
+    try:
+        with open(os.path.join(cache_path, 'meta.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_meta(cache_path, meta):
+    # Write-then-rename so readers never see a half-written meta.json
+    tmp = os.path.join(cache_path, f'meta.json.{os.getpid()}.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(cache_path, 'meta.json'))
+
+
+def _smallest_code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def new_version_dir(cache_path, version):
+    version_dir = os.path.join(cache_path, version)
+    shutil.rmtree(version_dir, ignore_errors=True)
+    os.makedirs(version_dir)
+    return version_dir
+
+
+def write_columns(df, version_dir):
+    """Write one .npy file per column; returns the column entries for meta.json."""
+    columns = []
+    for name in df.columns:
+        col = df[name]
+        entry = {'name': name}
+        if name in CATEGORICAL_COLUMNS or isinstance(col.dtype, pd.CategoricalDtype):
+            cat = col.astype('category') if not isinstance(col.dtype, pd.CategoricalDtype) else col
+            categories = cat.cat.categories
+            codes = cat.cat.codes.to_numpy().astype(_smallest_code_dtype(len(categories)))
+            entry.update(kind='category', categories=categories.tolist(), ordered=bool(cat.cat.ordered))
+            np.save(os.path.join(version_dir, f'{name}.npy'), codes)
+        elif pd.api.types.is_bool_dtype(col.dtype) or pd.api.types.is_numeric_dtype(col.dtype):
+            entry['kind'] = 'numeric'
+            np.save(os.path.join(version_dir, f'{name}.npy'), col.to_numpy())
+        else:
+            entry['kind'] = 'string'
+            np.save(os.path.join(version_dir, f'{name}.npy'), col.astype(str).to_numpy(dtype=str))
+        columns.append(entry)
+    return columns
+
+
+def switch_version(cache_path, meta):
+    """Point meta.json at ``meta['version']`` and drop the previous version."""
+    previous = read_meta(cache_path)
+    write_meta(cache_path, meta)
+
+    # Older versions are unlinked, processes still mapping them keep their pages
+    if previous and previous.get('version') not in (None, meta['version']):
+        shutil.rmtree(os.path.join(cache_path, previous['version']), ignore_errors=True)
+
+
+def save_cache(df, cache_path, source_meta):
+    """Write the columns into a fresh version directory and switch to it."""
+    version = source_meta['sha1'][:16]
+    columns = write_columns(df, new_version_dir(cache_path, version))
+    switch_version(cache_path, dict(source_meta, version=version, columns=columns))
+
+
+def load_cache(cache_path, meta, columns=None, mmap=True):
+    """Rebuild the DataFrame from the memory-mapped column files."""
+    version_dir = os.path.join(cache_path, meta['version'])
+    mmap_mode = 'r' if mmap else None
+    data = {}
+    for entry in meta['columns']:
+        name = entry['name']
+        if columns is not None and name not in columns:
+            continue
+        values = np.load(os.path.join(version_dir, f'{name}.npy'), mmap_mode=mmap_mode)
+        if entry['kind'] == 'category':
+            dtype = pd.CategoricalDtype(entry['categories'], ordered=entry['ordered'])
+            # The codes were checked when written and already have the dtype
+            # pandas uses for this many categories, so they stay a view of the map
+            data[name] = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        elif entry['kind'] == 'string':
+            data[name] = pd.array(np.asarray(values, dtype=object), dtype='str')
+        else:
+            data[name] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def source_meta(source, digest=None):
+    stat = os.stat(source)
+    return {
+        'source': os.path.abspath(source),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha1': digest or file_digest(source),
+        'schema': SCHEMA_VERSION,
+    }
+
+
+def load_dataset(source, cache_dir=CACHE_DIR, columns=None):
+    """Load the dataset, converting it to the columnar cache on first use.
+
+    The cache is keyed by the source's mtime/size; when those change the
+    content hash decides whether the file really changed.
+    """
+    cache_path = cache_path_for(source, cache_dir)
+    meta = read_meta(cache_path)
+    stat = os.stat(source)
+
+    if meta and meta.get('schema') != SCHEMA_VERSION:
+        meta = None
+
+    if meta and meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return load_cache(cache_path, meta, columns)
+
+    digest = file_digest(source)
+    if meta and meta['sha1'] == digest:
+        # Touched but unchanged: refresh the key, keep the columns
+        meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        write_meta(cache_path, meta)
+        return load_cache(cache_path, meta, columns)
+
+    df = read_source(source)
+    os.makedirs(cache_path, exist_ok=True)
+    save_cache(df, cache_path, source_meta(source, digest))
+    return load_cache(cache_path, read_meta(cache_path), columns)
+
+
+def clear_cache(source, cache_dir=CACHE_DIR):
+    shutil.rmtree(cache_path_for(source, cache_dir), ignore_errors=True)
+
+
+def benchmark(source, cache_dir=CACHE_DIR, repeat=5):
+    """Time a raw parse, a cold load (parse + convert) and a warm cache load."""
+    def best_of(fn, setup=None):
+        times = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    results = {
+        'parse': best_of(lambda: read_raw(source)),
+        'cold': best_of(lambda: load_dataset(source, cache_dir),
+                        setup=lambda: clear_cache(source, cache_dir)),
+    }
+    load_dataset(source, cache_dir)
+    results['warm'] = best_of(lambda: load_dataset(source, cache_dir))
+    results['speedup'] = results['parse'] / results['warm']
+    return results
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from caching import LRUCache, registry
+from payload import kde_points
+
+# (filter signature, group column, age range, points) -> (x, curves)
+_density_cache = registry.register('density', LRUCache(maxsize=256), lambda key: key[0][0])
+
+
+def scott_bandwidths(values, counts):
+    """Row totals and squared Scott bandwidths of (groups x values) histograms."""
+    values = np.asarray(values, dtype=float)
+    counts = np.asarray(counts, dtype=float)
+    n = counts.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = counts @ values / n
+        var = (counts @ values ** 2 - n * mean ** 2) / (n - 1)
+        bw2 = var * n ** (-2 / 5)
+    return n, bw2
+
+
+def adaptive_points(values, counts, age_range):
+    """Grid size for the narrowest kernel among the groups."""
+    n, bw2 = scott_bandwidths(values, counts)
+    bw2 = bw2[(n > 1) & (bw2 > 1e-12)]
+    bandwidth = float(np.sqrt(bw2.min())) if len(bw2) else None
+    return kde_points(age_range[1] - age_range[0], bandwidth)
+
+
+def kde_from_histograms(values, counts, x):
+    """Gaussian KDE of several groups at once from their value histograms.
+
+    ``counts`` is (groups x len(values)). Each row gets Scott's bandwidth,
+    like ``scipy.stats.gaussian_kde``, and because every observation sits
+    exactly on one of ``values`` the result equals the per-row KDE of the raw
+    data. Rows with fewer than two observations or no spread give None.
+    """
+    values = np.asarray(values, dtype=float)
+    counts = np.asarray(counts, dtype=float)
+    n, bw2 = scott_bandwidths(values, counts)
+    valid = (n > 1) & (bw2 > 1e-12)
+
+    result = [None] * len(counts)
+    if valid.any():
+        bw2_v = bw2[valid][:, None, None]
+        diff2 = (np.asarray(x, dtype=float)[None, :, None] - values[None, None, :]) ** 2
+        kernel = np.exp(-diff2 / (2 * bw2_v)) / np.sqrt(2 * np.pi * bw2_v)
+        dens = np.einsum('gxv,gv->gx', kernel, counts[valid]) / n[valid][:, None]
+        for row, y in zip(np.flatnonzero(valid), dens):
+            result[row] = y
+    return result
+
+
+def age_density(df, group_col, age_range, points=100):
+    """Age density curves for every category of ``group_col`` in one pass.
+
+    Returns ``(x, [(category, y or None), ...])`` with categories in order of
+    first appearance, matching ``df[group_col].dropna().unique()``. With
+    ``points=None`` the grid size follows the kernel bandwidth.
+    """
+    group = df[group_col]
+    keep = group.notna().to_numpy()
+    group_codes, categories = pd.factorize(group[keep], sort=False)
+    age_codes, ages = pd.factorize(df['Age'].to_numpy()[keep], sort=True)
+
+    counts = np.bincount(
+        group_codes * len(ages) + age_codes, minlength=len(categories) * len(ages)
+    ).reshape(len(categories), len(ages))
+    if points is None:
+        points = adaptive_points(ages, counts, age_range)
+    x = np.linspace(age_range[0], age_range[1], points)
+    curves = kde_from_histograms(ages, counts, x)
+    return x, list(zip(categories, curves))
+
+
+def cached_age_density(signature, df, group_col, age_range, points=100):
+    key = (signature, group_col, tuple(age_range), points)
+    return _density_cache.get_or_compute(key, lambda: age_density(df, group_col, age_range, points))
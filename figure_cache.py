@@ -0,0 +1,64 @@
+import plotly.graph_objects as go
+from caching import LRUCache, registry
+from payload import figure_bytes, reduce_figure
+from settings import FIGURE_CACHE_ENTRIES, FIGURE_CACHE_MB, PAYLOAD_REDUCTION
+
+
+class FrozenFigure(go.Figure):
+    """A finished figure as served from the render cache.
+
+    ``st.plotly_chart`` turns any figure into a dict (a deep copy) and then
+    into JSON on every call. This figure hands back the dict captured when it
+    was built, so a cache hit skips the data work, the trace/layout
+    construction and the copy, leaving only the final JSON encode.
+    """
+
+    def __init__(self, figure_dict):
+        super().__init__()
+        self._figure_dict = figure_dict
+
+    def to_dict(self):
+        return self._figure_dict
+
+    def to_plotly_json(self):
+        return self._figure_dict
+
+
+class FigureCache(LRUCache):
+    """LRU of FrozenFigures capped by count and by serialized size.
+
+    With ``reduce`` each figure goes through ``payload.reduce_figure``
+    once, when built, and the JSON size before and after is tallied.
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None, reduce=PAYLOAD_REDUCTION):
+        super().__init__(maxsize, max_bytes)
+        self.reduce = reduce
+        self.payload_before = 0
+        self.payload_after = 0
+
+    def get_or_build(self, key, build):
+        figure = self.get(key)
+        if figure is None:
+            figure_dict = build().to_dict()
+            nbytes = figure_bytes(figure_dict)
+            self.payload_before += nbytes
+            if self.reduce:
+                figure_dict = reduce_figure(figure_dict)
+                nbytes = figure_bytes(figure_dict)
+            self.payload_after += nbytes
+            figure = FrozenFigure(figure_dict)
+            self.put(key, figure, nbytes=nbytes)
+        return figure
+
+    def stats(self):
+        stats = super().stats()
+        stats['payload_bytes_before'] = self.payload_before
+        stats['payload_bytes_after'] = self.payload_after
+        return stats
+
+
+# Keys are (chart, filter signature, ...); the signature starts with the dataset version
+render_cache = registry.register(
+    'figures', FigureCache(maxsize=FIGURE_CACHE_ENTRIES, max_bytes=FIGURE_CACHE_MB * 1024 * 1024),
+    lambda key: key[1][0])
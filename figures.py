@@ -0,0 +1,171 @@
+import plotly.graph_objects as go
+
+# Chart options of the Demographics view and the column each one groups by
+CHART_OPTIONS = {'Gender Distribution': 'Gender', 'Field of Study': 'Field_of_Study'}
+
+# Soft color palette matching the light background
+color_map = {'Yes': '#667eea', 'No': '#764ba2'}
+soft_colors = ['#667eea', '#764ba2', '#f093fb', '#f5576c', '#63b3ed', '#68d391', '#fbb6ce', '#f6e05e']
+
+
+def density_figure(analytics, selection, group_col):
+    """Age density of each category of ``group_col``."""
+    title = f"Age Distribution by {group_col.replace('_', ' ')}"
+    fig_density = go.Figure()
+    # Precomputed, or all categories evaluated in one batched pass
+    x_vals, curves = analytics.density_curves(selection, group_col)
+
+    for i, (cat, y_vals) in enumerate(curves):
+        if y_vals is not None:
+            fig_density.add_trace(go.Scatter(
+                x=x_vals,
+                y=y_vals,
+                mode='lines',
+                name=str(cat),
+                fill='tozeroy',
+                line=dict(color=soft_colors[i % len(soft_colors)], width=3),
+                fillcolor=f"rgba{(*[int(soft_colors[i % len(soft_colors)][j:j+2], 16) for j in (1, 3, 5)], 0.3)}"
+            ))
+
+    fig_density.update_layout(
+        paper_bgcolor='rgba(248, 250, 252, 0.8)',
+        plot_bgcolor='rgba(255, 255, 255, 0.9)',
+        title=dict(text=title, font=dict(size=18, color='#2d3748', family='Inter')),
+        xaxis_title="Age",
+        yaxis_title="Density",
+        height=500,
+        margin=dict(t=50, l=50, r=50, b=80),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+        font=dict(family='Inter', color='#4a5568')
+    )
+    return fig_density
+
+
+def donut_figure(analytics, selection, group_col):
+    """Share of each category of ``group_col``."""
+    pie_data = analytics.category_counts(selection, group_col).reset_index()
+    pie_data.columns = [group_col, 'Count']
+
+    labels = pie_data[group_col]
+    values = pie_data['Count']
+
+    fig_donut = go.Figure(data=[
+        go.Pie(
+            labels=labels,
+            values=values,
+            hole=0.5,
+            textinfo='percent+label',
+            insidetextorientation='radial',
+            marker=dict(
+                line=dict(color='#ffffff', width=3),
+                colors=soft_colors[:len(labels)]
+            ),
+            hovertemplate="<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>",
+            textfont=dict(size=14, family='Inter')
+        )
+    ])
+
+    fig_donut.update_layout(
+        title={
+            'text': f"{group_col.replace('_', ' ')} Distribution",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': dict(size=18, color='#2d3748', family='Inter')
+        },
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=-0.3,
+            xanchor='center',
+            x=0.5,
+            font=dict(size=12, family='Inter')
+        ),
+        height=500,
+        margin=dict(t=50, l=20, r=20, b=80),
+        paper_bgcolor='rgba(248, 250, 252, 0.8)',
+        plot_bgcolor='rgba(255, 255, 255, 0.9)',
+        font=dict(color='#4a5568', family='Inter')
+    )
+
+    return fig_donut
+
+
+def bar_figure(analytics, selection):
+    """Entrepreneurship shares per age at the selected job level."""
+    # Shares per age now respect the Gender filter as well
+    df_bar = analytics.entrepreneurship_by_age(selection)
+
+    even_ages = sorted(df_bar['Age'].unique())
+    even_ages = [age for age in even_ages if age % 2 == 0]
+
+    # Plotly Express is only needed here, so its import is deferred
+    # until the first bar chart instead of slowing down cold start
+    import plotly.express as px
+
+    fig_bar = px.bar(
+        df_bar,
+        x='Age',
+        y='Percentage',
+        color='Entrepreneurship',
+        barmode='stack',
+        color_discrete_map=color_map,
+        category_orders={'Entrepreneurship': ['No', 'Yes']},
+        labels={'Age': 'Age', 'Percentage': 'Percentage'},
+        height=450,
+        title=f"Entrepreneurship Distribution by Age – {selection['level']} Level"
+    )
+
+    fig_bar.update_traces(
+        # Each trace is one status, so its name replaces a per-point customdata array
+        hovertemplate="Entrepreneurship=%{fullData.name}<br>Age=%{x}<br>Percentage=%{y:.0%}<extra></extra>",
+        hoverinfo="skip"
+    )
+
+    fig_bar.update_layout(
+        paper_bgcolor='rgba(248, 250, 252, 0.8)',
+        plot_bgcolor='rgba(255, 255, 255, 0.9)',
+        margin=dict(t=50, l=50, r=50, b=50),
+        legend_title_text='Entrepreneurship',
+        xaxis_tickangle=0,
+        bargap=0.1,
+        xaxis=dict(tickvals=even_ages),
+        yaxis=dict(title="Percentage", range=[0, 1], tickformat=".0%"),
+        legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5),
+        font=dict(family='Inter', color='#4a5568'),
+        title=dict(font=dict(size=18, color='#2d3748', family='Inter'))
+    )
+
+    return fig_bar
+
+
+def line_figure(analytics, selection):
+    """Average job offers per age for each selected status."""
+    df_avg_offers = analytics.job_offers_by_age(selection)
+
+    fig_line = go.Figure()
+    for status in selection['statuses']:
+        data_status = df_avg_offers[df_avg_offers["Entrepreneurship"] == status]
+        fig_line.add_trace(go.Scatter(
+            x=data_status["Age"],
+            y=data_status["Job_Offers"],
+            mode="lines+markers",
+            name=status,
+            line=dict(color=color_map[status], width=4),
+            marker=dict(size=8, line=dict(width=2, color='white')),
+            hovertemplate="%{y:.2f}"
+        ))
+
+    fig_line.update_layout(
+        paper_bgcolor='rgba(248, 250, 252, 0.8)',
+        plot_bgcolor='rgba(255, 255, 255, 0.9)',
+        title=dict(text=f"Average Job Offers by Age – {selection['level']} Level", font=dict(size=18, color='#2d3748', family='Inter')),
+        xaxis_title="Age",
+        yaxis_title="Average Job Offers",
+        height=450,
+        margin=dict(t=50, l=50, r=50, b=50),
+        hovermode="x unified",
+        legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5),
+        font=dict(family='Inter', color='#4a5568')
+    )
+
+    return fig_line
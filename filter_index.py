@@ -0,0 +1,160 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ['Gender', 'Current_Job_Level', 'Age', 'Entrepreneurship']
+
+
+def _append_bits(bits, n_rows, mask):
+    """Packed bitmap of ``n_rows`` bits followed by the bits of ``mask``."""
+    full_bytes, rem = divmod(n_rows, 8)
+    if rem == 0:
+        return np.concatenate([bits[:full_bytes], np.packbits(mask)])
+    partial = np.unpackbits(bits[full_bytes:full_bytes + 1], count=rem).astype(bool)
+    return np.concatenate([bits[:full_bytes], np.packbits(np.concatenate([partial, mask]))])
+
+
+def _encode(col):
+    """Return (codes, values) for any column, categorical or not."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.codes.to_numpy(), list(col.cat.categories)
+    codes, values = pd.factorize(col, sort=True)
+    return codes, list(values)
+
+
+class FilterIndex:
+    """Packed bitmaps (one bit per row) for every value of the sidebar filters.
+
+    A selection is resolved with bitwise OR inside a column and AND across
+    columns, so the cost depends on the number of rows / 8 and never on how
+    many values are selected. Age uses cumulative bitmaps so any range is a
+    single AND NOT.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for column in ['Gender', 'Current_Job_Level', 'Entrepreneurship']:
+            codes, values = _encode(df[column])
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code) for code, value in enumerate(values)
+            }
+
+        ages = df['Age'].to_numpy()
+        self.ages = np.unique(ages)
+        # age_cumulative[i] has the bit set for every row with Age <= ages[i]
+        self.age_cumulative = np.empty((len(self.ages), (self.n_rows + 7) // 8), dtype=np.uint8)
+        running = np.zeros(self.age_cumulative.shape[1], dtype=np.uint8)
+        for i, age in enumerate(self.ages):
+            running |= np.packbits(ages == age)
+            self.age_cumulative[i] = running
+
+    def extended(self, df):
+        """New index over the current rows followed by the rows of ``df``.
+
+        Only the appended rows are scanned; existing bitmaps are copied with
+        the new bits concatenated, and unseen values get a fresh bitmap.
+        """
+        new = FilterIndex.__new__(FilterIndex)
+        new.n_rows = self.n_rows + len(df)
+        empty = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+
+        new.bitmaps = {}
+        for column, bitmaps in self.bitmaps.items():
+            values = df[column].to_numpy(dtype=object)
+            labels = list(bitmaps) + [v for v in pd.unique(values) if v not in bitmaps and pd.notna(v)]
+            new.bitmaps[column] = {
+                value: _append_bits(bitmaps.get(value, empty), self.n_rows, values == value)
+                for value in labels
+            }
+
+        ages = df['Age'].to_numpy()
+        new.ages = np.union1d(self.ages, ages)
+        new.age_cumulative = np.empty((len(new.ages), (new.n_rows + 7) // 8), dtype=np.uint8)
+        for i, age in enumerate(new.ages):
+            j = np.searchsorted(self.ages, age, side='right') - 1
+            old = self.age_cumulative[j] if j >= 0 else empty
+            new.age_cumulative[i] = _append_bits(old, self.n_rows, ages <= age)
+        return new
+
+    def save(self, path):
+        """Write the bitmaps as .npy files so other processes can map them."""
+        os.makedirs(path, exist_ok=True)
+        labels = {}
+        for column, bitmaps in self.bitmaps.items():
+            labels[column] = list(bitmaps)
+            np.save(os.path.join(path, f'{column}.npy'), np.array(list(bitmaps.values()), dtype=np.uint8))
+        np.save(os.path.join(path, 'ages.npy'), self.ages)
+        np.save(os.path.join(path, 'age_cumulative.npy'), self.age_cumulative)
+        with open(os.path.join(path, 'labels.json'), 'w') as f:
+            json.dump({'n_rows': self.n_rows, 'labels': labels}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        mmap_mode = 'r' if mmap else None
+        with open(os.path.join(path, 'labels.json')) as f:
+            meta = json.load(f)
+        index = cls.__new__(cls)
+        index.n_rows = meta['n_rows']
+        index.bitmaps = {}
+        for column, labels in meta['labels'].items():
+            stacked = np.load(os.path.join(path, f'{column}.npy'), mmap_mode=mmap_mode)
+            index.bitmaps[column] = dict(zip(labels, stacked))
+        index.ages = np.load(os.path.join(path, 'ages.npy'), mmap_mode=mmap_mode)
+        index.age_cumulative = np.load(os.path.join(path, 'age_cumulative.npy'), mmap_mode=mmap_mode)
+        return index
+
+    def _all(self):
+        bits = np.full((self.n_rows + 7) // 8, 0xFF, dtype=np.uint8)
+        if self.n_rows % 8:
+            bits[-1] = (0xFF << (8 - self.n_rows % 8)) & 0xFF
+        return bits
+
+    def _union(self, column, values):
+        bitmaps = self.bitmaps[column]
+        bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            if value in bitmaps:
+                bits |= bitmaps[value]
+        return bits
+
+    def _age_between(self, low, high):
+        hi = np.searchsorted(self.ages, high, side='right') - 1
+        lo = np.searchsorted(self.ages, low, side='left') - 1
+        if hi < 0:
+            return np.zeros(self.age_cumulative.shape[1], dtype=np.uint8)
+        if lo < 0:
+            return self.age_cumulative[hi].copy()
+        return self.age_cumulative[hi] & ~self.age_cumulative[lo]
+
+    def mask(self, genders=None, level=None, age_range=None, statuses=None):
+        """Packed bitmap of the rows matching the selection (None = no filter)."""
+        bits = self._all()
+        if genders is not None:
+            bits &= self._union('Gender', genders)
+        if level is not None:
+            bits &= self._union('Current_Job_Level', [level])
+        if age_range is not None:
+            bits &= self._age_between(*age_range)
+        if statuses is not None:
+            bits &= self._union('Entrepreneurship', statuses)
+        return bits
+
+    def rows(self, **selection):
+        bits = self.mask(**selection)
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+
+    def select(self, df, **selection):
+        return df.take(self.rows(**selection))
+
+
+def filter_key(genders=None, level=None, age_range=None, statuses=None):
+    """Hashable, order-independent signature of a sidebar selection."""
+    return (
+        None if genders is None else tuple(sorted(genders)),
+        level,
+        None if age_range is None else tuple(int(a) for a in age_range),
+        None if statuses is None else tuple(sorted(statuses)),
+    )
@@ -0,0 +1,167 @@
+import hashlib
+import io
+import os
+import threading
+
+import pandas as pd
+
+from cube import OlapCube
+from data_cache import CACHE_DIR, load_dataset
+from filter_index import FilterIndex
+from schema import apply_schema
+
+def _prefix_hash(path, length, chunk_size=1 << 20):
+    """SHA-1 object over the first ``length`` bytes of ``path``."""
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        remaining = length
+        while remaining:
+            block = f.read(min(chunk_size, remaining))
+            if not block:
+                break
+            sha.update(block)
+            remaining -= len(block)
+    return sha
+
+
+def _read_header(path):
+    """Column names from the first line of a CSV export."""
+    with open(path, 'rb') as f:
+        line = f.readline()
+    return list(pd.read_csv(io.BytesIO(line), encoding='utf-8-sig', nrows=0).columns)
+
+
+def append_rows(frame, tail):
+    """Concatenate ``tail`` onto ``frame`` keeping the frame's dtypes."""
+    tail = tail[list(frame.columns)].copy()
+    for name in frame.columns:
+        dtype = frame[name].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            added = [v for v in tail[name].dropna().unique() if v not in dtype.categories]
+            if added:
+                frame = frame.assign(**{name: frame[name].cat.add_categories(added)})
+            tail[name] = pd.Categorical(tail[name], dtype=frame[name].dtype)
+        else:
+            tail[name] = tail[name].astype(dtype)
+    return pd.concat([frame, tail], ignore_index=True)
+
+
+class IncrementalDataset:
+    """The loaded frame, its FilterIndex and OlapCube for a growing CSV.
+
+    ``refresh()`` compares the file against the byte offset already
+    ingested. When the export only grew (the already ingested bytes still
+    hash the same), the new complete lines are parsed and folded into the
+    frame, the filter bitmaps and the cube; any other change (rewrite,
+    truncation, a non-CSV source) triggers a full reload.
+    """
+
+    def __init__(self, source, cache_dir=CACHE_DIR):
+        self.source = source
+        self.cache_dir = cache_dir
+        self.full_reloads = 0
+        self.appended_rows = 0
+        self.rejected_rows = 0
+        self._lock = threading.Lock()
+        self.reload()
+
+    @property
+    def digest(self):
+        """SHA-1 of the ingested bytes."""
+        return self._prefix.hexdigest()
+
+    @property
+    def version(self):
+        return f'{self.offset}-{self.digest[:16]}'
+
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def frame(self):
+        return self._snapshot[0]
+
+    def reload(self):
+        stat = os.stat(self.source)
+        frame = load_dataset(self.source, self.cache_dir)
+        after = os.stat(self.source)
+        changed = (after.st_size, after.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns)
+        if changed and self.source.lower().endswith('.csv'):
+            # Written to while it was parsed: the frame may hold rows past
+            # ``stat.st_size``, which the next refresh would append again
+            frame, prefix, offset, mtime_ns = self._parse_once()
+        else:
+            prefix, offset, mtime_ns = _prefix_hash(self.source, stat.st_size), stat.st_size, stat.st_mtime_ns
+        # Appended lines are named by the export's own header, whose column
+        # order need not match the schema's
+        self._header = _read_header(self.source) if self.source.lower().endswith('.csv') else None
+        self._publish(frame, FilterIndex(frame), OlapCube(frame), prefix, offset, mtime_ns)
+        self.full_reloads += 1
+
+    def _parse_once(self):
+        """Frame, prefix hash, offset and mtime of the complete lines of a
+        single read of the export, so the offset is exactly what was parsed."""
+        with open(self.source, 'rb') as f:
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            data = f.read()
+        # A half-written last line is left for the next refresh
+        end = data.rfind(b'\n') + 1 or len(data)
+        raw = pd.read_csv(io.BytesIO(data[:end]), encoding='utf-8-sig')
+        frame, rejected = apply_schema(raw)
+        self.rejected_rows += len(rejected)
+        return frame, hashlib.sha1(data[:end]), end, mtime_ns
+
+    def _publish(self, frame, index, cube, prefix, offset, mtime_ns):
+        # Swapped as one tuple so concurrent sessions never mix versions
+        self._snapshot = (frame, index, cube)
+        self._prefix = prefix
+        self.offset = offset
+        self.mtime_ns = mtime_ns
+
+    def refresh(self):
+        """Pick up appended rows; returns the (frame, index, cube) snapshot."""
+        with self._lock:
+            stat = os.stat(self.source)
+            if stat.st_size == self.offset and stat.st_mtime_ns == self.mtime_ns:
+                return self.snapshot()
+
+            appendable = (
+                self.source.lower().endswith('.csv')
+                and stat.st_size >= self.offset
+                and _prefix_hash(self.source, self.offset).digest() == self._prefix.digest()
+            )
+            if not appendable:
+                self.reload()
+                return self.snapshot()
+
+            with open(self.source, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read(stat.st_size - self.offset)
+            # A half-written last line is left for the next refresh
+            end = chunk.rfind(b'\n') + 1
+            if end == 0:
+                if stat.st_size == self.offset:
+                    # Touched but unchanged
+                    self.mtime_ns = stat.st_mtime_ns
+                return self.snapshot()
+
+            frame, index, cube = self._snapshot
+            raw = pd.read_csv(io.BytesIO(chunk[:end]), header=None, names=self._header)
+            tail, rejected = apply_schema(raw)
+            self.rejected_rows += len(rejected)
+            prefix = self._prefix.copy()
+            prefix.update(chunk[:end])
+            if tail.empty:
+                # Every new line was rejected: skip them, keep the snapshot
+                self._publish(frame, index, cube, prefix, self.offset + end, stat.st_mtime_ns)
+                return self.snapshot()
+            self._publish(
+                append_rows(frame, tail),
+                index.extended(tail),
+                cube.extended(tail),
+                prefix,
+                self.offset + end,
+                stat.st_mtime_ns,
+            )
+            self.appended_rows += len(tail)
+            return self.snapshot()
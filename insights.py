@@ -0,0 +1,146 @@
+import numpy as np
+
+STATUS_NAMES = {'Yes': 'entrepreneurs', 'No': 'non-entrepreneurs'}
+
+# Ages with fewer rows than this are left out of peak/low searches, so a
+# handful of rows cannot make a "peak"
+MIN_AGE_ROWS = 20
+
+
+def histogram_quantiles(values, counts, q):
+    """``q`` quantile of every row of a (..., values) histogram, with
+    pandas' linear interpolation; NaN for empty rows."""
+    values = np.asarray(values, dtype=float)
+    cumulative = np.cumsum(counts, axis=-1)
+    total = cumulative[..., -1]
+    h = (np.maximum(total, 1) - 1) * q
+    lower_rank = np.floor(h)
+    upper_rank = np.minimum(lower_rank + 1, np.maximum(total - 1, 0))
+    lower = values[(cumulative > lower_rank[..., None]).argmax(axis=-1)]
+    upper = values[(cumulative > upper_rank[..., None]).argmax(axis=-1)]
+    return np.where(total > 0, lower + (h - lower_rank) * (upper - lower), np.nan)
+
+
+def _shares(counts):
+    totals = counts.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return counts / totals
+
+
+def level_insights(cube, genders=None, age_range=None, statuses=None):
+    """Note lines for every job level, from one slice of the cube.
+
+    Returns ``{level: {kind: (line, ...)}}`` with the kinds of notes.json
+    (``gender_density``, ``gender_pie``, ``field_of_study``, ``job_level``,
+    ``job_offers``), or ``{level: None}`` for levels with no rows. Every
+    statistic is computed for all levels at once on the slice's arrays.
+    """
+    index = [np.sort(positions) for positions in cube._index(genders=genders, age_range=age_range)]
+    counts = cube.counts[np.ix_(*index)]
+    sums = cube.job_offers[np.ix_(*index)]
+    kept = counts[:, :, :, np.sort(cube._positions('Entrepreneurship', statuses)), :]
+
+    labels = {dim: list(np.asarray(cube.labels[dim], dtype=object)[positions])
+              for dim, positions in zip(('Gender', 'Current_Job_Level', 'Age', 'Entrepreneurship',
+                                         'Field_of_Study'), index)}
+    ages = np.asarray(labels['Age'], dtype=float)
+    statuses_all = labels['Entrepreneurship']
+    yes = statuses_all.index('Yes') if 'Yes' in statuses_all else None
+    # Job offers are described for the selected statuses only, like the line chart
+    shown = [s for s, name in enumerate(statuses_all) if statuses is None or name in statuses]
+
+    # Axes: Gender, Level, Age, Entrepreneurship, Field_of_Study
+    gender_age = kept.sum(axis=(3, 4)).transpose(1, 0, 2)     # level, gender, age
+    field_age = kept.sum(axis=(0, 3)).transpose(0, 2, 1)      # level, field, age
+    level_gender = kept.sum(axis=(2, 3, 4)).T                 # level, gender
+    level_field = kept.sum(axis=(0, 2, 3))                    # level, field
+    age_status = counts.sum(axis=(0, 4))                      # level, age, status (all)
+    age_status_sums = sums.sum(axis=(0, 4))
+
+    gender_q1 = histogram_quantiles(ages, gender_age, 0.25)
+    gender_q3 = histogram_quantiles(ages, gender_age, 0.75)
+    gender_mode = ages[gender_age.argmax(axis=-1)]
+    field_median = histogram_quantiles(ages, field_age, 0.5)
+    gender_share = _shares(level_gender) * 100
+    overall_gender_share = _shares(level_gender.sum(axis=0)) * 100
+    field_share = _shares(level_field) * 100
+    status_share = _shares(age_status) * 100
+    age_rows = age_status.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_offers = age_status_sums / age_status
+        status_offers = age_status_sums.sum(axis=1) / age_status.sum(axis=1)
+
+    def extreme(values, rows, largest=True):
+        # Age and value of the largest (smallest) value among well-populated ages
+        valid = (rows >= MIN_AGE_ROWS) & ~np.isnan(values)
+        if not valid.any():
+            valid = (rows > 0) & ~np.isnan(values)
+        if not valid.any():
+            return None
+        masked = np.where(valid, values, -np.inf if largest else np.inf)
+        i = int(masked.argmax() if largest else masked.argmin())
+        return int(ages[i]), float(values[i])
+
+    results = {}
+    for i, level in enumerate(labels['Current_Job_Level']):
+        if level_gender[i].sum() == 0:
+            results[level] = None
+            continue
+        present = [g for g, n in enumerate(level_gender[i]) if n > 0]
+
+        gender_density = tuple(
+            f"{labels['Gender'][g]}: most common age {gender_mode[i, g]:.0f}, "
+            f"middle half aged {gender_q1[i, g]:.0f}–{gender_q3[i, g]:.0f}."
+            for g in present)
+
+        if i == 0:
+            reference, reference_share = 'all levels', overall_gender_share
+        else:
+            reference, reference_share = labels['Current_Job_Level'][i - 1], gender_share[i - 1]
+        gender_pie = tuple(
+            f"{labels['Gender'][g]}: {gender_share[i, g]:.1f}% of this level "
+            f"({gender_share[i, g] - reference_share[g]:+.1f} pts vs {reference})."
+            if not np.isnan(reference_share[g]) else
+            f"{labels['Gender'][g]}: {gender_share[i, g]:.1f}% of this level."
+            for g in present)
+
+        order = np.argsort(-level_field[i], kind='stable')
+        top = [f for f in order[:3] if level_field[i, f] > 0]
+        fields = [f for f in range(len(labels['Field_of_Study'])) if level_field[i, f] > 0]
+        youngest = min(fields, key=lambda f: field_median[i, f])
+        oldest = max(fields, key=lambda f: field_median[i, f])
+        field_of_study = (
+            "Top fields: " + ', '.join(
+                f"{labels['Field_of_Study'][f]} ({field_share[i, f]:.1f}%)" for f in top) + ".",
+            f"Median age ranges from {field_median[i, youngest]:.1f} in {labels['Field_of_Study'][youngest]} "
+            f"to {field_median[i, oldest]:.1f} in {labels['Field_of_Study'][oldest]}.",
+        )
+
+        job_level = ()
+        job_offers = ()
+        if yes is not None:
+            share = age_status[i, :, yes].sum() / age_rows[i].sum() * 100
+            peak = extreme(status_share[i, :, yes], age_rows[i])
+            low = extreme(status_share[i, :, yes], age_rows[i], largest=False)
+            job_level = (f"{share:.1f}% are entrepreneurs at this level.",)
+            if peak is not None:
+                job_level += (f"The share peaks at age {peak[0]} ({peak[1]:.1f}%) "
+                              f"and is lowest at age {low[0]} ({low[1]:.1f}%).",)
+        present_statuses = [s for s in shown if age_status[i, :, s].sum() > 0]
+        if present_statuses:
+            averages = [f"{STATUS_NAMES.get(statuses_all[s], statuses_all[s])} {status_offers[i, s]:.2f}"
+                        for s in present_statuses]
+            peaks = [(STATUS_NAMES.get(statuses_all[s], statuses_all[s]),
+                      extreme(mean_offers[i, :, s], age_status[i, :, s])) for s in present_statuses]
+            job_offers = ("Average job offers: " + ', '.join(averages) + ".",
+                          "Offers peak at " + ' and '.join(
+                              f"age {peak[0]} for {name} ({peak[1]:.2f})" for name, peak in peaks) + ".")
+
+        results[level] = {
+            'gender_density': gender_density,
+            'gender_pie': gender_pie,
+            'field_of_study': field_of_study,
+            'job_level': job_level,
+            'job_offers': job_offers,
+        }
+    return results
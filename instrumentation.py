@@ -0,0 +1,136 @@
+import argparse
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from settings import PROFILE, PROFILE_LOG, PROFILE_WINDOW
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def rss_bytes(pid='self'):
+    """Resident set size of a process, this one by default (0 where /proc is unavailable)."""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def summarize(reruns, percentiles=(50, 95, 99)):
+    """Per-stage count, mean and percentiles (ms) over rerun records."""
+    timings = {}
+    for rerun in reruns:
+        timings.setdefault('total', []).append(rerun['total_ms'])
+        for stage in rerun['stages']:
+            timings.setdefault(stage['name'], []).append(stage['ms'])
+    rows = {}
+    for name, values in timings.items():
+        values = np.asarray(values)
+        rows[name] = {'count': len(values), 'mean': values.mean()}
+        for p, value in zip(percentiles, np.percentile(values, percentiles)):
+            rows[name][f'p{p}'] = value
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+class Profiler:
+    """Stage timings and RSS deltas for each rerun of the app script.
+
+    ``start_rerun()`` opens a record for the calling thread (one Streamlit
+    session), ``stage(name)`` times a block into it and ``finish_rerun()``
+    appends the record to the recent-reruns window and, if configured, to a
+    JSON-lines log. When disabled, ``stage`` hands back one shared no-op
+    context manager, so instrumented code pays only a method call.
+    """
+
+    def __init__(self, enabled=PROFILE, log_path=PROFILE_LOG, window=PROFILE_WINDOW):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.reruns = deque(maxlen=window)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._noop = contextlib.nullcontext()
+
+    def start_rerun(self):
+        if not self.enabled:
+            return
+        self._local.rerun = {
+            'ts': time.time(),
+            'stages': [],
+            'start': time.perf_counter(),
+            'rss_start': rss_bytes(),
+        }
+
+    def stage(self, name):
+        if not self.enabled or getattr(self._local, 'rerun', None) is None:
+            return self._noop
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        rss = rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.rerun['stages'].append({
+                'name': name,
+                'ms': (time.perf_counter() - start) * 1000,
+                'rss_delta': rss_bytes() - rss,
+            })
+
+    def finish_rerun(self, **context):
+        """Close this thread's rerun; ``context`` (e.g. the filters) is logged with it."""
+        rerun = getattr(self._local, 'rerun', None)
+        if not self.enabled or rerun is None:
+            return None
+        self._local.rerun = None
+        record = {
+            'ts': rerun['ts'],
+            'context': context,
+            'total_ms': (time.perf_counter() - rerun['start']) * 1000,
+            'rss_delta': rss_bytes() - rerun['rss_start'],
+            'stages': rerun['stages'],
+        }
+        with self._lock:
+            self.reruns.append(record)
+            if self.log_path:
+                with open(self.log_path, 'a') as f:
+                    f.write(json.dumps(record, default=str) + '\n')
+        return record
+
+    def summary(self):
+        with self._lock:
+            reruns = list(self.reruns)
+        return summarize(reruns)
+
+
+profiler = Profiler()
+
+
+def read_log(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage percentiles from a rerun timing log")
+    parser.add_argument('log', nargs='?', default=PROFILE_LOG or 'profile.jsonl')
+    parser.add_argument('--last', type=int, default=None, help="only the most recent N reruns")
+    args = parser.parse_args()
+
+    reruns = read_log(args.log)
+    if args.last:
+        reruns = reruns[-args.last:]
+    print(f"{len(reruns):,} reruns from {args.log} (ms)")
+    print(summarize(reruns).sort_values('mean', ascending=False).to_string(float_format='{:.2f}'.format))
+
+
+if __name__ == '__main__':
+    main()
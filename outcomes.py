@@ -0,0 +1,243 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from quantiles import GridBins, LogBins, quantile_from_counts
+
+# Career-outcome columns and the binning of their histograms. All are
+# integers (schema.py), so sums and cross products are exact in int64
+OUTCOME_COLUMNS = {
+    'Starting_Salary': LogBins(),
+    'Career_Satisfaction': GridBins(),
+    'Years_to_Promotion': GridBins(),
+    'Work_Life_Balance': GridBins(),
+    'University_Ranking': GridBins(),
+    'Internships_Completed': GridBins(),
+    'SAT_Score': GridBins(),
+}
+
+# Dimensions a segment is keyed by; the view drills down along any of them
+OUTCOME_DIMENSIONS = ['Field_of_Study', 'Current_Job_Level', 'Gender']
+
+SUMMARY_COLUMNS = ['Count', 'Mean', 'Std', 'Min', 'Q1', 'Median', 'Q3', 'Max',
+                   'Lower Fence', 'Upper Fence', 'Outliers']
+
+
+def _sample_std(n, total, square):
+    # n * sum(x^2) - sum(x)^2 in Python integers: exact, then one rounding
+    if n < 2:
+        return math.nan
+    return math.sqrt((n * square - total ** 2) / (n * (n - 1)))
+
+
+class OutcomeCube:
+    """Career-outcome statistics per (Field_of_Study x Level x Gender) segment.
+
+    Per segment it keeps the row count, the sums and cross products of the
+    outcome columns, and a histogram of every column binned as in
+    quantiles.py. A selection of segments is a slice and a sum: means,
+    standard deviations and the correlation matrix come exactly from the
+    sums, percentiles and box plots from the histograms (exact for grid
+    columns, within ``relative_error`` for Starting_Salary). Mergeable like
+    the QuantileCube, so it can be built per chunk.
+    """
+
+    def __init__(self, df, columns=OUTCOME_COLUMNS):
+        self.columns = columns
+        self.labels = {}
+        codes = []
+        for dim in OUTCOME_DIMENSIONS:
+            col = df[dim]
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                labels, dim_codes = list(col.cat.categories), col.cat.codes.to_numpy()
+            else:
+                dim_codes, labels = pd.factorize(col, sort=True)
+                labels = list(labels)
+            self.labels[dim] = labels
+            codes.append(dim_codes)
+        shape = tuple(len(self.labels[dim]) for dim in OUTCOME_DIMENSIONS)
+        size = int(np.prod(shape))
+        segments = np.ravel_multi_index(codes, shape) if len(df) else np.zeros(0, dtype=np.int64)
+
+        names = list(columns)
+        k = len(names)
+        self.rows = np.bincount(segments, minlength=size).reshape(shape)
+        sums = np.zeros((size, k), dtype=np.int64)
+        products = np.zeros((size, k, k), dtype=np.int64)
+        # Rows grouped by segment, so every sum is one reduceat over int64
+        order = np.argsort(segments, kind='stable')
+        ordered = segments[order]
+        values = df[names].to_numpy(dtype=np.int64)[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]]) if len(df) else []
+        if len(starts):
+            present = ordered[starts]
+            for i in range(k):
+                sums[present, i] = np.add.reduceat(values[:, i], starts)
+                for j in range(i, k):
+                    products[present, i, j] = products[present, j, i] = np.add.reduceat(
+                        values[:, i] * values[:, j], starts)
+        self.sums = sums.reshape(shape + (k,))
+        self.products = products.reshape(shape + (k, k))
+
+        self.offsets = {}
+        self.histograms = {}
+        for name, bins in columns.items():
+            index = bins.index(df[name].to_numpy())
+            offset = int(index.min()) if len(index) else 0
+            width = int(index.max()) - offset + 1 if len(index) else 1
+            counts = np.bincount(segments * width + (index - offset), minlength=size * width)
+            self.offsets[name] = offset
+            self.histograms[name] = counts.reshape(shape + (width,))
+
+    def merged(self, other):
+        """New cube holding the rows of both cubes."""
+        new = OutcomeCube.__new__(OutcomeCube)
+        new.columns = self.columns
+        new.labels = {}
+        positions = ([], [])
+        for dim in OUTCOME_DIMENSIONS:
+            seen = set(self.labels[dim])
+            labels = list(self.labels[dim]) + [v for v in other.labels[dim] if v not in seen]
+            lookup = pd.Index(labels)
+            new.labels[dim] = labels
+            positions[0].append(lookup.get_indexer(self.labels[dim]))
+            positions[1].append(lookup.get_indexer(other.labels[dim]))
+
+        shape = tuple(len(new.labels[dim]) for dim in OUTCOME_DIMENSIONS)
+        k = len(self.columns)
+        new.rows = np.zeros(shape, dtype=np.int64)
+        new.sums = np.zeros(shape + (k,), dtype=np.int64)
+        new.products = np.zeros(shape + (k, k), dtype=np.int64)
+        for cube, pos in zip((self, other), positions):
+            new.rows[np.ix_(*pos)] += cube.rows
+            new.sums[np.ix_(*pos, range(k))] += cube.sums
+            new.products[np.ix_(*pos, range(k), range(k))] += cube.products
+
+        new.offsets, new.histograms = {}, {}
+        for name in self.columns:
+            offset = min(self.offsets[name], other.offsets[name])
+            end = max(self.offsets[name] + self.histograms[name].shape[-1],
+                      other.offsets[name] + other.histograms[name].shape[-1])
+            counts = np.zeros(shape + (end - offset,), dtype=np.int64)
+            for cube, pos in zip((self, other), positions):
+                start = cube.offsets[name] - offset
+                bins = np.arange(start, start + cube.histograms[name].shape[-1])
+                counts[np.ix_(*pos, bins)] += cube.histograms[name]
+            new.offsets[name] = offset
+            new.histograms[name] = counts
+        return new
+
+    def extended(self, df):
+        return self.merged(OutcomeCube(df, self.columns))
+
+    def _index(self, fields=None, levels=None, genders=None):
+        def positions(dim, values):
+            if values is None:
+                return np.arange(len(self.labels[dim]))
+            lookup = {label: i for i, label in enumerate(self.labels[dim])}
+            # Sorted, so groups come out in label order
+            return np.sort(np.array([lookup[v] for v in values if v in lookup], dtype=np.intp))
+
+        return [
+            positions('Field_of_Study', fields),
+            positions('Current_Job_Level', levels),
+            positions('Gender', genders),
+        ]
+
+    def _grouped(self, array, by=None, **selection):
+        """Group labels and ``array`` summed over the selected segments of
+        each ``by`` value (one 'All' group without ``by``)."""
+        index = self._index(**selection)
+        tail = array.shape[len(OUTCOME_DIMENSIONS):]
+        sub = array[np.ix_(*index, *(np.arange(n) for n in tail))]
+        # Summed over the dimension axes rather than reshaped: an empty
+        # selection axis leaves nothing to infer a reshape from
+        dims = tuple(range(len(OUTCOME_DIMENSIONS)))
+        if by is None:
+            return ['All'], sub.sum(axis=dims)[None]
+        axis = OUTCOME_DIMENSIONS.index(by)
+        sub = np.moveaxis(sub, axis, 0)
+        labels = list(np.asarray(self.labels[by], dtype=object)[index[axis]])
+        return labels, sub.sum(axis=dims[1:])
+
+    def histogram(self, column, **selection):
+        """(bin values, counts) of ``column`` over the selected segments."""
+        _, counts = self._grouped(self.histograms[column], **selection)
+        width = counts.shape[-1]
+        return self.columns[column].value(self.offsets[column] + np.arange(width)), counts[0]
+
+    def binned(self, column, bins=40, **selection):
+        """Histogram for display: Low, High and Count of at most ``bins``
+        equal-width bins over the selection's range; one bin per value for
+        grid columns with fewer values than that."""
+        values, counts = self.histogram(column, **selection)
+        present = values[counts > 0]
+        if not len(present):
+            return pd.DataFrame({'Low': [], 'High': [], 'Count': []})
+        low, high = float(present[0]), float(present[-1])
+        step = getattr(self.columns[column], 'step', None)
+        if step is not None and (high - low) / step < bins:
+            edges = np.arange(low - step / 2, high + step, step)
+        else:
+            edges = np.linspace(low, high, bins + 1)
+        totals, edges = np.histogram(values, bins=edges, weights=counts)
+        return pd.DataFrame({'Low': edges[:-1], 'High': edges[1:], 'Count': totals.astype(np.int64)})
+
+    def summary(self, column, by=None, **selection):
+        """Count, mean, standard deviation and box-plot statistics of
+        ``column`` per ``by`` group, for the groups with rows.
+
+        Fences are Tukey's (the furthest values within 1.5 IQR of the
+        quartiles); ``Outliers`` counts the rows beyond them.
+        """
+        i = list(self.columns).index(column)
+        labels, rows = self._grouped(self.rows, by, **selection)
+        _, sums = self._grouped(self.sums[..., i], by, **selection)
+        _, squares = self._grouped(self.products[..., i, i], by, **selection)
+        _, counts = self._grouped(self.histograms[column], by, **selection)
+        values = self.columns[column].value(self.offsets[column] + np.arange(counts.shape[-1]))
+
+        records = []
+        for label, n, total, square, hist in zip(labels, rows, sums, squares, counts):
+            if n == 0:
+                continue
+            present = values[hist > 0]
+            q1, median, q3 = quantile_from_counts(values, hist, (0.25, 0.5, 0.75))
+            inside = (values >= q1 - 1.5 * (q3 - q1)) & (values <= q3 + 1.5 * (q3 - q1)) & (hist > 0)
+            records.append({
+                by or 'Group': label,
+                'Count': int(n),
+                'Mean': total / n,
+                'Std': _sample_std(int(n), int(total), int(square)),
+                'Min': float(present[0]),
+                'Q1': q1,
+                'Median': median,
+                'Q3': q3,
+                'Max': float(present[-1]),
+                'Lower Fence': float(values[inside][0]),
+                'Upper Fence': float(values[inside][-1]),
+                'Outliers': int(hist[(hist > 0) & ~inside].sum()),
+            })
+        return pd.DataFrame(records, columns=[by or 'Group'] + SUMMARY_COLUMNS)
+
+    def correlation(self, **selection):
+        """Pearson correlation matrix of the outcome columns over the
+        selection, from the sums and cross products (NaN for a constant
+        column or fewer than two rows)."""
+        _, rows = self._grouped(self.rows, **selection)
+        _, sums = self._grouped(self.sums, **selection)
+        _, products = self._grouped(self.products, **selection)
+        n, sums, products = int(rows[0]), sums[0].astype(object), products[0].astype(object)
+        # n^2 times the covariance matrix, exact in Python integers
+        scaled = (n * products - np.outer(sums, sums)).astype(float)
+        spread = np.sqrt(np.diag(scaled))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = scaled / np.outer(spread, spread)
+        if n < 2:
+            matrix[:] = np.nan
+        names = list(self.columns)
+        return pd.DataFrame(matrix, index=pd.Index(names, name='Column'), columns=names)
+
+    def relative_error(self, column):
+        return self.columns[column].relative_error
@@ -0,0 +1,76 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from settings import AGGREGATION_EXECUTOR, AGGREGATION_WORKERS
+
+# Below this many rows per worker the pool costs more than it saves
+MIN_ROWS_PER_WORKER = 250_000
+
+
+def accumulate_rows(codes, shape, weights):
+    """Row counts and ``weights`` sums per cell of a dense ``shape`` array.
+
+    ``codes`` holds one integer code array per axis. ``ravel_multi_index``
+    and ``bincount`` release the GIL, so threads running this on disjoint
+    row ranges use separate cores.
+    """
+    flat = np.ravel_multi_index(codes, shape)
+    size = int(np.prod(shape))
+    counts = np.bincount(flat, minlength=size).reshape(shape)
+    # bincount returns int64 for no rows; sums are float64 either way
+    sums = np.bincount(flat, weights=weights, minlength=size).astype(np.float64, copy=False).reshape(shape)
+    return counts, sums
+
+
+def partition_rows(n, parts):
+    """``parts`` contiguous (start, stop) ranges covering ``range(n)``."""
+    bounds = np.linspace(0, n, parts + 1).astype(int)
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def partition_by(codes, axis):
+    """One row-position array per value of ``codes[axis]`` that occurs."""
+    order = np.argsort(codes[axis], kind='stable')
+    _, starts = np.unique(codes[axis][order], return_index=True)
+    return np.split(order, starts[1:])
+
+
+def worker_count(n, workers=AGGREGATION_WORKERS):
+    """Workers ``accumulate`` uses for ``n`` rows: at most one per
+    MIN_ROWS_PER_WORKER rows, and at least one."""
+    return min(workers, max(1, n // MIN_ROWS_PER_WORKER))
+
+
+def accumulate(codes, shape, weights, workers=AGGREGATION_WORKERS, executor=AGGREGATION_EXECUTOR,
+               partition_axis=None):
+    """``accumulate_rows`` split across a thread or process pool.
+
+    Rows are split into contiguous ranges, or by the value of
+    ``codes[partition_axis]`` (e.g. the job level) when given. Partial
+    counts are integers and partial sums of integer weights stay exact in
+    float64, so the merged arrays equal the serial result bit for bit. Runs
+    serially when ``workers`` is 1 or the frame is too small to benefit.
+    """
+    n = len(weights)
+    workers = worker_count(n, workers)
+    if workers <= 1:
+        return accumulate_rows(codes, shape, weights)
+
+    if partition_axis is None:
+        parts = [
+            ([c[start:stop] for c in codes], weights[start:stop])
+            for start, stop in partition_rows(n, workers)
+        ]
+    else:
+        parts = [
+            ([c[rows] for c in codes], weights[rows])
+            for rows in partition_by(codes, partition_axis)
+        ]
+
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_class(workers) as pool:
+        partials = list(pool.map(accumulate_rows, *zip(*[(c, shape, w) for c, w in parts])))
+    counts = sum(p[0] for p in partials)
+    sums = sum(p[1] for p in partials)
+    return counts, sums
@@ -0,0 +1,121 @@
+import base64
+import math
+
+import numpy as np
+import plotly.io as pio
+
+from settings import LINE_MAX_POINTS, PAYLOAD_DECIMALS
+
+# Grid density for KDE curves, in points per kernel bandwidth. Five keeps
+# the piecewise-linear curve within about 1% of the true density.
+POINTS_PER_BANDWIDTH = 5
+MIN_KDE_POINTS = 25
+MAX_KDE_POINTS = 100
+
+# Trace attributes holding per-point data
+ARRAY_KEYS = ('x', 'y', 'values', 'customdata')
+
+
+def kde_points(span, bandwidth):
+    """Grid size resolving a KDE of ``bandwidth`` over ``span`` units.
+
+    Narrow kernels (many rows) need a fine grid; wide ones (few rows) look
+    the same with a fraction of the points.
+    """
+    if not bandwidth or not math.isfinite(bandwidth) or span <= 0:
+        return MIN_KDE_POINTS
+    points = math.ceil(span / bandwidth * POINTS_PER_BANDWIDTH) + 1
+    return int(min(MAX_KDE_POINTS, max(MIN_KDE_POINTS, points)))
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` points that
+    keep the visual shape of the line through ``(x, y)``.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        # Average of the next bucket is the third corner of the triangle
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def decode_array(value):
+    """Plotly's typed-array form (``{'dtype', 'bdata'}``) as a NumPy array."""
+    if isinstance(value, dict) and 'bdata' in value:
+        array = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+        if 'shape' in value:
+            array = array.reshape([int(n) for n in str(value['shape']).split(',')])
+        return array
+    return value
+
+
+def encode_array(array):
+    """NumPy array in the typed-array form ``Figure.to_dict`` produces."""
+    if array.ndim != 1:
+        return array.tolist()
+    return {'dtype': array.dtype.str[1:], 'bdata': base64.b64encode(array.tobytes()).decode('ascii')}
+
+
+def compact_array(values, decimals=PAYLOAD_DECIMALS):
+    """Numeric data as the smallest array that still shows the same values.
+
+    Floats are rounded to ``decimals`` significant digits and sent as
+    float32, which Plotly encodes as 4-byte binary instead of 8-byte or
+    decimal text. Non-numeric data is returned unchanged.
+    """
+    try:
+        array = np.asarray(decode_array(values))
+    except ValueError:
+        # Ragged nested lists
+        return values
+    if array.dtype.kind != 'f':
+        return values
+    nonzero = np.abs(array[np.isfinite(array) & (array != 0)])
+    magnitude = np.floor(np.log10(nonzero.max())) if len(nonzero) else 0
+    return encode_array(np.round(array, int(decimals - 1 - magnitude)).astype(np.float32))
+
+
+def reduce_trace(trace, max_points=LINE_MAX_POINTS):
+    """Downsample a long line trace with LTTB and compact its arrays."""
+    mode = trace.get('mode') or ''
+    x, y = trace.get('x'), trace.get('y')
+    if 'lines' in mode and x is not None and y is not None:
+        x_array, y_array = np.asarray(decode_array(x)), np.asarray(decode_array(y))
+        if len(x_array) > max_points and x_array.dtype.kind in 'iuf' and y_array.dtype.kind in 'iuf':
+            keep = lttb(x_array, y_array, max_points)
+            trace['x'], trace['y'] = x_array[keep], y_array[keep]
+            customdata = trace.get('customdata')
+            if customdata is not None:
+                customdata = np.asarray(decode_array(customdata))
+                if len(customdata) == len(x_array):
+                    trace['customdata'] = customdata[keep].tolist()
+    for key in ARRAY_KEYS:
+        if trace.get(key) is not None:
+            trace[key] = compact_array(trace[key])
+    return trace
+
+
+def reduce_figure(figure_dict, max_points=LINE_MAX_POINTS):
+    """``figure_dict`` with every trace reduced in place."""
+    for trace in figure_dict.get('data', []):
+        reduce_trace(trace, max_points)
+    return figure_dict
+
+
+def figure_bytes(figure_dict):
+    """Size of the JSON Plotly sends to the browser for this figure."""
+    return len(pio.to_json(figure_dict, validate=False))
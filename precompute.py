@@ -0,0 +1,198 @@
+import argparse
+import itertools
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from analytics import GROUP_COLUMNS, Analytics, open_dataset
+from caching import LRUCache
+from settings import DATA_PATH, PRECOMPUTED_DIR, SHARED_DATA_DIR
+
+
+# Bumped when stored results change; stores of an older format are not read
+STORE_FORMAT = 2
+
+
+def store_path(version, directory=PRECOMPUTED_DIR):
+    return os.path.join(directory, f'{version}.v{STORE_FORMAT}.sqlite')
+
+
+def _canonical_key(filters, genders, age_bounds):
+    """Store key of a selection; equivalent selections share one key."""
+    selected = filters.get('genders')
+    if selected is not None and set(genders) <= set(selected):
+        selected = None
+    age_range = filters.get('age_range') or age_bounds
+    return json.dumps([
+        None if selected is None else sorted(selected),
+        filters.get('level'),
+        [int(age_range[0]), int(age_range[1])],
+        sorted(filters.get('statuses') or []),
+    ])
+
+
+def enumerate_filters(options, age_step=1):
+    """Every sidebar selection worth precomputing.
+
+    Gender subsets (all genders stands for "no filter"), every job level,
+    each non-empty set of statuses and the age ranges whose ends are the
+    bounds or a multiple of ``age_step`` apart from the minimum age.
+    """
+    genders = options['genders']
+    gender_sets = [None] + [
+        list(subset) for size in range(1, len(genders))
+        for subset in itertools.combinations(genders, size)
+    ]
+    status_sets = [
+        list(subset) for size in range(1, len(options['statuses']) + 1)
+        for subset in itertools.combinations(options['statuses'], size)
+    ]
+    low, high = options['age_bounds']
+    ends = sorted(set(range(low, high + 1, age_step)) | {high})
+    age_ranges = [(a, b) for a, b in itertools.combinations(ends, 2)]
+    return [
+        dict(genders=g, level=level, age_range=ages, statuses=s)
+        for level in options['levels']
+        for g in gender_sets
+        for s in status_sets
+        for ages in age_ranges
+    ]
+
+
+def compute_record(analytics, filters):
+    """Everything the dashboard draws for one selection."""
+    return {
+        'kpis': analytics.kpis(filters),
+        'counts': {col: analytics.category_counts(filters, col) for col in GROUP_COLUMNS},
+        'density': {col: analytics.density_curves(filters, col) for col in GROUP_COLUMNS},
+        'entrepreneurship_by_age': analytics.entrepreneurship_by_age(filters),
+        'job_offers_by_age': analytics.job_offers_by_age(filters),
+    }
+
+
+# Per worker process: the dataset loaded once by _init_worker
+_worker = {}
+
+
+def _init_worker(source, shared_dir, version):
+    dataset = open_dataset(source, shared_dir)
+    analytics = Analytics.from_dataset(dataset)
+    if analytics.version != version:
+        raise RuntimeError(f"Dataset changed during precompute ({analytics.version} != {version})")
+    _worker['analytics'] = analytics
+
+
+def _compute_batch(batch):
+    analytics = _worker['analytics']
+    options = analytics.filter_options()
+    return [
+        (_canonical_key(filters, options['genders'], options['age_bounds']),
+         zlib.compress(pickle.dumps(compute_record(analytics, filters), pickle.HIGHEST_PROTOCOL)))
+        for filters in batch
+    ]
+
+
+def precompute(source=DATA_PATH, shared_dir=SHARED_DATA_DIR, directory=PRECOMPUTED_DIR,
+               workers=None, age_step=1, batch_size=64):
+    """Compute every enumerated selection in a process pool into a store file.
+
+    The store is written next to the final path and renamed into place, and
+    stores of older dataset versions are removed. Returns (path, combinations).
+    """
+    dataset = open_dataset(source, shared_dir)
+    analytics = Analytics.from_dataset(dataset)
+    options = analytics.filter_options()
+    combinations = enumerate_filters(options, age_step)
+    batches = [combinations[i:i + batch_size] for i in range(0, len(combinations), batch_size)]
+
+    os.makedirs(directory, exist_ok=True)
+    path = store_path(analytics.version, directory)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    conn = sqlite3.connect(tmp_path)
+    conn.execute('CREATE TABLE records (key TEXT PRIMARY KEY, value BLOB)')
+    conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+    conn.execute('INSERT INTO meta VALUES (?, ?)', ('options', json.dumps(options)))
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(source, shared_dir, analytics.version)) as pool:
+        for rows in pool.map(_compute_batch, batches):
+            conn.executemany('INSERT OR REPLACE INTO records VALUES (?, ?)', rows)
+    conn.commit()
+    conn.close()
+    os.replace(tmp_path, path)
+
+    for name in os.listdir(directory):
+        if name.endswith('.sqlite') and os.path.join(directory, name) != path:
+            os.remove(os.path.join(directory, name))
+    return path, len(combinations)
+
+
+class PrecomputedStore:
+    """Read-only lookup into a store written by ``precompute``.
+
+    One indexed SQLite read per selection, with the unpickled records of
+    recent selections kept in memory; the connection is shared by the
+    sessions of the process.
+    """
+
+    def __init__(self, path, cache_entries=256):
+        self.path = path
+        self._conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        options = json.loads(self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'options'").fetchone()[0])
+        self.genders = options['genders']
+        self.age_bounds = options['age_bounds']
+        self._records = LRUCache(maxsize=cache_entries)
+
+    def _read(self, key):
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM records WHERE key = ?', (key,)).fetchone()
+        return None if row is None else pickle.loads(zlib.decompress(row[0]))
+
+    def get(self, filters):
+        """The precomputed record for ``filters``, or None if not enumerated."""
+        key = _canonical_key(filters, self.genders, self.age_bounds)
+        return self._records.get_or_compute(key, lambda: self._read(key))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(version, directory=PRECOMPUTED_DIR):
+    """The store for a dataset version, or None when it was not precomputed."""
+    path = store_path(version, directory)
+    with _stores_lock:
+        if path not in _stores:
+            if not os.path.exists(path):
+                return None
+            _stores[path] = PrecomputedStore(path)
+        return _stores[path]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute dashboard results for every common filter combination")
+    parser.add_argument('--source', default=DATA_PATH)
+    parser.add_argument('--directory', default=PRECOMPUTED_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--age-step', type=int, default=1,
+                        help="enumerate age ranges ending on multiples of this step")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path, combinations = precompute(args.source, SHARED_DATA_DIR, args.directory, args.workers, args.age_step)
+    size = os.path.getsize(path) / 1e6
+    print(f"{combinations:,} combinations in {time.perf_counter() - start:.1f} s -> {path} ({size:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from settings import SALARY_RELATIVE_ERROR
+
+# Sidebar dimensions a segment is keyed by (Field_of_Study is not filterable)
+SEGMENT_DIMENSIONS = ['Gender', 'Current_Job_Level', 'Age', 'Entrepreneurship']
+
+
+def quantile_from_counts(values, counts, qs):
+    """Quantiles of a histogram with pandas' linear interpolation.
+
+    ``values`` must be sorted. For ``q = 0.5`` this is the same median as
+    ``cube.median_from_counts``. An empty histogram gives NaNs; a ``q``
+    outside [0, 1] is a ValueError.
+    """
+    qs = np.atleast_1d(np.asarray(qs, dtype=float))
+    if not np.all((qs >= 0) & (qs <= 1)):
+        raise ValueError(f"quantile levels must be between 0 and 1, got {qs.tolist()}")
+    counts = np.asarray(counts)
+    total = int(counts.sum())
+    if total == 0:
+        return np.full(len(qs), np.nan)
+    values = np.asarray(values, dtype=float)
+    cumulative = np.cumsum(counts)
+    h = (total - 1) * qs
+    lower_rank = np.floor(h).astype(np.int64)
+    upper_rank = np.minimum(lower_rank + 1, total - 1)
+    lower = values[np.searchsorted(cumulative, lower_rank, side='right')]
+    upper = values[np.searchsorted(cumulative, upper_rank, side='right')]
+    return lower + (h - lower_rank) * (upper - lower)
+
+
+class GridBins:
+    """Exact bins for values on a fixed grid (ages, 2-decimal GPAs)."""
+
+    relative_error = 0.0
+
+    def __init__(self, step=1):
+        self.step = step
+
+    def index(self, values):
+        return np.rint(np.asarray(values, dtype=float) / self.step).astype(np.int64)
+
+    def value(self, index):
+        # Divide rather than multiply so bin 380 of 0.01 reads 3.8, not 3.8000000000000003
+        return np.asarray(index) / (1 / self.step)
+
+
+class LogBins:
+    """Logarithmic bins with a relative error bound (the DDSketch mapping).
+
+    Bin ``i`` covers ``(gamma**(i-1), gamma**i]`` and is represented by
+    ``2 * gamma**i / (gamma + 1)``, which is within ``relative_error`` of
+    every value in it. Values below 1 share bin -1, represented by 0.
+    """
+
+    def __init__(self, relative_error=SALARY_RELATIVE_ERROR):
+        self.relative_error = relative_error
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+
+    def index(self, values):
+        values = np.asarray(values, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            index = np.ceil(np.log(values) / self._log_gamma)
+        return np.where(values < 1, -1, index).astype(np.int64)
+
+    def value(self, index):
+        index = np.asarray(index)
+        return np.where(index < 0, 0.0, 2 * self.gamma ** index / (self.gamma + 1))
+
+
+# column -> binning; GPAs are stored with two decimals, so 0.01 bins are exact
+QUANTILE_COLUMNS = {
+    'High_School_GPA': GridBins(0.01),
+    'University_GPA': GridBins(0.01),
+    'Starting_Salary': LogBins(),
+}
+
+
+class QuantileCube:
+    """Per-segment value histograms for percentile KPIs without row scans.
+
+    For every column in ``columns`` a dense (Gender x Level x Age x Status x
+    bin) count array is kept; a selection's percentile is a slice, a sum
+    over segments and a walk of the cumulative counts. Columns on a grid
+    are exact. Log-binned columns are within ``relative_error`` of the
+    exact value. Histograms are mergeable: ``merged`` adds two cubes, so
+    they can be built per chunk or per appended batch.
+    """
+
+    def __init__(self, df, columns=QUANTILE_COLUMNS):
+        self.columns = columns
+        self.labels = {}
+        codes = []
+        for dim in SEGMENT_DIMENSIONS:
+            col = df[dim]
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                labels, dim_codes = list(col.cat.categories), col.cat.codes.to_numpy()
+            else:
+                dim_codes, labels = pd.factorize(col, sort=True)
+                labels = list(labels)
+            self.labels[dim] = labels
+            codes.append(dim_codes)
+        shape = tuple(len(self.labels[dim]) for dim in SEGMENT_DIMENSIONS)
+        segments = np.ravel_multi_index(codes, shape) if len(df) else np.zeros(0, dtype=np.int64)
+
+        self.offsets = {}
+        self.counts = {}
+        for name, bins in columns.items():
+            index = bins.index(df[name].to_numpy())
+            offset = int(index.min()) if len(index) else 0
+            width = int(index.max()) - offset + 1 if len(index) else 1
+            flat = segments * width + (index - offset)
+            counts = np.bincount(flat, minlength=int(np.prod(shape)) * width)
+            self.offsets[name] = offset
+            self.counts[name] = counts.reshape(shape + (width,))
+
+    def merged(self, other):
+        """New cube holding the rows of both cubes."""
+        new = QuantileCube.__new__(QuantileCube)
+        new.columns = self.columns
+        new.labels = {}
+        positions = ([], [])
+        for dim in SEGMENT_DIMENSIONS:
+            seen = set(self.labels[dim])
+            labels = list(self.labels[dim]) + [v for v in other.labels[dim] if v not in seen]
+            if dim == 'Age':
+                labels = sorted(labels)
+            lookup = pd.Index(labels)
+            new.labels[dim] = labels
+            positions[0].append(lookup.get_indexer(self.labels[dim]))
+            positions[1].append(lookup.get_indexer(other.labels[dim]))
+
+        shape = tuple(len(new.labels[dim]) for dim in SEGMENT_DIMENSIONS)
+        new.offsets, new.counts = {}, {}
+        for name in self.columns:
+            offset = min(self.offsets[name], other.offsets[name])
+            end = max(self.offsets[name] + self.counts[name].shape[-1],
+                      other.offsets[name] + other.counts[name].shape[-1])
+            counts = np.zeros(shape + (end - offset,), dtype=np.int64)
+            for cube, pos in zip((self, other), positions):
+                start = cube.offsets[name] - offset
+                bins = np.arange(start, start + cube.counts[name].shape[-1])
+                counts[np.ix_(*pos, bins)] += cube.counts[name]
+            new.offsets[name] = offset
+            new.counts[name] = counts
+        return new
+
+    def extended(self, df):
+        return self.merged(QuantileCube(df, self.columns))
+
+    def _index(self, genders=None, level=None, age_range=None, statuses=None):
+        def positions(dim, values):
+            if values is None:
+                return np.arange(len(self.labels[dim]))
+            lookup = {label: i for i, label in enumerate(self.labels[dim])}
+            return np.array([lookup[v] for v in values if v in lookup], dtype=np.intp)
+
+        ages = np.asarray(self.labels['Age'])
+        if age_range is None:
+            age_positions = np.arange(len(ages))
+        else:
+            age_positions = np.flatnonzero((ages >= age_range[0]) & (ages <= age_range[1]))
+        return [
+            positions('Gender', genders),
+            positions('Current_Job_Level', None if level is None else [level]),
+            age_positions,
+            positions('Entrepreneurship', statuses),
+        ]
+
+    def histogram(self, column, **selection):
+        """(bin values, counts) of ``column`` over the selected segments."""
+        counts = self.counts[column]
+        width = counts.shape[-1]
+        sub = counts[np.ix_(*self._index(**selection), np.arange(width))]
+        totals = sub.reshape(-1, width).sum(axis=0)
+        values = self.columns[column].value(self.offsets[column] + np.arange(width))
+        return values, totals
+
+    def quantiles(self, column, qs, **selection):
+        values, counts = self.histogram(column, **selection)
+        return quantile_from_counts(values, counts, qs)
+
+    def relative_error(self, column):
+        return self.columns[column].relative_error
@@ -0,0 +1,111 @@
+import argparse
+
+import pandas as pd
+
+# Bump when SCHEMA changes so cached columns are rebuilt
+SCHEMA_VERSION = 1
+
+JOB_LEVELS = ['Entry', 'Mid', 'Senior', 'Executive']
+GENDERS = ['Female', 'Male', 'Other']
+STATUSES = ['No', 'Yes']
+
+# column -> (dtype, min, max); numeric bounds are inclusive, None = unbounded
+SCHEMA = {
+    'Student_ID': ('str', None, None),
+    'Age': ('int8', 14, 100),
+    'Gender': (pd.CategoricalDtype(GENDERS), None, None),
+    'High_School_GPA': ('float32', 0, 4),
+    'SAT_Score': ('int16', 400, 1600),
+    'University_Ranking': ('int16', 1, 10000),
+    'University_GPA': ('float32', 0, 4),
+    'Field_of_Study': ('category', None, None),
+    'Internships_Completed': ('int8', 0, 100),
+    'Projects_Completed': ('int8', 0, 100),
+    'Certifications': ('int8', 0, 100),
+    'Soft_Skills_Score': ('int8', 1, 10),
+    'Networking_Score': ('int8', 1, 10),
+    'Job_Offers': ('int8', 0, 100),
+    'Starting_Salary': ('int32', 0, None),
+    'Career_Satisfaction': ('int8', 1, 10),
+    'Years_to_Promotion': ('int8', 0, 100),
+    'Current_Job_Level': (pd.CategoricalDtype(JOB_LEVELS, ordered=True), None, None),
+    'Work_Life_Balance': ('int8', 1, 10),
+    # Two-category categorical rather than bool: the app filters, colours and
+    # labels by the 'Yes' / 'No' strings, and it is one byte per row either way
+    'Entrepreneurship': (pd.CategoricalDtype(STATUSES), None, None),
+}
+
+
+def _invalid(col, dtype, low, high):
+    """Boolean mask of values that cannot be stored as ``dtype`` within bounds."""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return ~col.isin(dtype.categories)
+    if dtype in ('str', 'category'):
+        return col.isna() | (col.astype(str).str.strip() == '')
+    values = pd.to_numeric(col, errors='coerce')
+    invalid = values.isna()
+    if dtype.startswith('int'):
+        invalid |= values % 1 != 0
+    if low is not None:
+        invalid |= values < low
+    if high is not None:
+        invalid |= values > high
+    return invalid
+
+
+def apply_schema(df):
+    """Validate a raw frame and cast it to the compact dtypes.
+
+    Returns ``(typed, rejected)``: the rows that passed, cast per SCHEMA, and
+    the rows that did not, with a ``Rejected_Columns`` column naming the
+    offending fields.
+    """
+    missing = [name for name in SCHEMA if name not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    failures = pd.DataFrame({
+        name: _invalid(df[name], dtype, low, high) for name, (dtype, low, high) in SCHEMA.items()
+    }, index=df.index)
+    bad = failures.any(axis=1)
+
+    rejected = df.loc[bad].copy()
+    rejected['Rejected_Columns'] = [
+        ', '.join(failures.columns[row]) for row in failures.loc[bad].to_numpy()
+    ]
+
+    typed = df.loc[~bad, list(SCHEMA)].reset_index(drop=True)
+    typed = typed.astype({
+        name: dtype for name, (dtype, _, _) in SCHEMA.items()
+    })
+    return typed, rejected
+
+
+def memory_report(before, after):
+    """Deep memory usage of two versions of the frame, per column and total."""
+    report = pd.DataFrame({
+        'before': before.memory_usage(deep=True, index=False),
+        'after': after.memory_usage(deep=True, index=False),
+    }).fillna(0).astype(int)
+    report.loc['Total'] = report.sum()
+    report['ratio'] = report['before'] / report['after']
+    return report
+
+
+def main():
+    from data_cache import read_raw
+
+    parser = argparse.ArgumentParser(description="Validate the export against SCHEMA and report memory")
+    parser.add_argument('source', nargs='?', default='education_career_success.csv')
+    args = parser.parse_args()
+
+    raw = read_raw(args.source)
+    typed, rejected = apply_schema(raw)
+    print(memory_report(raw, typed).to_string(float_format='{:.1f}x'.format))
+    print(f"\n{len(typed):,} rows kept, {len(rejected):,} rejected")
+    if len(rejected):
+        print(rejected['Rejected_Columns'].value_counts().to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import os
+
+# Export the dashboard and the API server load
+DATA_PATH = os.environ.get('DASHBOARD_DATA', 'education_career_success.csv')
+
+# Directory written by `python shared_data.py publish`. When set, the app
+# attaches to it read-only instead of loading the export in every process.
+SHARED_DATA_DIR = os.environ.get('DASHBOARD_SHARED_DATA')
+
+# Out-of-core mode: stream the export in chunks and keep only its aggregates
+OUT_OF_CORE = os.environ.get('DASHBOARD_OUT_OF_CORE') == '1'
+CHUNK_ROWS = int(os.environ.get('DASHBOARD_CHUNK_ROWS', 100_000))
+
+# Store of results written by `python precompute.py`, one file per dataset version
+PRECOMPUTED_DIR = os.environ.get('DASHBOARD_PRECOMPUTED', os.path.join('.cache', 'precomputed'))
+
+# Engine behind the KPI, donut and Tab 2 queries: 'cube' (pre-aggregated
+# counts), 'pandas', 'sqlite' (indexed file per dataset version, kept in
+# BACKEND_DIR) or 'duckdb' (optional package)
+QUERY_BACKEND = os.environ.get('DASHBOARD_QUERY_BACKEND', 'cube')
+BACKEND_DIR = os.environ.get('DASHBOARD_BACKEND_DIR', os.path.join('.cache', 'backends'))
+
+# Render cache for finished Plotly figures, shared by all sessions
+FIGURE_CACHE_ENTRIES = int(os.environ.get('DASHBOARD_FIGURE_CACHE_ENTRIES', 512))
+FIGURE_CACHE_MB = float(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', 64))
+
+# Show hit/miss counters of the in-process caches in the sidebar
+SHOW_CACHE_STATS = os.environ.get('DASHBOARD_CACHE_STATS') == '1'
+
+# Response cache of api_server.py, keyed by dataset version and filters
+API_CACHE_ENTRIES = int(os.environ.get('DASHBOARD_API_CACHE_ENTRIES', 4096))
+
+# Per-rerun stage timings: sidebar panel and an optional JSON-lines log
+PROFILE = os.environ.get('DASHBOARD_PROFILE') == '1'
+PROFILE_LOG = os.environ.get('DASHBOARD_PROFILE_LOG')
+PROFILE_WINDOW = int(os.environ.get('DASHBOARD_PROFILE_WINDOW', 1000))
+
+# Cores used to build the aggregate cube from large frames: 'thread' or
+# 'process' pools, rows split in ranges or by job level ('rows' / 'level')
+AGGREGATION_WORKERS = int(os.environ.get('DASHBOARD_AGGREGATION_WORKERS', 1))
+AGGREGATION_EXECUTOR = os.environ.get('DASHBOARD_AGGREGATION_EXECUTOR', 'thread')
+AGGREGATION_PARTITION = os.environ.get('DASHBOARD_AGGREGATION_PARTITION', 'rows')
+
+# Smaller chart payloads: KDE grid sized to the bandwidth, LTTB for line
+# traces longer than LINE_MAX_POINTS, numbers rounded to PAYLOAD_DECIMALS
+# significant digits and sent as float32
+PAYLOAD_REDUCTION = os.environ.get('DASHBOARD_PAYLOAD_REDUCTION', '1') == '1'
+LINE_MAX_POINTS = int(os.environ.get('DASHBOARD_LINE_MAX_POINTS', 500))
+PAYLOAD_DECIMALS = int(os.environ.get('DASHBOARD_PAYLOAD_DECIMALS', 4))
+
+# Render only the selected view (radio navigation) instead of all st.tabs
+LAZY_TABS = os.environ.get('DASHBOARD_LAZY_TABS') == '1'
+
+# Relative error bound of the Starting_Salary percentile sketch
+SALARY_RELATIVE_ERROR = float(os.environ.get('DASHBOARD_SALARY_RELATIVE_ERROR', 0.005))
+
+# Chart notes generated from the data (insights.py) instead of the fixed
+# per-level text of notes.json
+INSIGHT_NOTES = os.environ.get('DASHBOARD_INSIGHT_NOTES', '1') == '1'
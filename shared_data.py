@@ -0,0 +1,119 @@
+import argparse
+import os
+import time
+
+from cube import OlapCube
+from data_cache import load_cache, new_version_dir, read_meta, switch_version, write_columns
+from filter_index import FilterIndex
+from ingest import IncrementalDataset
+
+# tmpfs, so the published columns live in RAM exactly once for the whole host
+DEFAULT_SHARED_DIR = '/dev/shm/employee-dashboard'
+
+# Never read by the dashboard; as a string column it could not be mapped zero-copy
+SKIPPED_COLUMNS = ['Student_ID']
+
+
+def publish(dataset, target=DEFAULT_SHARED_DIR):
+    """Write the dataset's columns, filter bitmaps and cube for attaching processes.
+
+    Files go to a new version directory and meta.json is switched last, so
+    readers only ever see a complete version. Returns the version published.
+    """
+    version = dataset.digest[:16]
+    meta = read_meta(target)
+    # Copies published before the cube kept first rows are written again
+    if meta and meta['version'] == version and os.path.exists(
+            os.path.join(target, version, 'cube', 'first_row.npy')):
+        return version
+
+    frame, index, cube = dataset.snapshot()
+    os.makedirs(target, exist_ok=True)
+    version_dir = new_version_dir(target, version)
+    columns = write_columns(frame, version_dir)
+    index.save(os.path.join(version_dir, 'index'))
+    cube.save(os.path.join(version_dir, 'cube'))
+    switch_version(target, {
+        'source': os.path.abspath(dataset.source),
+        'version': version,
+        'dataset_version': dataset.version,
+        'columns': columns,
+    })
+    return version
+
+
+class SharedDataset:
+    """Read-only view of a dataset published by ``publish``.
+
+    Every array (columns, bitmaps, cube) is a read-only memory map of the
+    published files, so all app processes share the same physical pages and
+    their own memory does not grow with the dataset. Exposes the same
+    ``refresh()`` / ``version`` interface as IncrementalDataset.
+    """
+
+    def __init__(self, target=DEFAULT_SHARED_DIR, skip_columns=SKIPPED_COLUMNS):
+        self.target = target
+        self.skip_columns = skip_columns
+        self.version = None
+        self._meta_mtime = None
+        self._snapshot = None
+        self.refresh()
+
+    def _attach(self, meta):
+        version_dir = os.path.join(self.target, meta['version'])
+        columns = [c['name'] for c in meta['columns'] if c['name'] not in self.skip_columns]
+        frame = load_cache(self.target, meta, columns)
+        index = FilterIndex.load(os.path.join(version_dir, 'index'))
+        cube = OlapCube.load(os.path.join(version_dir, 'cube'))
+        return frame, index, cube
+
+    def refresh(self):
+        meta_path = os.path.join(self.target, 'meta.json')
+        for _ in range(3):
+            try:
+                mtime = os.stat(meta_path).st_mtime_ns
+            except FileNotFoundError:
+                raise FileNotFoundError(
+                    f"No dataset published at {self.target}; run `python shared_data.py publish`"
+                ) from None
+            if mtime == self._meta_mtime:
+                return self._snapshot
+            meta = read_meta(self.target)
+            try:
+                self._snapshot = self._attach(meta)
+            except FileNotFoundError:
+                # The publisher replaced this version while we were attaching
+                continue
+            self._meta_mtime = mtime
+            self.version = meta['dataset_version']
+            return self._snapshot
+        raise RuntimeError(f"Could not attach to a stable version in {self.target}")
+
+    def snapshot(self):
+        return self._snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish the dataset for zero-copy attachment")
+    parser.add_argument('command', choices=['publish'])
+    parser.add_argument('--source', default='education_career_success.csv')
+    parser.add_argument('--target', default=DEFAULT_SHARED_DIR)
+    parser.add_argument('--interval', type=float, default=0,
+                        help="seconds between checks for new rows (0 = publish once)")
+    args = parser.parse_args()
+
+    dataset = IncrementalDataset(args.source)
+    published = None
+    while True:
+        dataset.refresh()
+        version = publish(dataset, args.target)
+        if version != published:
+            print(f"published {len(dataset.frame):,} rows as {version} to {args.target}", flush=True)
+            published = version
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+from cube import OlapCube
+from outcomes import OutcomeCube
+from quantiles import QuantileCube
+from schema import apply_schema
+
+logger = logging.getLogger(__name__)
+
+
+def iter_chunks(path, chunk_rows=100_000):
+    """Validated, schema-typed chunks of a CSV export, read lazily.
+
+    Rejected rows are logged and skipped, exactly as ``read_source`` drops
+    them, so chunk rows line up with the rows of the in-memory frame.
+    """
+    if not path.lower().endswith('.csv'):
+        raise ValueError(f"Streaming needs a CSV export, got {path}")
+    for raw in pd.read_csv(path, encoding='utf-8-sig', chunksize=chunk_rows):
+        chunk, rejected = apply_schema(raw)
+        if len(rejected):
+            logger.warning("%s: rejected %d rows failing validation", path, len(rejected))
+        yield chunk
+
+
+class StreamedCube(OlapCube):
+    """OlapCube accumulated chunk by chunk.
+
+    ``first_row`` counts positions across chunks, so orders of first
+    appearance match the in-memory path's. ``quantiles`` and ``outcomes``
+    are the QuantileCube and OutcomeCube of the same rows.
+    """
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        cube = quantiles = outcomes = None
+        for chunk in chunks:
+            cube = OlapCube(chunk) if cube is None else cube.extended(chunk)
+            quantiles = QuantileCube(chunk) if quantiles is None else quantiles.extended(chunk)
+            outcomes = OutcomeCube(chunk) if outcomes is None else outcomes.extended(chunk)
+        if cube is None:
+            raise ValueError("No valid rows to aggregate")
+
+        streamed = cls.__new__(cls)
+        streamed.labels, streamed.counts, streamed.job_offers = cube.labels, cube.counts, cube.job_offers
+        streamed.first_row = cube.first_row
+        streamed.quantiles = quantiles
+        streamed.outcomes = outcomes
+        return streamed
+
+
+class StreamingDataset:
+    """Out-of-core dataset: only the aggregates of the export are kept.
+
+    The CSV is streamed in ``chunk_rows`` chunks into a StreamedCube, which
+    answers every sidebar selection, so peak memory is bounded by one chunk
+    rather than the file. Exposes ``refresh()`` / ``version`` like the other
+    datasets; the snapshot has no frame or filter index, and a changed
+    export is streamed again in full.
+    """
+
+    def __init__(self, source, chunk_rows=100_000):
+        self.source = source
+        self.chunk_rows = chunk_rows
+        self.version = None
+        self._stat = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        with self._lock:
+            stat = os.stat(self.source)
+            key = (stat.st_size, stat.st_mtime_ns)
+            if key != self._stat:
+                cube = StreamedCube.from_chunks(iter_chunks(self.source, self.chunk_rows))
+                self._snapshot = (None, None, cube)
+                self._stat = key
+                self.version = f'stream-{stat.st_size}-{stat.st_mtime_ns}'
+            return self._snapshot
+
+    def snapshot(self):
+        return self._snapshot
+
+
+def main():
+    from analytics import Analytics
+    from data_cache import read_source
+
+    parser = argparse.ArgumentParser(description="Streamed vs in-memory aggregation of an export")
+    parser.add_argument('source', nargs='?', default='education_career_success.csv')
+    parser.add_argument('--chunk-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    for name, build in [
+        ('in-memory', lambda: OlapCube(read_source(args.source))),
+        ('streamed', lambda: StreamedCube.from_chunks(iter_chunks(args.source, args.chunk_rows))),
+    ]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        cube = build()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        kpis = Analytics((None, None, cube), name).kpis({})
+        print(f"{name:>10}: {elapsed:6.2f} s, peak {peak / 1e6:7.1f} MB, "
+              f"{kpis['total']:,} rows, median age {kpis['median_age']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import functools
+import json
+import os
+import re
+
+from assets import read_text
+
+NOTES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notes.json')
+
+NOTE = """
+<div style="
+        background: linear-gradient(135deg, #f8fafc, #edf2f7);
+        border-left: 6px solid #667eea;
+        padding: 25px;
+        margin-top: 30px;
+        border-radius: 15px;
+        box-shadow: 0 8px 25px rgba(102, 126, 234, 0.1);
+        font-family: 'Inter', sans-serif;
+">
+    <div style="font-size: 20px; font-weight: 700; margin-bottom: 12px; color: #667eea;">
+        📌 {title}
+    </div>
+    <div style="font-size: 15px; color: #4a5568; line-height: 1.6;">
+        {text}
+    </div>
+</div>
+"""
+
+
+def _stat(label, slot, color, size=32, weight=700):
+    return f"""
+    <div>
+        <div style="font-size: 14px; color: {color}; font-weight: 600;">{label}</div>
+        <div style="font-size: {size}px; color: #2d3748; font-weight: {weight};">{slot}</div>
+    </div>"""
+
+
+def _card(color, shadow, *stats):
+    return (f"""<div style="border: 2px solid {color}; border-radius: 15px; padding: 25px; margin: 20px 0; """
+            f"""background: linear-gradient(135deg, #f8fafc, #edf2f7); box-shadow: 0 8px 25px {shadow};">
+    <div style="display: flex; justify-content: space-around; text-align: center; line-height: 1.4;">"""
+            + ''.join(stats) + """
+    </div></div>""")
+
+
+# KPI cards; only the {} slots change between reruns
+KPI_CARDS = {
+    'demographics': _card('#667eea', 'rgba(102, 126, 234, 0.1)',
+                          _stat('Total Records', '{}', '#667eea'),
+                          _stat('Median Age', '{:.1f}', '#667eea'),
+                          _stat('% Female', '{:.1f}%', '#667eea')),
+    'fields': _card('#667eea', 'rgba(102, 126, 234, 0.1)',
+                    _stat('Total Records', '{}', '#667eea'),
+                    _stat('Top 3 Fields', '{}', '#667eea', size=22, weight=600)),
+    'job_offers': _card('#764ba2', 'rgba(118, 75, 162, 0.1)',
+                        _stat('Total Records', '{}', '#764ba2'),
+                        _stat('Median Age', '{:.1f}', '#764ba2'),
+                        _stat('Entrepreneurs (%)', '{:.1f}%', '#764ba2')),
+}
+
+# Notes shown under the charts of each view, by chart option
+VIEW_NOTES = {
+    ('demographics', 'Gender Distribution'): ('gender_density', 'gender_pie'),
+    ('demographics', 'Field of Study'): ('field_of_study',),
+    ('job_offers', None): ('job_level', 'job_offers'),
+}
+
+
+def minify(html):
+    """``html`` without the indentation and line breaks between and inside
+    tags. The browser collapses them anyway; they are only bytes on the
+    websocket."""
+    html = re.sub(r'>\s+<', '><', html.strip())
+    return re.sub(r'\s*\n\s*', ' ', html)
+
+
+class Template:
+    """An HTML fragment minified once, with ``str.format`` slots left open."""
+
+    def __init__(self, source):
+        self.source = minify(source)
+
+    def render(self, *args, **kwargs):
+        return self.source.format(*args, **kwargs)
+
+
+NOTE_TEMPLATE = Template(NOTE)
+KPI_TEMPLATES = {name: Template(source) for name, source in KPI_CARDS.items()}
+
+
+def kpi_card(name, *values):
+    """The ``name`` KPI card with ``values`` in its slots."""
+    return KPI_TEMPLATES[name].render(*values)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_notes(text):
+    return json.loads(text)
+
+
+def load_notes(path=NOTES_PATH):
+    """Chart notes from ``path``, parsed again only when the file changes."""
+    return _parse_notes(read_text(path))
+
+
+@functools.lru_cache(maxsize=1024)
+def _note_fragments(notes_text, view, level, chart_option, generated):
+    notes = _parse_notes(notes_text)
+    generated = dict(generated)
+    fragments = []
+    for kind in VIEW_NOTES[view, chart_option]:
+        spec = notes[kind]
+        lines = generated[kind] if kind in generated else spec['levels'].get(level)
+        text = ''.join(f'- {line}<br>' for line in lines) if lines else spec['missing']
+        fragments.append(NOTE_TEMPLATE.render(title=spec['title'].format(level=level), text=text))
+    return tuple(fragments)
+
+
+def note_fragments(view, level, chart_option=None, insights=None, path=NOTES_PATH):
+    """Rendered note blocks of a view, cached per (level, chart option).
+
+    Keyed by the notes file's contents as well, so edited notes show up
+    without a restart. ``insights`` (``Analytics.insights``) replaces the
+    file's per-level lines with generated ones; titles and the text for an
+    empty note still come from the file.
+    """
+    kinds = VIEW_NOTES[view, chart_option]
+    generated = tuple((kind, insights[kind]) for kind in kinds if insights and insights.get(kind))
+    return _note_fragments(read_text(path), view, level, chart_option, generated)
@@ -0,0 +1,41 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from analytics import Analytics
+from api_server import AnalyticsService
+from cube import OlapCube
+from data_cache import load_dataset
+from filter_index import FilterIndex
+from ingest import IncrementalDataset
+from tests.reference import DATA_PATH
+
+
+@pytest.fixture(scope='session')
+def raw():
+    """The export as the original app read it: plain read_csv, object dtypes."""
+    return pd.read_csv(DATA_PATH)
+
+
+@pytest.fixture(scope='session')
+def frame(tmp_path_factory):
+    return load_dataset(DATA_PATH, str(tmp_path_factory.mktemp('cache')))
+
+
+@pytest.fixture(scope='session')
+def cube(frame):
+    return OlapCube(frame)
+
+
+@pytest.fixture(scope='session')
+def analytics(frame, cube):
+    return Analytics((frame, FilterIndex(frame), cube), 'tests')
+
+
+@pytest.fixture(scope='session')
+def service(tmp_path_factory):
+    """The JSON API over a private copy of the export."""
+    directory = tmp_path_factory.mktemp('api')
+    shutil.copy(DATA_PATH, directory / 'export.csv')
+    return AnalyticsService(IncrementalDataset(str(directory / 'export.csv'), cache_dir=str(directory / 'cache')))
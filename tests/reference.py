@@ -0,0 +1,74 @@
+import os
+import random
+
+import numpy as np
+import pandas as pd
+
+from analytics import normalize_filters
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'education_career_success.csv')
+
+
+def _selections(n, seed=0):
+    # Small, narrow selections are where value_counts ties show up
+    rng = random.Random(seed)
+    selections = [
+        normalize_filters(level='Entry'),
+        normalize_filters(genders=['Other'], level='Executive', statuses=['Yes']),
+    ]
+    for _ in range(n):
+        low, high = sorted(rng.randint(18, 29) for _ in range(2))
+        selections.append(normalize_filters(
+            genders=rng.sample(['Female', 'Male', 'Other'], rng.randint(0, 3)),
+            level=rng.choice(['Entry', 'Mid', 'Senior', 'Executive']),
+            age_range=(low, high),
+            statuses=rng.sample(['Yes', 'No'], rng.randint(1, 2)),
+            age_bounds=(18, 29),
+        ))
+    return selections
+
+
+SELECTIONS = _selections(40)
+
+
+def select(raw, filters):
+    """Rows of the raw CSV frame in a selection, as the original app filtered them."""
+    mask = raw['Current_Job_Level'].eq(filters['level']) & raw['Entrepreneurship'].isin(filters['statuses'])
+    if filters['genders'] is not None:
+        mask &= raw['Gender'].isin(filters['genders'])
+    if filters['age_range'] is not None:
+        mask &= raw['Age'].between(*filters['age_range'])
+    return raw[mask]
+
+
+def entrepreneurship_by_age(raw, filters):
+    """Share of each status within its age, over both statuses."""
+    rows = select(raw, dict(filters, statuses=['Yes', 'No']))
+    counts = rows.groupby(['Age', 'Entrepreneurship']).size().reset_index(name='Count')
+    counts['Percentage'] = counts['Count'] / counts.groupby('Age')['Count'].transform('sum')
+    return counts[counts['Entrepreneurship'].isin(filters['statuses'])].reset_index(drop=True)
+
+
+def job_offers_by_age(raw, filters):
+    return select(raw, filters).groupby(['Age', 'Entrepreneurship'])['Job_Offers'].mean().reset_index()
+
+
+def assert_same_frame(expected, actual):
+    """Same columns and rows; numbers to float precision, labels as strings."""
+    assert list(actual.columns) == list(expected.columns)
+    assert len(actual) == len(expected)
+    for column in expected.columns:
+        if expected[column].dtype.kind in 'iuf':
+            pd.testing.assert_series_equal(actual[column].astype(float), expected[column].astype(float),
+                                           check_names=False, check_index=False)
+        else:
+            assert list(map(str, actual[column])) == list(map(str, expected[column]))
+
+
+def in_memory(frame):
+    """``frame`` with plain arrays instead of np.memmap, for frame comparisons."""
+    def plain(column):
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return pd.Categorical.from_codes(np.array(column.cat.codes), dtype=column.dtype)
+        return np.array(column) if column.dtype.kind in 'biuf' else column
+    return pd.DataFrame({name: plain(frame[name]) for name in frame.columns})
@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from analytics import normalize_filters, to_jsonable
+from api_server import parse_filters
+from tests.reference import SELECTIONS
+
+
+def _get(service, path, query=''):
+    status, body = service.handle(path, query)
+    return status, json.loads(body)
+
+
+def test_parse_filters_applies_sidebar_fallbacks():
+    filters, _ = parse_filters('genders=Male,Female&level=Mid&age_min=20&age_max=24', (18, 29))
+    assert filters == dict(genders=['Male', 'Female'], level='Mid', age_range=(20, 24), statuses=['No', 'Yes'])
+    filters, _ = parse_filters('age_min=22&age_max=22&statuses=', (18, 29))
+    assert filters == normalize_filters(age_range=(22, 22), age_bounds=(18, 29))
+
+
+def test_routes_serve_the_analytics_results(service):
+    analytics = service.analytics()
+    query = 'genders=Female&level=Entry&age_min=20&age_max=25&statuses=Yes'
+    filters, _ = parse_filters(query, analytics.filter_options()['age_bounds'])
+    for path, method in [('/demographics', 'demographics_summary'), ('/job-offers/by-age', 'job_offers_by_age'),
+                         ('/entrepreneurship/by-age', 'entrepreneurship_by_age')]:
+        status, body = _get(service, path, query)
+        assert status == 200
+        assert body['version'] == analytics.version
+        assert body['result'] == json.loads(json.dumps(to_jsonable(getattr(analytics, method)(filters))))
+
+
+def test_unknown_path_and_bad_parameters(service):
+    assert _get(service, '/nope')[0] == 404
+    assert _get(service, '/percentiles', 'column=Job_Offers')[0] == 400
+    assert _get(service, '/health')[1]['status'] == 'ok'
+
+
+@pytest.mark.parametrize('filters', SELECTIONS[:5] + [normalize_filters(level='Mid')])
+def test_density_from_rows_and_from_cube_agree(analytics, filters):
+    x, curves = analytics.density_curves(filters, 'Gender')
+    density = analytics.age_density(filters, 'Gender', points=len(x))
+    np.testing.assert_allclose(density['x'], x)
+    for category, y in curves:
+        if y is None:
+            assert category not in density['curves']
+        else:
+            np.testing.assert_allclose(density['curves'][category], y, rtol=1e-9, atol=1e-300)
+
+
+@pytest.mark.parametrize('query', ['genders=Nobody', 'level=Bogus', 'age_min=90&age_max=95', 'age_min=30&age_max=20'])
+def test_age_density_of_empty_selections(service, query):
+    status, body = _get(service, '/age-density', query)
+    assert status == 200
+    assert body['result']['curves'] == {}
+    if query == 'age_min=30&age_max=20':
+        assert body['result']['x'] == []
+
+
+def test_inverted_age_range_has_no_density(analytics):
+    x, curves = analytics.density_curves(normalize_filters(level='Mid', age_range=(30, 20)), 'Gender')
+    assert len(x) == 0 and curves == []
+
+
+@pytest.mark.parametrize('query', ['fields=Nope', 'levels=Nope,Mid'])
+def test_outcomes_reject_unknown_values(service, query):
+    status, body = _get(service, '/outcomes', query)
+    assert status == 400
+    assert 'Nope' in body['error']
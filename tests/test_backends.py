@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from backends import CubeBackend, DuckDBBackend, PandasBackend, SqliteBackend, open_backend
+from tests.reference import SELECTIONS, assert_same_frame, select
+
+
+@pytest.fixture(scope='module', params=['cube', 'pandas', 'sqlite', 'duckdb'])
+def backend(request, frame, cube, tmp_path_factory):
+    if request.param == 'cube':
+        return CubeBackend(cube)
+    if request.param == 'pandas':
+        return PandasBackend(frame)
+    if request.param == 'sqlite':
+        return SqliteBackend.build(frame, str(tmp_path_factory.mktemp('backends') / 'tests.sqlite'))
+    pytest.importorskip('duckdb')
+    return DuckDBBackend(frame)
+
+
+@pytest.mark.parametrize('filters', SELECTIONS)
+def test_backend_matches_cube(backend, cube, raw, filters):
+    reference = CubeBackend(cube)
+    assert backend.kpis(filters) == pytest.approx(reference.kpis(filters), nan_ok=True)
+    counts = backend.value_counts(filters, 'Field_of_Study')
+    assert list(map(str, counts.index)) == list(select(raw, filters)['Field_of_Study'].value_counts().index)
+    assert list(counts) == list(reference.value_counts(filters, 'Field_of_Study'))
+    assert_same_frame(reference.entrepreneurship_by_age(filters), backend.entrepreneurship_by_age(filters))
+    assert_same_frame(reference.job_offers_by_age(filters), backend.job_offers_by_age(filters))
+
+
+def test_open_backend_removes_other_versions(frame, cube, tmp_path):
+    stale = tmp_path / 'old-version.sqlite'
+    stale.write_bytes(b'')
+    open_backend('sqlite', (frame, None, cube), 'tests-sqlite', directory=str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ['tests-sqlite.sqlite']
+
+
+def test_open_backend_rejects_unknown_name(frame, cube):
+    with pytest.raises(ValueError, match='unknown query backend'):
+        open_backend('mysql', (frame, None, cube), 'tests')
@@ -0,0 +1,95 @@
+import numpy as np
+
+from analytics import Analytics
+from caching import CacheRegistry, LRUCache, approx_size, registry
+from ingest import IncrementalDataset
+from tests.reference import DATA_PATH, SELECTIONS
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    stats = cache.stats()
+    assert (stats['entries'], stats['evictions'], stats['hits'], stats['misses']) == (2, 1, 3, 1)
+
+
+def test_lru_evicts_by_bytes_but_keeps_the_newest():
+    cache = LRUCache(maxsize=10, max_bytes=100)
+    cache.put('a', 'x', nbytes=60)
+    cache.put('b', 'y', nbytes=60)
+    assert list(cache._data) == ['b'] and cache.nbytes == 60
+    # One entry over the budget is still kept: it is the one just built
+    cache.put('c', 'z', nbytes=500)
+    assert list(cache._data) == ['c'] and cache.nbytes == 500
+
+
+def test_invalidate_drops_matching_keys_and_their_bytes():
+    cache = LRUCache()
+    for version in ('v1', 'v2'):
+        for i in range(3):
+            cache.put((version, i), i, nbytes=10)
+    assert cache.invalidate(lambda key: key[0] == 'v1') == 3
+    assert sorted(cache._data) == [('v2', 0), ('v2', 1), ('v2', 2)]
+    assert cache.nbytes == 30 and cache.stats()['invalidations'] == 3
+
+
+def test_memory_bytes_estimates_unsized_values():
+    cache = LRUCache()
+    cache.put('sized', b'', nbytes=123)
+    cache.put('array', np.zeros(100))
+    assert cache.memory_bytes() == 123 + 800
+    assert approx_size({'a': np.zeros(10), 'b': [b'xyz']}) == 1 + 80 + 1 + 3
+
+
+def test_track_version_drops_other_versions():
+    caches = CacheRegistry()
+    first = caches.register('first', LRUCache(), lambda key: key[0])
+    second = caches.register('second', LRUCache(), lambda key: key)
+    first.put(('v1', 'a'), 1)
+    second.put('v1', 2)
+
+    # The first version seen drops nothing
+    assert caches.track_version('v1') == 0
+    assert caches.track_version('v1') == 0
+    first.put(('v2', 'a'), 3)
+    assert caches.track_version('v2') == 2
+    assert list(first._data) == [('v2', 'a')] and len(second) == 0
+
+    stats = caches.stats()
+    assert (stats['dataset_version'], stats['version_changes']) == ('v2', 1)
+    assert stats['caches']['first']['invalidations'] == 1
+    assert stats['caches']['second']['invalidations'] == 1
+
+
+def test_new_rows_drop_the_previous_versions_results(tmp_path, raw):
+    with open(DATA_PATH, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    path = tmp_path / 'export.csv'
+    path.write_bytes(b''.join(lines[:3001]))
+    dataset = IncrementalDataset(str(path), cache_dir=str(tmp_path / 'cache'))
+    filters = SELECTIONS[0]
+    everything = dict(genders=None, level=None, age_range=None, statuses=None)
+
+    before = Analytics.from_dataset(dataset, backend='cube')
+    before.density_curves(filters, 'Gender')
+    before.by_level(filters)
+    assert before.kpis(everything)['total'] == 3000
+    changes = registry.version_changes
+
+    with open(path, 'ab') as f:
+        f.write(b''.join(lines[3001:]))
+    after = Analytics.from_dataset(dataset, backend='cube')
+    assert after.version != before.version
+    assert registry.version_changes == changes + 1
+    stats = registry.stats()['caches']
+    assert stats['density']['entries'] == 0 and stats['levels']['entries'] == 0
+
+    # Nothing computed for the 3000 rows is served for the full file
+    assert after.kpis(everything)['total'] == len(raw)
+    x, curves = after.density_curves(filters, 'Gender')
+    assert len(x) and registry.stats()['caches']['density']['entries'] == 1
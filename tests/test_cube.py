@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pytest
+
+from cube import OlapCube
+from tests.reference import SELECTIONS, assert_same_frame, entrepreneurship_by_age, job_offers_by_age, select
+
+# Selections with an empty axis: unknown values or ages outside the data
+EMPTY = [
+    dict(genders=None, level='Bogus', age_range=None, statuses=['No', 'Yes']),
+    dict(genders=['Nobody'], level='Mid', age_range=None, statuses=['No', 'Yes']),
+    dict(genders=None, level='Entry', age_range=(90, 95), statuses=['No', 'Yes']),
+    dict(genders=None, level='Entry', age_range=None, statuses=['Maybe']),
+]
+
+
+@pytest.mark.parametrize('filters', SELECTIONS)
+def test_kpis_match_pandas(analytics, raw, filters):
+    rows = select(raw, filters)
+    kpis = analytics.kpis(filters)
+    assert kpis['total'] == len(rows)
+    if len(rows):
+        assert kpis['median_age'] == rows['Age'].median()
+        assert kpis['pct_female'] == pytest.approx((rows['Gender'] == 'Female').mean() * 100)
+        assert kpis['pct_entrepreneurs'] == pytest.approx((rows['Entrepreneurship'] == 'Yes').mean() * 100)
+    assert kpis['top_fields'] == rows['Field_of_Study'].value_counts().head(3).index.tolist()
+
+
+@pytest.mark.parametrize('filters', SELECTIONS)
+@pytest.mark.parametrize('column', ['Gender', 'Field_of_Study'])
+def test_category_counts_order_ties_by_first_appearance(analytics, raw, filters, column):
+    expected = select(raw, filters)[column].value_counts()
+    counts = analytics.category_counts(filters, column)
+    assert list(map(str, counts.index)) == list(expected.index)
+    assert list(counts) == list(expected)
+
+
+def test_selections_include_ties(raw):
+    # Otherwise the ordering test above would not exercise tie breaking
+    assert any(select(raw, filters)['Field_of_Study'].value_counts().duplicated().any() for filters in SELECTIONS)
+
+
+@pytest.mark.parametrize('filters', SELECTIONS)
+def test_tab2_series_match_pandas(analytics, raw, filters):
+    assert_same_frame(entrepreneurship_by_age(raw, filters), analytics.entrepreneurship_by_age(filters))
+    assert_same_frame(job_offers_by_age(raw, filters), analytics.job_offers_by_age(filters))
+
+
+@pytest.mark.parametrize('filters', EMPTY)
+def test_empty_selection_has_no_rows(cube, analytics, filters):
+    assert cube.kpis(**filters)['total'] == 0
+    assert cube.value_counts('Field_of_Study', **filters).empty
+    assert cube.first_appearance('Gender', **filters) == []
+    assert analytics.kpis(filters)['total'] == 0
+    assert analytics.category_counts(filters, 'Gender').empty
+    if filters['level'] != 'Bogus':
+        batch = analytics.by_level(filters)
+        assert not any(result['kpis']['total'] for result in batch.values())
+
+
+@pytest.mark.parametrize('path, query', [
+    ('/demographics', 'level=Bogus'),
+    ('/demographics', 'genders=Nobody'),
+    ('/demographics', 'age_min=90&age_max=95'),
+    ('/levels', 'genders=Nobody'),
+])
+def test_api_answers_empty_selections(service, path, query):
+    status, body = service.handle(path, query)
+    assert status == 200
+    result = json.loads(body)['result']
+    totals = [row['Total'] for row in result] if path == '/levels' else [result['total']]
+    assert totals and not any(totals)
+
+
+def test_extended_cube_equals_one_pass(frame, cube):
+    extended = OlapCube(frame.iloc[:1234]).extended(frame.iloc[1234:])
+    for name in ('counts', 'job_offers', 'first_row'):
+        np.testing.assert_array_equal(getattr(extended, name), getattr(cube, name))
+
+
+def test_save_and_load(cube, tmp_path):
+    cube.save(str(tmp_path))
+    loaded = OlapCube.load(str(tmp_path))
+    for filters in SELECTIONS:
+        assert loaded.kpis(**filters) == cube.kpis(**filters)
+
+
+def test_extending_by_no_rows_keeps_the_cube(frame, cube):
+    extended = cube.extended(frame.iloc[:0])
+    for name in ('counts', 'job_offers', 'first_row'):
+        np.testing.assert_array_equal(getattr(extended, name), getattr(cube, name))
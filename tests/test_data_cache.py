@@ -0,0 +1,65 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+from data_cache import cache_path_for, load_dataset, read_meta, read_source
+from tests.reference import DATA_PATH, in_memory
+
+
+def _mapped(array):
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def _copy(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    shutil.copy(DATA_PATH, path)
+    return path, str(tmp_path / 'cache')
+
+
+def test_cached_frame_equals_parsed_frame(tmp_path):
+    path, cache_dir = _copy(tmp_path)
+    expected = read_source(path)
+    for _ in range(2):
+        pd.testing.assert_frame_equal(in_memory(load_dataset(path, cache_dir)), expected)
+
+
+def test_warm_load_maps_columns_without_parsing(tmp_path, monkeypatch):
+    path, cache_dir = _copy(tmp_path)
+    load_dataset(path, cache_dir)
+    monkeypatch.setattr(data_cache, 'read_source', None)
+    frame = load_dataset(path, cache_dir, columns=['Age', 'Gender'])
+    assert list(frame.columns) == ['Age', 'Gender']
+    assert _mapped(frame['Age'].to_numpy())
+
+
+def test_touched_file_keeps_version(tmp_path, monkeypatch):
+    path, cache_dir = _copy(tmp_path)
+    load_dataset(path, cache_dir)
+    version = read_meta(cache_path_for(path, cache_dir))['version']
+    os.utime(path, ns=(0, 0))
+    monkeypatch.setattr(data_cache, 'read_source', None)
+    load_dataset(path, cache_dir)
+    meta = read_meta(cache_path_for(path, cache_dir))
+    assert (meta['version'], meta['mtime_ns']) == (version, 0)
+
+
+def test_changed_file_replaces_version(tmp_path):
+    path, cache_dir = _copy(tmp_path)
+    load_dataset(path, cache_dir)
+    cache_path = cache_path_for(path, cache_dir)
+    old = read_meta(cache_path)['version']
+    with open(path) as f:
+        lines = f.readlines()
+    with open(path, 'w') as f:
+        f.writelines(lines[:101])
+    assert len(load_dataset(path, cache_dir)) == 100
+    new = read_meta(cache_path)['version']
+    assert new != old
+    assert sorted(os.listdir(cache_path)) == sorted(['meta.json', new])
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from density import age_density, cached_age_density
+from tests.reference import SELECTIONS, select
+
+stats = pytest.importorskip('scipy.stats')
+
+
+@pytest.mark.parametrize('filters', SELECTIONS[:10])
+@pytest.mark.parametrize('group_col', ['Gender', 'Entrepreneurship'])
+def test_curves_match_scipy(raw, filters, group_col):
+    rows = select(raw, filters)
+    x, curves = age_density(rows, group_col, (18, 29))
+    assert [category for category, _ in curves] == list(rows[group_col].dropna().unique())
+    for category, y in curves:
+        ages = rows.loc[rows[group_col] == category, 'Age'].to_numpy(dtype=float)
+        if len(ages) < 2 or ages.std() == 0:
+            assert y is None
+        else:
+            np.testing.assert_allclose(y, stats.gaussian_kde(ages)(x), rtol=1e-9, atol=1e-300)
+
+
+def test_groups_without_spread_have_no_curve():
+    rows = pd.DataFrame({'Age': [20, 21, 22, 25, 25], 'Gender': ['Female', 'Female', 'Female', 'Male', 'Male']})
+    _, curves = age_density(rows, 'Gender', (18, 29))
+    assert curves[0][1] is not None
+    assert curves[1] == ('Male', None)
+
+
+def test_cached_curves_are_reused(raw):
+    first = cached_age_density(('tests-density', 0), raw, 'Gender', [18, 29])
+    assert cached_age_density(('tests-density', 0), raw.iloc[:0], 'Gender', (18, 29)) is first
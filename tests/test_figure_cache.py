@@ -0,0 +1,46 @@
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+
+from figure_cache import FigureCache, FrozenFigure
+from payload import figure_bytes
+
+
+def _figure(n=2000):
+    x = np.linspace(18, 29, n)
+    return go.Figure(go.Scatter(x=x, y=np.sin(x), mode='lines'))
+
+
+def test_figure_is_built_once_per_key():
+    cache, builds = FigureCache(reduce=False), []
+
+    def build():
+        builds.append(1)
+        return _figure()
+
+    first = cache.get_or_build(('density', ('v1', 'Entry')), build)
+    second = cache.get_or_build(('density', ('v1', 'Entry')), build)
+    assert isinstance(first, FrozenFigure) and second is first
+    assert len(builds) == 1
+    assert first.to_dict() == _figure().to_dict()
+    assert json.loads(first.to_json())['data'][0]['type'] == 'scatter'
+    assert cache.stats()['hits'] == 1
+
+
+def test_byte_cap_evicts_least_recently_used():
+    size = figure_bytes(_figure().to_dict())
+    cache = FigureCache(maxsize=10, max_bytes=int(2.5 * size), reduce=False)
+    for level in ('Entry', 'Mid', 'Senior'):
+        cache.get_or_build(('density', level), _figure)
+    assert len(cache) == 2
+    assert cache.get(('density', 'Entry')) is None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_reduction_is_tallied():
+    cache = FigureCache(reduce=True)
+    figure = cache.get_or_build(('density', 'Entry'), _figure)
+    stats = cache.stats()
+    assert stats['payload_bytes_before'] == figure_bytes(_figure().to_dict())
+    assert stats['payload_bytes_after'] == figure_bytes(figure.to_dict()) < stats['payload_bytes_before']
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from filter_index import FilterIndex, filter_key
+from tests.reference import SELECTIONS, select
+
+
+@pytest.fixture(scope='module')
+def index(frame):
+    return FilterIndex(frame)
+
+
+@pytest.mark.parametrize('filters', SELECTIONS)
+def test_rows_match_pandas(index, raw, filters):
+    np.testing.assert_array_equal(index.rows(**filters), select(raw, filters).index.to_numpy())
+
+
+def test_unknown_values_select_nothing(index):
+    assert len(index.rows(level='Bogus')) == 0
+    assert len(index.rows(genders=['Nobody'])) == 0
+    assert len(index.rows(age_range=(90, 95))) == 0
+
+
+@pytest.mark.parametrize('split', [2000, 2003])
+def test_extended_equals_one_pass(frame, index, split):
+    # 2003 leaves a partly filled last byte to append into
+    extended = FilterIndex(frame.iloc[:split]).extended(frame.iloc[split:])
+    for filters in SELECTIONS:
+        np.testing.assert_array_equal(extended.mask(**filters), index.mask(**filters))
+
+
+def test_save_and_load(index, tmp_path):
+    index.save(str(tmp_path))
+    loaded = FilterIndex.load(str(tmp_path))
+    for filters in SELECTIONS:
+        np.testing.assert_array_equal(loaded.mask(**filters), index.mask(**filters))
+
+
+def test_filter_key_ignores_order():
+    key = filter_key(['Male', 'Female'], 'Mid', (20, 25), ['Yes', 'No'])
+    assert key == filter_key(['Female', 'Male'], 'Mid', [20, 25], ['No', 'Yes'])
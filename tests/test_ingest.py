@@ -0,0 +1,105 @@
+import pytest
+
+import ingest
+from ingest import IncrementalDataset
+from tests.reference import DATA_PATH
+
+
+@pytest.fixture
+def lines():
+    with open(DATA_PATH, 'rb') as f:
+        return f.read().splitlines(keepends=True)
+
+
+def _write(path, lines, mode='wb'):
+    with open(path, mode) as f:
+        f.write(b''.join(lines))
+
+
+def _assert_rows(dataset, raw):
+    frame = dataset.frame
+    assert list(frame['Student_ID']) == list(raw['Student_ID'])
+    assert int(dataset.snapshot()[2].counts.sum()) == len(raw)
+
+
+def test_refresh_appends_new_lines_once(tmp_path, lines, raw):
+    path = str(tmp_path / 'export.csv')
+    _write(path, lines[:3001])
+    dataset = IncrementalDataset(path, cache_dir=str(tmp_path / 'cache'))
+
+    # A half-written line is left for the next refresh
+    half = lines[4001][:10]
+    _write(path, lines[3001:4001] + [half], mode='ab')
+    dataset.refresh()
+    assert len(dataset.frame) == 4000
+    _write(path, [lines[4001][10:]] + lines[4002:], mode='ab')
+    dataset.refresh()
+    dataset.refresh()
+
+    assert dataset.full_reloads == 1
+    assert dataset.appended_rows == len(raw) - 3000
+    _assert_rows(dataset, raw)
+
+
+def test_rewrite_triggers_full_reload(tmp_path, lines, raw):
+    path = str(tmp_path / 'export.csv')
+    _write(path, lines[:1] + lines[2001:])
+    dataset = IncrementalDataset(path, cache_dir=str(tmp_path / 'cache'))
+    _write(path, lines)
+    dataset.refresh()
+    assert dataset.full_reloads == 2
+    _assert_rows(dataset, raw)
+
+
+def test_rows_written_during_reload_are_not_appended_twice(tmp_path, lines, raw, monkeypatch):
+    path = str(tmp_path / 'export.csv')
+    _write(path, lines[:3001])
+    load_dataset = ingest.load_dataset
+
+    def load_while_growing(source, cache_dir):
+        # The exporter appends between reload's stat and the parse
+        _write(path, lines[3001:], mode='ab')
+        monkeypatch.setattr(ingest, 'load_dataset', load_dataset)
+        return load_dataset(source, cache_dir)
+
+    monkeypatch.setattr(ingest, 'load_dataset', load_while_growing)
+    dataset = IncrementalDataset(path, cache_dir=str(tmp_path / 'cache'))
+    dataset.refresh()
+    _assert_rows(dataset, raw)
+    assert dataset.offset == sum(len(line) for line in lines)
+
+
+def test_appended_rows_follow_the_file_header(tmp_path, raw):
+    # An export with Student_ID moved to the last column
+    path = str(tmp_path / 'export.csv')
+    columns = list(raw.columns[1:]) + ['Student_ID']
+    raw[columns].iloc[:3000].to_csv(path, index=False)
+    dataset = IncrementalDataset(path, cache_dir=str(tmp_path / 'cache'))
+    raw[columns].iloc[3000:].to_csv(path, mode='a', header=False, index=False)
+    dataset.refresh()
+
+    assert dataset.full_reloads == 1
+    assert dataset.rejected_rows == 0
+    _assert_rows(dataset, raw)
+    assert list(dataset.frame['Age']) == list(raw['Age'])
+
+
+def test_rejected_appended_lines_are_skipped(tmp_path, lines, raw):
+    path = str(tmp_path / 'export.csv')
+    _write(path, lines[:3001])
+    dataset = IncrementalDataset(path, cache_dir=str(tmp_path / 'cache'))
+    version = dataset.version
+
+    # Age 250 fails the schema, so the appended batch has no rows
+    fields = lines[3001].decode().split(',')
+    fields[1] = '250'
+    _write(path, [','.join(fields).encode()], mode='ab')
+    frame, _, _ = dataset.refresh()
+    assert len(frame) == 3000
+    assert dataset.rejected_rows == 1
+    assert dataset.version != version
+
+    _write(path, lines[3002:], mode='ab')
+    dataset.refresh()
+    assert dataset.full_reloads == 1
+    assert list(dataset.frame['Student_ID']) == list(raw['Student_ID'].drop(3000))
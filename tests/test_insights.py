@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from insights import STATUS_NAMES, histogram_quantiles, level_insights
+from tests.reference import SELECTIONS, select
+
+
+def test_histogram_quantiles_match_numpy():
+    rng = np.random.default_rng(0)
+    values = np.arange(18, 30)
+    counts = rng.integers(0, 5, size=(6, len(values)))
+    counts[0] = 0
+    counts[1] = 0
+    counts[1, 3] = 1
+    for q in (0.0, 0.25, 0.5, 0.75, 1.0):
+        got = histogram_quantiles(values, counts, q)
+        assert np.isnan(got[0])
+        expected = [np.quantile(np.repeat(values, row), q) for row in counts[1:]]
+        np.testing.assert_allclose(got[1:], expected)
+
+
+def _expected(cube, raw, filters):
+    """The lines level_insights should give for one level, from pandas."""
+    kept = select(raw, filters)
+    if kept.empty:
+        return None
+    everyone = select(raw, dict(filters, statuses=['Yes', 'No']))
+    gender_density = []
+    for gender in cube.labels['Gender']:
+        ages = kept.loc[kept['Gender'] == gender, 'Age']
+        if len(ages):
+            mode = ages.value_counts().sort_index().idxmax()
+            gender_density.append(f"{gender}: most common age {mode:.0f}, "
+                                  f"middle half aged {ages.quantile(0.25):.0f}–{ages.quantile(0.75):.0f}.")
+    fields = kept['Field_of_Study'].value_counts().reindex(cube.labels['Field_of_Study'], fill_value=0)
+    top = fields.iloc[np.argsort(-fields.to_numpy(), kind='stable')].head(3)
+    top_line = "Top fields: " + ', '.join(
+        f"{field} ({count / len(kept) * 100:.1f}%)" for field, count in top.items() if count) + "."
+    share = (everyone['Entrepreneurship'] == 'Yes').mean() * 100
+    offers = everyone.groupby('Entrepreneurship')['Job_Offers'].mean()
+    averages = [f"{STATUS_NAMES[status]} {offers[status]:.2f}" for status in cube.labels['Entrepreneurship']
+                if status in filters['statuses'] and status in offers.index]
+    return {
+        'gender_density': tuple(gender_density),
+        'field_of_study': top_line,
+        'job_level': f"{share:.1f}% are entrepreneurs at this level.",
+        'job_offers': "Average job offers: " + ', '.join(averages) + ".",
+    }
+
+
+@pytest.mark.parametrize('filters', SELECTIONS[:12])
+def test_level_insights_match_pandas(cube, raw, filters):
+    results = level_insights(cube, filters['genders'], filters['age_range'], filters['statuses'])
+    assert list(results) == list(cube.labels['Current_Job_Level'])
+    for level, notes in results.items():
+        expected = _expected(cube, raw, dict(filters, level=level))
+        if expected is None:
+            assert notes is None
+            continue
+        assert notes['gender_density'] == expected['gender_density']
+        assert notes['field_of_study'][0] == expected['field_of_study']
+        assert notes['job_level'][0] == expected['job_level']
+        assert notes['job_offers'][0] == expected['job_offers']
+        assert len(notes['gender_pie']) == len(notes['gender_density'])
+
+
+def test_insights_are_batched_per_selection(analytics):
+    filters = SELECTIONS[0]
+    every_level = analytics.insights(dict(filters, level=None))
+    assert analytics.insights(filters) is every_level[filters['level']]
+    assert analytics.insights(dict(filters, genders=['Nobody'])) is None
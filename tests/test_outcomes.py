@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from outcomes import OUTCOME_COLUMNS, OUTCOME_DIMENSIONS, OutcomeCube
+
+SELECTIONS = [
+    dict(),
+    dict(genders=['Female']),
+    dict(fields=['Law', 'Medicine'], levels=['Mid', 'Senior']),
+    dict(fields=['Arts'], levels=['Executive'], genders=['Other']),
+]
+
+
+@pytest.fixture(scope='module')
+def outcome_cube(frame):
+    return OutcomeCube(frame)
+
+
+def _rows(raw, fields=None, levels=None, genders=None):
+    mask = np.ones(len(raw), dtype=bool)
+    for column, values in (('Field_of_Study', fields), ('Current_Job_Level', levels), ('Gender', genders)):
+        if values is not None:
+            mask &= raw[column].isin(values)
+    return raw[mask]
+
+
+@pytest.mark.parametrize('selection', SELECTIONS)
+@pytest.mark.parametrize('by', OUTCOME_DIMENSIONS)
+@pytest.mark.parametrize('column', ['Starting_Salary', 'Career_Satisfaction', 'SAT_Score'])
+def test_summary_matches_pandas(outcome_cube, raw, selection, by, column):
+    rows = _rows(raw, **selection)
+    summary = outcome_cube.summary(column, by, **selection)
+    # Groups come in the cube's label order (job levels by seniority)
+    groups = [(label, rows.loc[rows[by] == label, column]) for label in outcome_cube.labels[by]]
+    groups = [(label, values) for label, values in groups if len(values)]
+    assert list(summary[by]) == [label for label, _ in groups]
+    tolerance = outcome_cube.relative_error(column) + 1e-12
+    for record, (_, values) in zip(summary.to_dict('records'), groups):
+        assert record['Count'] == len(values)
+        assert record['Mean'] == pytest.approx(values.mean(), rel=1e-12)
+        assert record['Std'] == pytest.approx(values.std(), rel=1e-9, nan_ok=True)
+        q1, median, q3 = values.quantile([0.25, 0.5, 0.75])
+        for name, expected in (('Min', values.min()), ('Q1', q1), ('Median', median), ('Q3', q3),
+                               ('Max', values.max())):
+            assert record[name] == pytest.approx(expected, rel=tolerance), name
+        if not tolerance > 1e-9:
+            inside = values[values.between(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))]
+            assert (record['Lower Fence'], record['Upper Fence']) == (inside.min(), inside.max())
+            assert record['Outliers'] == len(values) - len(inside)
+
+
+@pytest.mark.parametrize('selection', SELECTIONS)
+def test_correlation_matches_pandas(outcome_cube, raw, selection):
+    expected = _rows(raw, **selection)[list(OUTCOME_COLUMNS)].corr()
+    actual = outcome_cube.correlation(**selection)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize('selection', SELECTIONS)
+def test_histograms_count_every_row(outcome_cube, raw, selection):
+    rows = _rows(raw, **selection)
+    values, counts = outcome_cube.histogram('Years_to_Promotion', **selection)
+    expected = rows['Years_to_Promotion'].value_counts()
+    assert dict(zip(values[counts > 0], counts[counts > 0])) == dict(expected)
+    binned = outcome_cube.binned('Starting_Salary', **selection)
+    assert binned['Count'].sum() == len(rows)
+    assert (binned['Low'] < binned['High']).all()
+
+
+def test_empty_selection_has_no_groups(outcome_cube):
+    assert outcome_cube.summary('Starting_Salary', 'Gender', genders=['Nobody']).empty
+    assert outcome_cube.binned('Starting_Salary', genders=['Nobody']).empty
+    assert outcome_cube.correlation(genders=['Nobody']).isna().all().all()
+
+
+def test_merged_equals_one_pass(frame, outcome_cube):
+    # Split where the halves see different categories and value ranges
+    order = np.argsort(frame['Starting_Salary'].to_numpy(), kind='stable')
+    low, high = frame.iloc[order[:2000]], frame.iloc[order[2000:]]
+    plain = {dim: low[dim].astype(str) for dim in OUTCOME_DIMENSIONS}
+    merged = OutcomeCube(low.assign(**plain)).extended(high)
+
+    for selection in SELECTIONS:
+        for by in OUTCOME_DIMENSIONS:
+            # Labels first seen in the second half come last in the merged cube
+            actual, expected = (cube.summary('Starting_Salary', by, **selection).sort_values(by, ignore_index=True)
+                                for cube in (merged, outcome_cube))
+            pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-12)
+        pd.testing.assert_frame_equal(merged.correlation(**selection), outcome_cube.correlation(**selection),
+                                      check_exact=False, rtol=1e-12)
+        for column in OUTCOME_COLUMNS:
+            expected_values, expected = outcome_cube.histogram(column, **selection)
+            values, counts = merged.histogram(column, **selection)
+            assert dict(zip(values[counts > 0], counts[counts > 0])) == \
+                dict(zip(expected_values[expected > 0], expected[expected > 0]))
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import parallel
+from cube import CUBE_DIMENSIONS, _labels_and_codes
+from parallel import accumulate, accumulate_rows, worker_count
+
+
+@pytest.fixture(scope='module')
+def inputs(frame):
+    labels, codes = zip(*(_labels_and_codes(frame[dim]) for dim in CUBE_DIMENSIONS))
+    return list(codes), tuple(len(values) for values in labels), frame['Job_Offers'].to_numpy()
+
+
+def test_worker_count_is_capped_by_rows():
+    assert worker_count(10, 8) == 1
+    assert worker_count(3 * parallel.MIN_ROWS_PER_WORKER, 8) == 3
+    assert worker_count(10 * parallel.MIN_ROWS_PER_WORKER, 4) == 4
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+@pytest.mark.parametrize('partition', ['rows', 'level'])
+@pytest.mark.parametrize('workers', [2, 3])
+def test_partitioned_sums_equal_serial(inputs, monkeypatch, executor, partition, workers):
+    codes, shape, weights = inputs
+    # Small enough that the 5,000 test rows are split across the workers
+    monkeypatch.setattr(parallel, 'MIN_ROWS_PER_WORKER', 100)
+    axis = CUBE_DIMENSIONS.index('Current_Job_Level') if partition == 'level' else None
+    counts, sums = accumulate(codes, shape, weights, workers, executor, partition_axis=axis)
+    serial_counts, serial_sums = accumulate_rows(codes, shape, weights)
+    np.testing.assert_array_equal(counts, serial_counts)
+    np.testing.assert_array_equal(sums, serial_sums)
+    assert sums.dtype == np.float64
+
+
+def test_no_rows_give_float_sums(inputs):
+    codes, shape, weights = inputs
+    counts, sums = accumulate_rows([c[:0] for c in codes], shape, weights[:0])
+    assert counts.sum() == 0
+    assert sums.dtype == np.float64 and sums.shape == shape
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from payload import (MAX_KDE_POINTS, MIN_KDE_POINTS, compact_array, decode_array, encode_array, kde_points,
+                     lttb, reduce_trace)
+
+
+def test_lttb_keeps_ends_and_peaks():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[437] = 10
+    keep = lttb(x, y, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+    assert 437 in keep
+
+
+def test_lttb_returns_short_lines_whole():
+    np.testing.assert_array_equal(lttb([1, 2, 3], [3, 1, 2], 10), [0, 1, 2])
+
+
+def test_typed_arrays_round_trip():
+    array = np.linspace(0, 1, 7)
+    np.testing.assert_array_equal(decode_array(encode_array(array)), array)
+
+
+def test_compact_array_keeps_significant_digits():
+    values = np.random.default_rng(0).uniform(0.001, 0.09, 500)
+    compact = decode_array(compact_array(values, decimals=4))
+    assert compact.dtype == np.float32
+    np.testing.assert_allclose(compact, values, rtol=0, atol=0.09 * 1e-3)
+    assert compact_array(['Yes', 'No']) == ['Yes', 'No']
+    assert compact_array([1, 2, 3]) == [1, 2, 3]
+
+
+def test_reduce_trace_downsamples_long_lines_only():
+    x = np.arange(5000, dtype=float)
+    line = reduce_trace({'mode': 'lines', 'x': x, 'y': np.cos(x / 300), 'customdata': x * 2}, max_points=500)
+    x_kept, customdata = decode_array(line['x']), decode_array(line['customdata'])
+    assert len(x_kept) == len(decode_array(line['y'])) == len(customdata) == 500
+    np.testing.assert_allclose(customdata, 2 * x_kept)
+    markers = reduce_trace({'mode': 'markers', 'x': x, 'y': x}, max_points=500)
+    assert len(decode_array(markers['x'])) == 5000
+
+
+@pytest.mark.parametrize('span, bandwidth, expected', [
+    (11, None, MIN_KDE_POINTS),
+    (11, 0.01, MAX_KDE_POINTS),
+    (11, 1.0, 56),
+])
+def test_kde_points(span, bandwidth, expected):
+    assert kde_points(span, bandwidth) == expected
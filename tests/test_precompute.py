@@ -0,0 +1,60 @@
+import random
+import shutil
+
+import numpy as np
+import pytest
+
+from analytics import Analytics, open_dataset
+from precompute import PrecomputedStore, compute_record, enumerate_filters, precompute
+from tests.reference import DATA_PATH, assert_same_frame
+
+
+@pytest.fixture(scope='module')
+def built(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('precompute')
+    source = str(directory / 'export.csv')
+    shutil.copy(DATA_PATH, source)
+    with pytest.MonkeyPatch.context() as patch:
+        # The dataset's default cache directory is relative
+        patch.chdir(directory)
+        path, combinations = precompute(source, shared_dir=None, directory=str(directory / 'store'),
+                                        workers=2, age_step=6)
+        analytics = Analytics.from_dataset(open_dataset(source, shared_dir=None, out_of_core=False))
+    return PrecomputedStore(path), combinations, analytics
+
+
+def _assert_same_record(expected, actual):
+    assert actual['kpis'] == pytest.approx(expected['kpis'], nan_ok=True)
+    for column, counts in expected['counts'].items():
+        assert list(actual['counts'][column].items()) == list(counts.items())
+    for column, (x, curves) in expected['density'].items():
+        np.testing.assert_array_equal(actual['density'][column][0], x)
+        assert [c for c, _ in actual['density'][column][1]] == [c for c, _ in curves]
+        for (_, y), (_, stored) in zip(curves, actual['density'][column][1]):
+            assert (y is None) == (stored is None)
+            if y is not None:
+                np.testing.assert_array_equal(stored, y)
+    for name in ('entrepreneurship_by_age', 'job_offers_by_age'):
+        assert_same_frame(expected[name], actual[name])
+
+
+def test_store_holds_every_enumerated_selection(built):
+    store, combinations, analytics = built
+    assert len(store) == combinations == len(enumerate_filters(analytics.filter_options(), age_step=6))
+
+
+def test_records_match_live_results(built):
+    store, _, analytics = built
+    selections = enumerate_filters(analytics.filter_options(), age_step=6)
+    for filters in random.Random(0).sample(selections, 40):
+        record = store.get(filters)
+        assert record is not None
+        _assert_same_record(compute_record(analytics, filters), record)
+
+
+def test_selections_off_the_grid_are_not_stored(built):
+    store, _, analytics = built
+    filters = dict(genders=None, level='Mid', age_range=(19, 21), statuses=['No', 'Yes'])
+    assert store.get(filters) is None
+    listed = dict(filters, genders=['Female', 'Male', 'Other'], age_range=(18, 24))
+    assert store.get(listed) is store.get(dict(listed, genders=None))
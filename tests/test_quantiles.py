@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from quantiles import QuantileCube
+from settings import SALARY_RELATIVE_ERROR
+from tests.reference import SELECTIONS, select
+
+QS = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+@pytest.fixture(scope='module')
+def quantile_cube(frame):
+    return QuantileCube(frame)
+
+
+@pytest.mark.parametrize('filters', SELECTIONS)
+def test_salary_percentiles_within_relative_error(quantile_cube, raw, filters):
+    rows = select(raw, filters)
+    if rows.empty:
+        return
+    expected = rows['Starting_Salary'].quantile(QS).to_numpy()
+    np.testing.assert_allclose(quantile_cube.quantiles('Starting_Salary', QS, **filters), expected,
+                               rtol=SALARY_RELATIVE_ERROR)
+
+
+@pytest.mark.parametrize('filters', SELECTIONS)
+@pytest.mark.parametrize('column', ['High_School_GPA', 'University_GPA'])
+def test_gpa_percentiles_exact(quantile_cube, raw, filters, column):
+    rows = select(raw, filters)
+    if rows.empty:
+        return
+    expected = rows[column].quantile(QS).to_numpy()
+    np.testing.assert_allclose(quantile_cube.quantiles(column, QS, **filters), expected, rtol=1e-12)
+
+
+def test_merged_cube_equals_one_pass(frame, quantile_cube):
+    merged = QuantileCube(frame.iloc[:2500]).extended(frame.iloc[2500:])
+    for column, counts in quantile_cube.counts.items():
+        assert merged.offsets[column] == quantile_cube.offsets[column]
+        np.testing.assert_array_equal(merged.counts[column], counts)
+
+
+@pytest.mark.parametrize('q', [-1, -0.01, 1.01, 2, float('nan')])
+def test_quantile_levels_outside_unit_interval_are_rejected(analytics, q):
+    for column in ('Age', 'Starting_Salary'):
+        with pytest.raises(ValueError, match='between 0 and 1'):
+            analytics.percentiles({}, column, qs=(0.5, q))
+
+
+@pytest.mark.parametrize('query', ['q=2', 'q=-1', 'q=0.5,1.5&column=University_GPA'])
+def test_api_rejects_quantile_levels_outside_unit_interval(service, query):
+    status, _ = service.handle('/percentiles', query)
+    assert status == 400
+
+
+def test_bounds_are_the_extremes(analytics, raw):
+    result = analytics.percentiles({}, 'University_GPA', qs=(0, 1))
+    assert list(result['percentiles'].values()) == pytest.approx([raw['University_GPA'].min(),
+                                                                  raw['University_GPA'].max()])
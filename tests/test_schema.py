@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from schema import SCHEMA, apply_schema, memory_report
+
+
+def test_valid_export_keeps_every_row_with_compact_dtypes(raw):
+    typed, rejected = apply_schema(raw)
+    assert rejected.empty
+    assert list(typed.columns) == list(SCHEMA)
+    for name, (dtype, _, _) in SCHEMA.items():
+        if dtype == 'category':
+            assert isinstance(typed[name].dtype, pd.CategoricalDtype), name
+        elif name != 'Student_ID':
+            assert typed[name].dtype == pd.api.types.pandas_dtype(dtype), name
+    np.testing.assert_array_equal(typed['Starting_Salary'].to_numpy(), raw['Starting_Salary'].to_numpy())
+    assert memory_report(raw, typed).loc['Total', 'ratio'] > 1
+
+
+def test_invalid_rows_are_rejected_with_their_columns(raw):
+    bad = raw.iloc[:5].astype(object)
+    bad.loc[0, 'Age'] = 250
+    bad.loc[1, 'Gender'] = 'Unknown'
+    bad.loc[2, 'University_GPA'] = 'n/a'
+    bad.loc[3, 'Job_Offers'] = 1.5
+    bad.loc[3, 'Student_ID'] = ' '
+    typed, rejected = apply_schema(bad)
+    assert list(typed['Student_ID']) == [raw.loc[4, 'Student_ID']]
+    assert list(rejected['Rejected_Columns']) == ['Age', 'Gender', 'University_GPA', 'Student_ID, Job_Offers']
+
+
+def test_missing_column_is_an_error(raw):
+    with pytest.raises(ValueError, match='Missing columns: Job_Offers'):
+        apply_schema(raw.drop(columns='Job_Offers'))
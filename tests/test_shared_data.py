@@ -0,0 +1,58 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingest import IncrementalDataset
+from shared_data import SharedDataset, publish
+from tests.reference import DATA_PATH, SELECTIONS, in_memory
+
+
+def _mapped(array):
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+@pytest.fixture
+def published(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    shutil.copy(DATA_PATH, path)
+    dataset = IncrementalDataset(path, cache_dir=str(tmp_path / 'cache'))
+    target = str(tmp_path / 'shared')
+    publish(dataset, target)
+    return dataset, target
+
+
+def test_attached_frame_matches_and_is_mapped(published):
+    dataset, target = published
+    frame, index, cube = SharedDataset(target).snapshot()
+    pd.testing.assert_frame_equal(in_memory(frame), in_memory(dataset.frame.drop(columns='Student_ID')))
+    for name in frame.columns:
+        column = frame[name].array
+        assert _mapped(column.codes if isinstance(column, pd.Categorical) else column.to_numpy()), name
+    assert _mapped(cube.counts)
+    for filters in SELECTIONS:
+        assert cube.kpis(**filters) == dataset.snapshot()[2].kpis(**filters)
+        np.testing.assert_array_equal(index.rows(**filters), dataset.snapshot()[1].rows(**filters))
+
+
+def test_attached_copy_follows_republishing(published):
+    dataset, target = published
+    shared = SharedDataset(target)
+    first = shared.version
+    assert publish(dataset, target) == dataset.digest[:16]
+    assert shared.refresh() is shared.snapshot()
+
+    with open(DATA_PATH) as f:
+        lines = f.readlines()
+    with open(dataset.source, 'a') as f:
+        f.writelines(lines[1:11])
+    dataset.refresh()
+    publish(dataset, target)
+    frame, _, cube = shared.refresh()
+    assert shared.version != first
+    assert len(frame) == int(cube.counts.sum()) == len(lines) - 1 + 10
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import Analytics, normalize_filters
+from streaming import StreamedCube, StreamingDataset, iter_chunks
+from tests.reference import DATA_PATH, SELECTIONS, assert_same_frame
+
+
+@pytest.fixture(scope='module')
+def streamed():
+    # Chunks of 700 rows: labels and first rows are built across chunk bounds
+    cube = StreamedCube.from_chunks(iter_chunks(DATA_PATH, 700))
+    return Analytics((None, None, cube), 'tests-streamed')
+
+
+@pytest.mark.parametrize('filters', SELECTIONS)
+def test_streamed_results_equal_in_memory(streamed, analytics, filters):
+    assert streamed.kpis(filters) == pytest.approx(analytics.kpis(filters), nan_ok=True)
+    for column in ('Gender', 'Field_of_Study'):
+        expected = analytics.category_counts(filters, column)
+        assert list(streamed.category_counts(filters, column).items()) == list(expected.items())
+    assert_same_frame(analytics.entrepreneurship_by_age(filters), streamed.entrepreneurship_by_age(filters))
+    assert_same_frame(analytics.job_offers_by_age(filters), streamed.job_offers_by_age(filters))
+    assert streamed.percentiles(filters, 'Starting_Salary') == analytics.percentiles(filters, 'Starting_Salary')
+
+
+@pytest.mark.parametrize('filters', SELECTIONS[:5] + [normalize_filters(level='Senior')])
+def test_streamed_density_equals_in_memory(streamed, analytics, filters):
+    x, curves = analytics.density_curves(filters, 'Gender')
+    streamed_x, streamed_curves = streamed.density_curves(filters, 'Gender')
+    np.testing.assert_allclose(streamed_x, x)
+    assert [c for c, _ in streamed_curves] == [c for c, _ in curves]
+    for (_, y), (_, streamed_y) in zip(curves, streamed_curves):
+        if y is None:
+            assert streamed_y is None
+        else:
+            np.testing.assert_allclose(streamed_y, y, rtol=1e-9, atol=1e-300)
+
+
+def test_streamed_outcomes_equal_in_memory(streamed, analytics):
+    filters = normalize_filters(genders=['Female'])
+    expected, actual = analytics.outcomes(filters), streamed.outcomes(filters)
+    pd.testing.assert_frame_equal(actual['summary'], expected['summary'])
+    pd.testing.assert_frame_equal(actual['correlation'], expected['correlation'])
+
+
+def test_streaming_dataset_skips_rejected_rows(tmp_path, raw):
+    path = str(tmp_path / 'export.csv')
+    bad = raw.copy()
+    bad.loc[10, 'Age'] = 250
+    bad.to_csv(path, index=False)
+    dataset = StreamingDataset(path, chunk_rows=1000)
+    frame, index, cube = dataset.snapshot()
+    assert frame is None and index is None
+    assert int(cube.counts.sum()) == len(raw) - 1
+    assert dataset.refresh() is dataset.snapshot()
@@ -0,0 +1,69 @@
+import json
+import os
+import re
+
+import pytest
+
+from templates import NOTES_PATH, kpi_card, load_notes, minify, note_fragments
+
+
+def _text(html):
+    return re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', ' ', html)).strip()
+
+
+def test_minify_drops_whitespace_between_tags_only():
+    assert minify('\n  <div>\n    <b>a  b</b>\n  </div>\n') == '<div><b>a  b</b></div>'
+    assert minify('<p>one\n   two</p>') == '<p>one two</p>'
+
+
+@pytest.mark.parametrize('name, values, expected', [
+    ('demographics', (1234, 22.25, 48.04), 'Total Records 1234 Median Age 22.2 % Female 48.0%'),
+    ('fields', (10, 'Law, Medicine, Arts'), 'Total Records 10 Top 3 Fields Law, Medicine, Arts'),
+    ('job_offers', (5, 30.0, 12.345), 'Total Records 5 Median Age 30.0 Entrepreneurs (%) 12.3%'),
+])
+def test_kpi_cards_fill_their_slots(name, values, expected):
+    html = kpi_card(name, *values)
+    assert _text(html) == expected
+    assert '\n' not in html and not re.search(r'>\s+<', html)
+
+
+def test_notes_come_from_the_file():
+    notes = load_notes()
+    fragments = note_fragments('demographics', 'Mid', 'Gender Distribution')
+    assert len(fragments) == 2
+    for kind, html in zip(('gender_density', 'gender_pie'), fragments):
+        assert notes[kind]['title'].format(level='Mid') in html
+        for line in notes[kind]['levels']['Mid']:
+            assert f'- {line}<br>' in html
+    assert len(note_fragments('demographics', 'Mid', 'Field of Study')) == 1
+    assert len(note_fragments('job_offers', 'Mid')) == 2
+
+
+def test_rendered_notes_are_cached():
+    first = note_fragments('job_offers', 'Senior')
+    assert note_fragments('job_offers', 'Senior') is first
+    assert note_fragments('job_offers', 'Entry') is not first
+
+
+def test_generated_lines_replace_the_file_lines():
+    notes = load_notes()
+    insights = {'job_level': ('Generated line',), 'job_offers': ()}
+    level_html, offers_html = note_fragments('job_offers', 'Mid', insights=insights)
+    assert '- Generated line<br>' in level_html
+    assert notes['job_level']['levels']['Mid'][0] not in level_html
+    # An empty generated note falls back to the file's lines
+    assert f"- {notes['job_offers']['levels']['Mid'][0]}<br>" in offers_html
+
+
+def test_edited_notes_are_picked_up(tmp_path):
+    with open(NOTES_PATH, encoding='utf-8') as f:
+        notes = json.load(f)
+    path = tmp_path / 'notes.json'
+    path.write_text(json.dumps(notes), encoding='utf-8')
+    assert notes['job_level']['missing'] not in note_fragments('job_offers', 'Mid', path=str(path))[0]
+
+    del notes['job_level']['levels']['Mid']
+    path.write_text(json.dumps(notes), encoding='utf-8')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert notes['job_level']['missing'] in note_fragments('job_offers', 'Mid', path=str(path))[0]